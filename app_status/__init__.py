@@ -1,6 +1,20 @@
 """
 app-status classes
 
+The asyncio classes are imported on first use, so that importing the package
+does not load asyncio nor blynklib
+
 """
 from .core import AppStatus
 from .core import RunStatus
+from .dashboard import RunDashboard
+from .tree import RunTree
+from .board import StatusBoard
+
+
+def __getattr__(name):
+    if name in ("AsyncAppStatus", "AsyncRunStatus"):
+        from . import aio  # pylint: disable=import-outside-toplevel
+        return getattr(aio, name)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,141 @@
+"""
+Multi-process aggregation of test results
+
+The worker processes count their results in a shared memory block, one slot
+per worker, without lock nor connection. A single publisher process sums the
+slots and drives the RunStatus publishing over its one connection.
+
+    aggregator = Aggregator(status, workers=32)
+    processes = [Process(target=work, args=(aggregator.reporter(i),)) for i in range(32)]
+
+The reporters are shared by inheritance: give them to the processes at creation,
+as Process arguments or Pool initializer arguments.
+
+"""
+
+import multiprocessing
+
+from .periodic import Periodic
+
+
+# Shared memory slot layout of a worker
+SUCCEED = 0
+FAILED = 1
+BLOCKED = 2
+SLOT_SIZE = 3
+
+
+class Reporter:
+    """
+    Class to
+        - count the results of one worker process in its shared memory slot
+    """
+
+    __slots__ = ("_block", "_offset")
+
+    def __init__(self, block, slot: int):
+        """
+        Class init
+        :param block: shared memory counter block of the aggregator
+        :param slot: slot of the worker, written by this worker only
+        """
+
+        self._block = block
+        self._offset = slot * SLOT_SIZE
+
+    def add_succeed(self, value: int = 1):
+        """
+        Increment the succeed value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        self._block[self._offset + SUCCEED] += value
+
+    def add_failed(self, value: int = 1):
+        """
+        Increment the failed value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        self._block[self._offset + FAILED] += value
+
+    def add_blocked(self, value: int = 1):
+        """
+        Increment the blocked value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        self._block[self._offset + BLOCKED] += value
+
+
+class Aggregator(Periodic):
+    """
+    Sub class of the periodic publishing to
+        - give a reporter to each worker process
+        - merge their counts and publish them with a RunStatus
+    """
+
+    def __init__(self, status, workers: int, interval: float = 0.5, context=None):
+        """
+        Class init
+        :param status: started RunStatus publishing the merged counts
+        :param workers: number of worker processes
+        :param interval: (optional) publishing period in seconds of the background thread
+        :param context: (optional) multiprocessing context, the default one by default
+        """
+
+        if workers < 1:
+            raise ValueError("At least one worker is needed")
+
+        super().__init__(self.publish, interval, "app-status-aggregator")
+
+        context = multiprocessing if context is None else context
+
+        self.status = status
+        self.workers = workers
+
+        # No lock, each slot has a single writer
+        self._block = context.RawArray("q", workers * SLOT_SIZE)
+        self._published = None
+
+    def reporter(self, slot: int) -> Reporter:
+        """
+        Get the reporter of a worker
+        :param slot: worker slot, from 0 to workers - 1, a slot must be used by one process only
+        :return: the reporter
+        """
+
+        if not 0 <= slot < self.workers:
+            raise ValueError("The slot must be between 0 and {}".format(self.workers - 1))
+
+        return Reporter(self._block, slot)
+
+    def totals(self) -> tuple:
+        """
+        :return: (succeed, failed, blocked) summed over all the workers
+        """
+
+        block = self._block[:]
+
+        return (sum(block[SUCCEED::SLOT_SIZE]),
+                sum(block[FAILED::SLOT_SIZE]),
+                sum(block[BLOCKED::SLOT_SIZE]))
+
+    def publish(self) -> bool:
+        """
+        Publish the merged counts if they changed since the last publish
+        :return: True if an update has been published
+        """
+
+        totals = self.totals()
+
+        if totals == self._published:
+            return False
+
+        self._published = totals
+        self.status.update(*totals)
+
+        return True
@@ -0,0 +1,351 @@
+"""
+asyncio version of the blynk application status screen manager
+
+The writes never block the event loop, and the writes posted during the same
+loop tick are sent together in a single socket write
+
+"""
+
+import asyncio
+
+import blynklib
+
+from .core import RunModel
+from .encoder import FrameEncoder
+
+
+class AsyncBlynkTransport(blynklib.Protocol):
+    """
+    Class to
+        - manage a non-blocking blynk connection with asyncio streams
+        - send a batch of pin values in one socket write
+    """
+
+    HEAD_LEN = blynklib.Protocol.MSG_HEAD_LEN
+
+    def __init__(self, token, server="blynk-cloud.com", port=80, heartbeat=10, rcv_buffer=1024,
+                 timeout=5):
+        """
+        Class init
+        :param token: the blynk auth key to be use
+        :param server: (optional) blynk server address
+        :param port: (optional) blynk server port
+        :param heartbeat: (optional) heartbeat period in seconds
+        :param rcv_buffer: (optional) receive buffer size announced to the server
+        :param timeout: (optional) timeout in seconds of the connection handshake
+        """
+
+        self.token = token
+        self.server = server
+        self.port = port
+        self.heartbeat = heartbeat
+        self.rcv_buffer = rcv_buffer
+        self.timeout = timeout
+
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._encoder = FrameEncoder()
+        # Serializes the connection setup, created in the loop on first use
+        self._connect_lock = None
+
+    def _get_msg_id(self, **kwargs):
+        """
+        Message id generator, wrapping after 0xFFFF as 0 is not a valid id
+        """
+
+        if "msg_id" in kwargs:
+            return kwargs["msg_id"]
+
+        self._msg_id = self._msg_id % 0xFFFF + 1
+        return self._msg_id
+
+    def connected(self) -> bool:
+        """
+        :return: True when the connection is authenticated
+        """
+
+        return self._read_task is not None and not self._read_task.done()
+
+    async def connect(self):
+        """
+        Open and authenticate the connection, once for concurrent callers
+        :return: None
+        """
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            # Opened by a concurrent caller while waiting
+            if not self.connected():
+                await self._open()
+
+    async def _open(self):
+        """
+        Open and authenticate a new connection
+        :return: None
+        """
+
+        self._msg_id = 0
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.server, self.port), self.timeout)
+
+        await self._request(self.login_msg(self.token), "Auth")
+        await self._request(self.heartbeat_msg(self.heartbeat, self.rcv_buffer), "Heartbeat")
+
+        self._read_task = asyncio.ensure_future(self._read_loop())
+
+    async def write_batch(self, batch: dict):
+        """
+        Write a dict of pin values as a single buffer
+        :param batch: dict of values with pair of id : value
+        :return: None
+        """
+
+        if not self.connected():
+            await self.connect()
+
+        frame, self._msg_id = self._encoder.encode(batch, self._msg_id)
+        # Copied, the stream may keep the data buffered while the frame is reused
+        self._writer.write(bytes(frame))
+        frame.release()
+        await self._writer.drain()
+
+    async def close(self):
+        """
+        Close the connection
+        :return: None
+        """
+
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _read_message(self):
+        """
+        Read one message from the server
+        :return: (msg_type, msg_id, length or status)
+        """
+
+        head = await self._reader.readexactly(self.HEAD_LEN)
+        msg_type, msg_id, length, _ = self.parse_response(head, self.rcv_buffer)
+
+        # Responses carry a status in place of a length
+        if msg_type != self.MSG_RSP and length:
+            await self._reader.readexactly(length)
+
+        return msg_type, msg_id, length
+
+    async def _request(self, message: bytes, stage: str):
+        """
+        Send a handshake message and check its response
+        :param message: packed message
+        :param stage: handshake stage name for the errors
+        :return: None
+        """
+
+        self._writer.write(message)
+        await self._writer.drain()
+
+        try:
+            _, _, status = await asyncio.wait_for(self._read_message(), self.timeout)
+        except asyncio.TimeoutError:
+            raise blynklib.BlynkError("{} stage timeout".format(stage))
+
+        if status == self.STATUS_INVALID_TOKEN:
+            raise blynklib.BlynkError("Invalid Auth Token")
+        if status != self.STATUS_OK:
+            raise blynklib.BlynkError("{} stage failed. Status={}".format(stage, status))
+
+    async def _read_loop(self):
+        """
+        Answer the server pings and keep the connection alive
+        :return: None
+        """
+
+        while True:
+            try:
+                msg_type, msg_id, _ = await asyncio.wait_for(self._read_message(), self.heartbeat)
+            except asyncio.TimeoutError:
+                self._writer.write(self.ping_msg())
+                continue
+            except (asyncio.IncompleteReadError, OSError):
+                # Connection lost, the next write reconnects
+                return
+
+            if msg_type == self.MSG_PING:
+                self._writer.write(self.response_msg(self.STATUS_OK, msg_id=msg_id))
+
+
+class AsyncAppStatus:
+    """
+    Master class to
+        - manage a non-blocking blynk connection
+        - send a dict of values to it, batching the posts of the same loop tick
+    """
+
+    def __init__(self, blink_key, app_id=0, transport=None):
+        """
+        Class init
+        :param blink_key: the blynk auth key to be use
+        :param app_id: (optional) id of the application, used to offset the pins
+        :param transport: (optional) object with async connect, write_batch and close methods,
+                          an AsyncBlynkTransport on blink_key by default
+        """
+
+        self.app_id = app_id
+        self.transport = transport if transport is not None else AsyncBlynkTransport(blink_key)
+
+        self.pending = {}
+        self._tick = None
+        # Serializes the writes of the ticks, created in the loop on first use
+        self._write_lock = None
+
+    async def connect(self):
+        """
+        Open the connection
+        :return: None
+        """
+
+        await self.transport.connect()
+
+    async def post_dict(self, status_dict: dict):
+        """
+        Method to sent to the blynk app information formatted in a dictionary,
+        the posts of the same loop tick are sent together
+        :param status_dict: dict of values with pair of id : value
+                            the id is the virtual pin number to be use
+                            the value can be a string or a int/float
+
+        :return: None
+        """
+
+        self.pending.update(status_dict)
+
+        if self._tick is None:
+            self._tick = asyncio.ensure_future(self._send_tick())
+
+        await asyncio.shield(self._tick)
+
+    async def flush(self):
+        """
+        Wait for the pending values to be sent
+        :return: None
+        """
+
+        if self._tick is not None:
+            await asyncio.shield(self._tick)
+
+        # A tick whose batch was already taken may still be writing
+        if self._write_lock is not None:
+            async with self._write_lock:
+                pass
+
+    async def close(self):
+        """
+        Send the pending values and close the connection
+        :return: None
+        """
+
+        await self.flush()
+        await self.transport.close()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _send_tick(self):
+        """
+        Let the other tasks of the loop tick post their values, then send them all
+        :return: None
+        """
+
+        await asyncio.sleep(0)
+
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        # After the write of the previous tick, the posts made meanwhile join this one
+        async with self._write_lock:
+            batch, self.pending = self.pending, {}
+            self._tick = None
+
+            await self.transport.write_batch(batch)
+
+
+class AsyncRunStatus(RunModel, AsyncAppStatus):
+    """
+    Sub class to manage the status of a test run application from asyncio code
+
+    """
+
+    def __init__(self, blink_key, app_id=0, transport=None):
+        super().__init__(blink_key, app_id, transport)
+
+        self._new_run()
+
+    async def start(self, total: int, name: str = None):
+        """
+        Method to sync test run information with the phone application at startup
+
+        :param total: total number of test for this run
+        :param name: name of test run
+        :return: None
+        """
+
+        await self.post_dict(self._start_run(total, name))
+
+    async def update(self, succeed: int = None, failed: int = None, blocked: int = None):
+        """
+        Method to sync test run information values with the phone application
+
+        :param succeed: (optional) updated succeed before send
+        :param failed: (optional) updated failed before send
+        :param blocked: (optional) updated blocked before send
+        :return: None
+        """
+
+        await self.post_dict(self._update_run(succeed, failed, blocked))
+
+    async def add_blocked(self, value: int = None):
+        """
+        Increment the blocked value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        await self.post_dict(self._increment("blocked", value))
+
+    async def add_succeed(self, value: int = None):
+        """
+        Increment the succeed value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        await self.post_dict(self._increment("succeed", value))
+
+    async def add_failed(self, value: int = None):
+        """
+        Increment the failed value
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        await self.post_dict(self._increment("failed", value))
+
+    async def stop(self):
+        """
+        Sent a stop information to the blynk phone application
+        :return: None
+        """
+
+        await self.post_dict(self._stop_run())
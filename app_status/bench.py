@@ -0,0 +1,239 @@
+"""
+Benchmark of the status publishing path
+
+It drives AppStatus.post_dict, RunStatus.update and the RunStatus.add_* methods
+against an in-memory transport or the local stand-in server, and reports per
+configuration:
+    - p50 and p99 caller latency of one call
+    - updates per second, including the final flush
+    - bytes on the wire per update
+    - memory: blocks still allocated and peak traced bytes per update
+
+Run it with: python -m app_status.bench --json result.json
+and compare with a previous result: python -m app_status.bench --compare result.json
+
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from .core import AppStatus, RunStatus
+from .sender import COALESCE
+from .server import LocalServer
+from .transport import BlynkTransport, MemoryTransport
+
+
+BLYNK_AUTH = "benchmark"
+
+# AppStatus options of each publishing mode
+MODES = {
+    "direct": {},
+    "delta": {"delta": True},
+    "coalesce": {"delta": True, "flush_interval_ms": 100},
+    "background": {"delta": True, "background": True, "policy": COALESCE},
+}
+
+SCENARIOS = ("post_dict", "update", "add")
+TRANSPORTS = ("memory", "tcp")
+
+# Compared metrics, and if higher is better
+METRICS = {"p50_us": False, "p99_us": False, "updates_per_s": True}
+
+
+def _prepare(scenario: str, status, count: int):
+    """
+    Build the benchmarked call of a scenario
+    :return: callable(index)
+    """
+
+    if scenario == "post_dict":
+        payloads = [{2: "{}/{}".format(i, count), 3: i / count * 100, 4: "S{} F0 B0".format(i), 5: 255}
+                    for i in range(count)]
+        return lambda i: status.post_dict(payloads[i])
+
+    status.start(count, "benchmark")
+
+    if scenario == "update":
+        return lambda i: status.update(i + 1, 0, 0)
+
+    adds = (status.add_succeed, status.add_failed, status.add_blocked)
+    return lambda i: adds[i % 3]()
+
+
+def _percentile(values: list, ratio: float) -> float:
+    return values[int(ratio * (len(values) - 1))]
+
+
+def run_case(scenario: str, transport: str, mode: str, count: int) -> dict:
+    """
+    Benchmark one configuration
+    :param scenario: one of SCENARIOS
+    :param transport: one of TRANSPORTS
+    :param mode: one of MODES
+    :param count: number of calls
+    :return: dict of the results
+    """
+
+    server = None
+    status_class = AppStatus if scenario == "post_dict" else RunStatus
+
+    def make_status():
+        if server is None:
+            link = MemoryTransport()
+        else:
+            link = BlynkTransport(BLYNK_AUTH, server=server.address[0], port=server.address[1])
+        return status_class(BLYNK_AUTH, transport=link, **MODES[mode])
+
+    def wire_bytes(status):
+        if server is None:
+            return status.blynk.bytes_sent
+        return server.stats()["bytes_received"]
+
+    if transport == "tcp":
+        server = LocalServer().start()
+
+    try:
+        # blynklib prints its logo on each connection
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            status = make_status()
+            call = _prepare(scenario, status, count)
+            bytes_start = wire_bytes(status)
+
+            latencies = [0.0] * count
+            clock = time.perf_counter
+            gc.collect()
+
+            start = clock()
+            for i in range(count):
+                begin = clock()
+                call(i)
+                latencies[i] = clock() - begin
+            status.close()
+            elapsed = clock() - start
+
+            if server is not None:
+                # Let the server read the last writes
+                time.sleep(0.1)
+            bytes_sent = wire_bytes(status) - bytes_start
+
+            # Memory pass on a fresh status
+            status = make_status()
+            memory_count = min(count, 1000)
+            call = _prepare(scenario, status, memory_count)
+            gc.collect()
+            tracemalloc.start()
+            blocks_start = sys.getallocatedblocks()
+            traced_start, _ = tracemalloc.get_traced_memory()
+            for i in range(memory_count):
+                call(i)
+            _, traced_peak = tracemalloc.get_traced_memory()
+            blocks = sys.getallocatedblocks() - blocks_start
+            tracemalloc.stop()
+            status.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    latencies.sort()
+
+    return {"scenario": scenario,
+            "transport": transport,
+            "mode": mode,
+            "count": count,
+            "p50_us": _percentile(latencies, 0.5) * 1e6,
+            "p99_us": _percentile(latencies, 0.99) * 1e6,
+            "updates_per_s": count / elapsed,
+            "bytes_per_update": bytes_sent / count,
+            "retained_blocks_per_update": blocks / memory_count,
+            "peak_bytes_per_update": (traced_peak - traced_start) / memory_count}
+
+
+def case_key(result: dict) -> str:
+    return "{scenario}/{transport}/{mode}".format(**result)
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Compare results with a baseline
+    :param results: list of run_case results
+    :param baseline: list of run_case results of a previous version
+    :param tolerance: allowed degradation ratio, 0.2 for 20%
+    :return: list of the regression descriptions
+    """
+
+    reference = {case_key(result): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        previous = reference.get(case_key(result))
+        if previous is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            if not previous[metric]:
+                continue
+            ratio = result[metric] / previous[metric]
+            worse = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+            if worse:
+                regressions.append("{} {}: {:.2f} -> {:.2f}".format(case_key(result), metric,
+                                                                    previous[metric], result[metric]))
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    """
+    Run the benchmark from the command line
+    :param argv: (optional) command line arguments
+    :return: exit code, 1 when a regression is found
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark of the app status publishing path")
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--transport", nargs="+", choices=TRANSPORTS, default=["memory"])
+    parser.add_argument("--mode", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--count", type=int, default=10000, help="calls per configuration")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare with the results of this file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed degradation ratio")
+    args = parser.parse_args(argv)
+
+    results = []
+    line = "{:<32} {:>10} {:>10} {:>12} {:>10} {:>10} {:>10}"
+    print(line.format("case", "p50 us", "p99 us", "updates/s", "bytes/upd", "blocks/upd", "peak B/upd"))
+
+    for scenario in args.scenario:
+        for transport in args.transport:
+            for mode in args.mode:
+                result = run_case(scenario, transport, mode, args.count)
+                results.append(result)
+                print(line.format(case_key(result), "{:.1f}".format(result["p50_us"]),
+                                  "{:.1f}".format(result["p99_us"]), "{:.0f}".format(result["updates_per_s"]),
+                                  "{:.1f}".format(result["bytes_per_update"]),
+                                  "{:.2f}".format(result["retained_blocks_per_update"]),
+                                  "{:.0f}".format(result["peak_bytes_per_update"])))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "python": sys.version.split()[0], "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print("Regression", regression)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Generic status board
+
+A board holds named gauges, counters and texts bound to virtual pins. The hot
+code paths only update them, an attribute store or a lock free increment, and
+publish() sends the values changed since the previous publish in one batch,
+or a sampler thread does it periodically between start() and stop():
+
+    board = StatusBoard(key, interval=0.5)
+    queue = board.gauge("queue", 1)
+    jobs = board.counter("jobs", 2)
+    memory = board.gauge("memory", 3, fmt="{:.1f} MB")
+
+    with board:
+        queue.set(len(pending))
+        jobs.add()
+
+"""
+
+from .core import AppStatus
+from .counters import ShardedCounters
+from .link import VPIN_MAX
+from .sampler import Sampler
+
+
+class Field:
+    """
+    Base class of the fields of a board
+    """
+
+    __slots__ = ("name", "pin", "fmt", "_value")
+
+    def __init__(self, name: str, pin: int, fmt=None, value=None):
+        """
+        Class init
+        :param name: name of the field
+        :param pin: virtual pin of the field
+        :param fmt: (optional) format string or callable applied to the value at publish time
+        :param value: (optional) initial value
+        """
+
+        self.name = name
+        self.pin = pin
+        self.fmt = fmt
+        self._value = value
+
+    @property
+    def value(self):
+        """
+        Current value of the field
+        """
+
+        return self._value
+
+    def render(self):
+        """
+        :return: the value written to the pin
+        """
+
+        value = self.value
+        fmt = self.fmt
+
+        if fmt is None or value is None:
+            return value
+        if callable(fmt):
+            return fmt(value)
+
+        return fmt.format(value)
+
+
+class Gauge(Field):
+    """
+    Class to
+        - hold a measured value, a queue length or a memory usage
+    """
+
+    __slots__ = ()
+
+    def set(self, value):
+        """
+        Set the gauge value
+        :param value: int or float value
+        :return: None
+        """
+
+        self._value = value
+
+
+class Text(Field):
+    """
+    Class to
+        - hold a text, a state or a last message
+    """
+
+    __slots__ = ()
+
+    def set(self, text: str):
+        """
+        Set the text
+        :param text: text value
+        :return: None
+        """
+
+        self._value = text
+
+
+class Counter(Field):
+    """
+    Class to
+        - count events from many threads
+    """
+
+    __slots__ = ("_counters",)
+
+    def __init__(self, name: str, pin: int, fmt=None, value=0):
+        super().__init__(name, pin, fmt)
+
+        self._counters = ShardedCounters(1, [value])
+
+    @property
+    def value(self) -> int:
+        """
+        Current count, summed over the threads
+        """
+
+        return self._counters.totals()[0]
+
+    def add(self, value: int = 1):
+        """
+        Increment the counter, lock free
+        :param value: (optional) increment other than 1
+        :return: None
+        """
+
+        self._counters.add(0, value)
+
+    def reset(self, value: int = 0):
+        """
+        Set the counter
+        :param value: (optional) new value
+        :return: None
+        """
+
+        self._counters.reset([value])
+
+
+class StatusBoard(AppStatus):
+    """
+    Sub class to publish generic application values
+        - gauges, counters and texts bound to pins
+        - only the changed values, in one batch per publish
+    """
+
+    def __init__(self, blink_key, app_id=0, interval: float = 1.0, **kwargs):
+        """
+        Class init
+        :param blink_key: the blynk auth key to be use
+        :param app_id: (optional) id of the application
+        :param interval: (optional) publishing period in seconds between start() and stop()
+        :param kwargs: (optional) other AppStatus options, flush_interval_ms or background
+                       keep the publishing off the hot paths
+        """
+
+        super().__init__(blink_key, app_id, **kwargs)
+
+        self.fields = {}
+        self._pins = {}
+        # Renders the fields and posts the changed ones
+        self._sampler = Sampler(self, interval)
+
+    def __getitem__(self, name: str) -> Field:
+        return self.fields[name]
+
+    def gauge(self, name: str, pin: int, fmt=None, value=None) -> Gauge:
+        """
+        Add a gauge
+        :param name: name of the gauge
+        :param pin: virtual pin of the gauge
+        :param fmt: (optional) format string or callable applied at publish time
+        :param value: (optional) initial value, not published while None
+        :return: the gauge
+        """
+
+        return self.__add(Gauge(name, pin, fmt, value))
+
+    def counter(self, name: str, pin: int, fmt=None, value: int = 0) -> Counter:
+        """
+        Add a counter
+        :param name: name of the counter
+        :param pin: virtual pin of the counter
+        :param fmt: (optional) format string or callable applied at publish time
+        :param value: (optional) initial value
+        :return: the counter
+        """
+
+        return self.__add(Counter(name, pin, fmt, value))
+
+    def text(self, name: str, pin: int, fmt=None, value: str = None) -> Text:
+        """
+        Add a text
+        :param name: name of the text
+        :param pin: virtual pin of the text
+        :param fmt: (optional) format string or callable applied at publish time
+        :param value: (optional) initial text, not published while None
+        :return: the text
+        """
+
+        return self.__add(Text(name, pin, fmt, value))
+
+    def values(self) -> dict:
+        """
+        :return: dict of name : current value of the fields
+        """
+
+        return {name: field.value for name, field in self.fields.items()}
+
+    def publish(self, force: bool = False) -> int:
+        """
+        Post the values changed since the previous publish in one batch
+        :param force: (optional) post every field
+        :return: number of posted pins
+        """
+
+        return self._sampler.sample(force)
+
+    def start(self):
+        """
+        Publish the changed values periodically from a background thread
+        :return: self
+        """
+
+        self._sampler.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stop the background publishing, after a last publish
+        :return: None
+        """
+
+        self._sampler.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Stop the background publishing, send the pending values and release the connection
+        :param timeout: (optional) maximum time in seconds to wait for the writes
+        :return: True if everything has been written
+        """
+
+        if self._sampler.running:
+            self._sampler.stop()
+
+        return super().close(timeout)
+
+    def __add(self, field: Field) -> Field:
+        """
+        Register a field
+        :param field: the new field
+        :return: the field
+        """
+
+        if field.name in self.fields:
+            raise ValueError("The field {} already exists".format(field.name))
+
+        if not 0 <= field.pin <= VPIN_MAX:
+            raise ValueError("The pin must be between 0 and {}".format(VPIN_MAX))
+
+        if field.pin in self._pins:
+            raise ValueError("The pin {} is already used by {}".format(field.pin, self._pins[field.pin]))
+
+        self.fields[field.name] = field
+        self._pins[field.pin] = field.name
+        self._sampler.register(field.pin, field.render)
+
+        return field
@@ -0,0 +1,255 @@
+"""
+Checkpoint of a test run state
+
+The run state is kept in a small memory-mapped file, so that a restarted
+runner resumes its run instead of starting it again from zero. The file holds
+two fixed-layout slots written alternately, each one with a sequence number
+and a CRC: a crash during a write leaves the previous slot valid. A save
+skipped by the interval is written at the end of the interval, so the last
+counts are never left unsaved.
+
+    status = RunStatus(key, checkpoint="run.ckpt")
+    if not status.resume():
+        status.start(total, name)
+
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+
+# Slot layout: magic, sequence, state, total, succeed, failed, blocked, save time, name, date, crc
+SLOT = struct.Struct("<4sQB7xqqqqd64s32sI")
+MAGIC = b"RCK1"
+
+# Run states
+RUNNING = 1
+STOPPED = 2
+
+
+class Checkpoint:
+    """
+    Class to
+        - save the state of a test run in a memory-mapped file, at most every interval
+        - save the last skipped state at the end of the interval
+        - load the last valid saved state
+    """
+
+    def __init__(self, path, interval: float = 1.0):
+        """
+        Class init
+        :param path: path of the checkpoint file, created if needed
+        :param interval: (optional) minimum time in seconds between two periodic saves
+        """
+
+        self.path = path
+        self.interval = interval
+
+        size = 2 * SLOT.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        last = self._last()
+        self._sequence = 0 if last is None else last[1]
+        self._saved = None
+        self._lock = threading.Lock()
+
+        # Last skipped save: (values, state, sequence when skipped), and its one-shot timer
+        self._pending = None
+        self._timer = None
+        self._timer_lock = threading.Lock()
+
+    def save(self, test_run, state: int = RUNNING, force: bool = False) -> bool:
+        """
+        Save the state of a run, in the slot not holding the last save
+        :param test_run: RunElements of the run
+        :param state: (optional) RUNNING or STOPPED
+        :param force: (optional) save even if the interval has not elapsed
+        :return: True if saved
+        """
+
+        now = time.monotonic()
+        if not force and self._saved is not None and now - self._saved < self.interval:
+            self._defer(test_run, state, self.interval - (now - self._saved))
+            return False
+
+        # A periodic save already in progress in another thread may hold older values
+        if not self._lock.acquire(blocking=force):
+            self._defer(test_run, state, self.interval)
+            return False
+
+        try:
+            if self._map.closed:
+                return False
+            self._write(_values(test_run), state)
+            self._saved = now
+        finally:
+            self._lock.release()
+
+        return True
+
+    def load(self) -> dict:
+        """
+        Load the last valid saved state
+        :return: dict of state, total, succeed, failed, blocked, saved (epoch), name and date,
+                 None when nothing has been saved
+        """
+
+        last = self._last()
+        if last is None:
+            return None
+
+        _, _, state, total, succeed, failed, blocked, saved, name, date, _ = last
+
+        return {"state": state,
+                "total": total,
+                "succeed": succeed,
+                "failed": failed,
+                "blocked": blocked,
+                "saved": saved,
+                "name": _decode(name),
+                "date": _decode(date)}
+
+    def flush(self):
+        """
+        Write the mapped file to the disk
+        :return: None
+        """
+
+        self._map.flush()
+
+    def close(self):
+        """
+        Flush and close the file
+        :return: None
+        """
+
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        # The last skipped state is not lost on a clean close
+        self._save_pending()
+
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+
+    def _defer(self, test_run, state: int, delay: float):
+        """
+        Keep a skipped state, saved by a timer at the end of the interval
+        :param test_run: RunElements of the run
+        :param state: RUNNING or STOPPED
+        :param delay: seconds until the end of the interval
+        :return: None
+        """
+
+        # A copy, the run may change while the timer waits
+        self._pending = (_values(test_run), state, self._sequence)
+
+        with self._timer_lock:
+            if self._timer is not None:
+                return
+
+            self._timer = threading.Timer(max(delay, 0), self._trailing_save)
+            self._timer.name = "app-status-checkpoint"
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _trailing_save(self):
+        """
+        Save the last skipped state, from the timer thread
+        :return: None
+        """
+
+        with self._timer_lock:
+            self._timer = None
+
+        self._save_pending()
+
+    def _save_pending(self):
+        """
+        Save the last skipped state unless a later save superseded it
+        :return: None
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is None or self._map.closed:
+                return
+
+            values, state, sequence = pending
+            # Any save made since the skip holds a state at least as recent
+            if sequence != self._sequence:
+                return
+
+            self._write(values, state)
+            self._saved = time.monotonic()
+
+    def _write(self, values: tuple, state: int):
+        """
+        Write a state in the next slot
+        :param values: total, succeed, failed, blocked, name and date of the run
+        :param state: RUNNING or STOPPED
+        :return: None
+        """
+
+        self._sequence += 1
+
+        total, succeed, failed, blocked, name, date = values
+        record = SLOT.pack(MAGIC, self._sequence, state, total, succeed, failed,
+                           blocked, time.time(), _encode(name, 64), _encode(date, 32), 0)
+        crc = zlib.crc32(record[:-4])
+
+        offset = (self._sequence % 2) * SLOT.size
+        self._map[offset:offset + SLOT.size - 4] = record[:-4]
+        # Written last, the slot is only valid once complete
+        struct.pack_into("<I", self._map, offset + SLOT.size - 4, crc)
+
+    def _last(self):
+        """
+        :return: the valid slot with the highest sequence, unpacked, None if none
+        """
+
+        last = None
+
+        for offset in (0, SLOT.size):
+            raw = self._map[offset:offset + SLOT.size]
+            fields = SLOT.unpack(raw)
+            if fields[0] != MAGIC or fields[-1] != zlib.crc32(raw[:-4]):
+                continue
+            if last is None or fields[1] > last[1]:
+                last = fields
+
+        return last
+
+
+def _values(test_run) -> tuple:
+    """
+    Saved values of a run
+    """
+
+    return (test_run.total, test_run.succeed, test_run.failed, test_run.blocked, test_run.name, test_run.date)
+
+
+def _encode(text: str, size: int) -> bytes:
+    """
+    Encode a text in a fixed size field, cut on a character boundary
+    """
+
+    return text.encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8")
@@ -5,7 +5,21 @@ It allows to post application status in an easy to build blynk phone application
 
 """
 
-import blynklib
+import logging
+import threading
+import time
+
+from .checkpoint import RUNNING, STOPPED, Checkpoint
+from .counters import ShardedCounters
+from .history import RunHistory
+from .layout import DEFAULT_LAYOUT
+from .rate import RateEstimator
+from .sampler import Sampler
+from .link import BACKGROUND, EAGER, FanOutLink, Link, POOL, open_blynk
+from .log import LOGGER
+from .metrics import Metrics
+from .periodic import Periodic
+from .sender import BLOCK, COALESCE
 
 
 class AppStatus:
@@ -15,33 +29,205 @@ class AppStatus:
         - send a dict of values to it
     """
 
-    def __init__(self, blink_key, app_id=0):
+    def __init__(self, blink_key, app_id=0, delta=False, flush_interval_ms=None,
+                 background=False, queue_size=64, policy=BLOCK, shared=False, transport=None,
+                 metrics=None, spool=None, connect=EAGER, adaptive=False):
         """
         Class init
-        :param blink_key: the blynk auth key to be use
+        :param blink_key: the blynk auth key to be use, or a list of keys to publish the same
+                          values to several applications, see fan_out
+        :param app_id: (optional) id of the application, used to offset the pins
+        :param delta: (optional) only send the pins whose value changed since the last write
+        :param flush_interval_ms: (optional) coalesce the posts and send them at most every
+                                  flush_interval_ms, the last ones at the end of the interval,
+                                  None to send each post immediately
+        :param background: (optional) write to the connection from a dedicated sender thread
+        :param queue_size: (optional) size of the background sender queue
+        :param policy: (optional) backpressure policy of the background sender queue
+                       BLOCK, DROP_OLDEST or COALESCE from app_status.sender
+        :param shared: (optional) share the connection with the other shared app status
+                       of the same key, their coalesced posts are sent in the same batches
+        :param transport: (optional) where the values are written, see app_status.transport,
+                          a blynklib.Blynk connection on blink_key by default,
+                          a list of transports with a list of keys
+        :param metrics: (optional) True or a Metrics from app_status.metrics to instrument
+                        the publishing, None to disable it at nearly no cost
+        :param spool: (optional) path of an offline spool file, the writes made while the
+                      connection is down are logged there and replayed in bulk once it is back,
+                      from a background sender even if background is not set
+        :param connect: (optional) when the connection is established, EAGER at init,
+                        LAZY on the first write or BACKGROUND from a dedicated thread,
+                        see app_status.link, the early posts are sent once it is ready
+        :param adaptive: (optional) coalesce the routine posts over an interval adapted to the
+                         write round trip and the sender backlog, the urgent posts are sent
+                         right away, flush_interval_ms is the minimum interval
         """
-        # initialize Blynk
         self.app_id = app_id
-        self.blynk = blynklib.Blynk(blink_key)
+        self.shared = shared
+
+        options = dict(delta=delta, flush_interval_ms=flush_interval_ms,
+                       background=background, queue_size=queue_size, policy=policy, spool=spool,
+                       connect=connect, adaptive=adaptive)
+
+        if metrics is True:
+            metrics = Metrics()
+
+        # initialize Blynk
+        if isinstance(blink_key, (list, tuple)):
+            if shared:
+                raise ValueError("A fan-out app status can not be shared")
+            self.link = self.fan_out(blink_key, transport, metrics, **options)
+        elif shared:
+            self.link = POOL.acquire(blink_key, transport, metrics, **options)
+        else:
+            self.link = Link(open_blynk(blink_key) if transport is None else transport,
+                             metrics=metrics, **options)
+
+        self._closed = False
+
+    @staticmethod
+    def fan_out(blink_keys, transports=None, metrics=None, **options) -> FanOutLink:
+        """
+        Open one link per auth key, each one with its own sender thread and queue, so that
+        a slow or dead application does not delay the others nor the caller
+        :param blink_keys: the blynk auth keys
+        :param transports: (optional) list of the transports of the keys, blynklib.Blynk by default
+        :param metrics: (optional) Metrics shared by the links
+        :param options: Link options, the links are always in background mode, a BLOCK policy
+                        is replaced by COALESCE and an EAGER connection by BACKGROUND,
+                        spool paths get a .<index> suffix
+        :return: the fan-out link
+        """
+
+        if transports is None:
+            transports = [None] * len(blink_keys)
+        elif len(transports) != len(blink_keys):
+            raise ValueError("One transport per auth key is needed")
+
+        options["background"] = True
+        if options.get("policy", BLOCK) == BLOCK:
+            options["policy"] = COALESCE
+        if options.get("connect", EAGER) == EAGER:
+            options["connect"] = BACKGROUND
+
+        spool = options.pop("spool", None)
+        links = []
+        for index, (blink_key, transport) in enumerate(zip(blink_keys, transports)):
+            links.append(Link(open_blynk(blink_key) if transport is None else transport, metrics=metrics,
+                              spool=None if spool is None else "{}.{}".format(spool, index), **options))
+
+        return FanOutLink(links)
+
+    @property
+    def blynk(self):
+        """
+        The blynk connection, or the transport used in its place
+        """
+
+        return self.link.blynk
+
+    @property
+    def sender(self):
+        """
+        The background sender, None when not in background mode
+        """
+
+        return self.link.sender
+
+    @property
+    def writes_sent(self) -> int:
+        """
+        Number of pin values written to the connection
+        """
+
+        return self.link.writes_sent
+
+    @property
+    def writes_saved(self) -> int:
+        """
+        Number of pin values skipped by the delta mode
+        """
+
+        return self.link.writes_saved
+
+    @property
+    def metrics(self):
+        """
+        The publishing metrics, None when disabled
+        """
+
+        return self.link.metrics
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the publishing counters of the connection: writes sent and saved,
+        pending values, sender queue depth and drops, spooled pins, and the metrics when enabled
+        :return: dict of the counters
+        """
 
-        # Needed to create the connection
-        self.blynk.run()
+        return self.link.stats()
 
-    def post_dict(self, status_dict: dict):
+    def post_dict(self, status_dict: dict, force: bool = False, urgent: bool = False):
         """
         Method to sent to the blynk app information formatted in a dictionary
         :param status_dict: dict of values with pair of id : value
                             the id is the virtual pin number to be use
                             the value can be a string or a int/float
+        :param force: (optional) send every pin even if delta mode would skip it
+        :param urgent: (optional) in adaptive mode, send it now with the pending values,
+                       without waiting for the coalescing interval
+
+        :return: None
+        """
+
+        self.link.post(status_dict, force, urgent)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Send the coalesced pending values now, those of every app status of a shared connection
+        :param timeout: (optional) in background mode, maximum time in seconds to wait for
+                        the sender queue to be written, None to wait forever
+        :return: True if everything has been written
+        """
+
+        return self.link.flush(timeout)
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Send the pending values and release the connection
+        :param timeout: (optional) maximum time in seconds to wait for the writes
+        :return: True if everything has been written
+        """
+
+        if self._closed:
+            return True
+
+        self._closed = True
+
+        if self.shared:
+            drained = self.link.flush(timeout)
+            POOL.release(self.link, timeout)
+            return drained
 
+        return self.link.close(timeout)
+
+    def reset_shadow(self, pins=None):
+        """
+        Forget the last sent values, the next post will send every pin
+        :param pins: (optional) only forget these pins, all of them by default
         :return: None
         """
 
-        for key, value in status_dict.items():
-            self.blynk.virtual_write(key, value)
+        self.link.reset_shadow(pins)
+
+    def sampler(self, interval: float = 1.0) -> Sampler:
+        """
+        Create a sampler polling registered getters and posting their changed values here
+        :param interval: (optional) polling period in seconds
+        :return: the sampler, to be started
+        """
 
-        # Sync the request
-        self.blynk.run()
+        return Sampler(self, interval)
 
 
 class RunElements:
@@ -50,36 +236,471 @@ class RunElements:
 
     """
 
-    name = "no name"
-    date = "--/--/---- (--:--)"
-    total = 0
-    failed = 0
-    blocked = 0
-    actual = 0
-    succeed = 0
+    __slots__ = ("name", "date", "total", "failed", "blocked", "actual", "succeed")
+
+    def __init__(self):
+        self.name = "no name"
+        self.date = "--/--/---- (--:--)"
+        self.total = 0
+        self.failed = 0
+        self.blocked = 0
+        self.actual = 0
+        self.succeed = 0
 
 
-class RunStatus(AppStatus):
+class RunModel:
     """
-    Sub class to manage the status of a test run application
+    Sub class to manage the test run counters and build the matching pin values,
+    whatever the way they are sent
 
     """
 
     # Maximum number of managed test runs
     MAX_RUN = 4
 
-    # Pin definition
+    # Pin definition of the default layout, from the block of the run
     PIN_NAME = 0
     PIN_DATE = 1
     PIN_STATUS_TEXT = 2
     PIN_STATUS_GRAPH = 3
     PIN_TYPES = 4
     PIN_LED = 5
+    # Optional live throughput pins
+    PIN_RATE = 6
+    PIN_ETA = 7
+
+    # Led brightness of a run whose throughput dropped
+    LED_DROP = 64
+
+    # Counted values, in the order of the counters
+    COUNTED = ("succeed", "failed", "blocked")
+
+    # Progress percents whose crossing is published without delay
+    THRESHOLDS = (25, 50, 75, 100)
+
+    app_id = 0
+    _test_run = None
+    counters = None
+    # Optional RunHistory recording each count
+    history = None
+    # Optional RateEstimator of the tests per second, published on the rate and eta fields
+    throughput = None
+    # Field to pin mapping, compiled into the pin table of the run
+    layout = DEFAULT_LAYOUT
+    pin_table = None
+    # Optional Checkpoint saving the run state periodically
+    checkpoint = None
+    # Lock of the run information, the counters are merged into it under this lock only
+    _run_lock = None
+    # Set by a count not merged yet into the run information
+    _stale = False
+    # Hints of the lock free counting: approximate count, and count of the next progress threshold
+    _seen = 0
+    _next_urgent = 0
+    _failure_seen = False
+
+    @property
+    def test_run(self) -> RunElements:
+        """
+        Run information, with the counts of every thread merged when read
+        """
+
+        if self._stale:
+            self._sync()
+
+        return self._test_run
+
+    @test_run.setter
+    def test_run(self, test_run: RunElements):
+        self._test_run = test_run
 
-    def __init__(self, blink_key, app_id=0):
-        super().__init__(blink_key, app_id)
+    def _new_run(self):
+        """
+        Clean the run information and its counters
+        :return: None
+        """
+
+        if self._run_lock is None:
+            self._run_lock = threading.RLock()
+
+        # The rate fields of a layout are estimated with the default half life
+        if self.throughput is None and self.layout.has_rate:
+            self.throughput = RateEstimator()
 
         self.test_run = RunElements()
+        self.counters = ShardedCounters(len(self.COUNTED))
+        self._stale = False
+        self.pin_table = self.layout.compile(self.app_id)
+
+    def _start_run(self, total: int, name: str = None) -> dict:
+        """
+        Reset the test run
+        :param total: total number of test for this run
+        :param name: name of test run
+        :return: dict of all the pin values of the run
+        """
+
+        with self._run_lock:
+            # Clean the run
+            self._new_run()
+
+            if name is not None:
+                self.test_run.name = name
+
+            self.test_run.total = total
+
+            if self.history is not None:
+                self.history.start(total)
+
+            if self.throughput is not None:
+                self.throughput.reset()
+
+            # Init the start run date
+            from datetime import datetime
+            self.test_run.date = datetime.now().strftime("%d-%m-%Y (%H:%M)")
+
+            if self.checkpoint is not None:
+                self.checkpoint.save(self.test_run, force=True)
+
+            LOGGER.info("Start run %s - %s @ %s with %s tests", self.app_id, self.test_run.name,
+                        self.test_run.date, self.test_run.total, extra=self._log_fields())
+
+            self._sync_hints()
+
+            return self._all_dict()
+
+    def _resume_run(self) -> dict:
+        """
+        Restore the test run saved in the checkpoint
+        :return: dict of the updated pin values of the run, None if there is no run to resume
+        """
+
+        saved = self.checkpoint.load() if self.checkpoint is not None else None
+        if saved is None or saved["state"] != RUNNING or not saved["total"]:
+            return None
+
+        with self._run_lock:
+            self._new_run()
+
+            test_run = self.test_run
+            test_run.name = saved["name"]
+            test_run.date = saved["date"]
+            test_run.total = saved["total"]
+
+            values = [saved[field] for field in self.COUNTED]
+            self.counters.reset(values)
+
+            if self.history is not None:
+                self.history.start(test_run.total)
+
+            if self.throughput is not None:
+                # The rate is estimated again from the resumed count
+                self.throughput.reset(sum(values))
+
+            self._merge(values)
+
+            LOGGER.info("Resume run %s - %s @ %s at %s/%s", self.app_id, test_run.name, test_run.date,
+                        test_run.actual, test_run.total, extra=self._log_fields())
+
+            return self._update_dict()
+
+    def _update_run(self, succeed: int = None, failed: int = None, blocked: int = None) -> dict:
+        """
+        Set the test run values
+        :param succeed: (optional) updated succeed
+        :param failed: (optional) updated failed
+        :param blocked: (optional) updated blocked
+        :return: dict of the updated pin values of the run
+        """
+
+        if self.test_run.total == 0:
+            raise ValueError("The total value has not been setup, run init() first.")
+
+        with self._run_lock:
+            # Update givens values
+            self._stale = False
+            values = self.counters.totals()
+
+            if succeed is not None:
+                values[0] = succeed
+
+            if failed is not None:
+                values[1] = failed
+
+            if blocked is not None:
+                values[2] = blocked
+
+            self.counters.reset(values)
+            self._merge(values)
+
+            return self._update_dict()
+
+    def _increment(self, field: str, value: int = None) -> dict:
+        """
+        Increment one of the succeed, failed or blocked value
+        :param field: name of the incremented value
+        :param value: (optional) increment other than 1
+        :return: dict of the updated pin values of the run
+        """
+
+        self._count(field, value)
+
+        return self._collect()
+
+    def _count(self, field: str, value: int = None) -> bool:
+        """
+        Increment one of the succeed, failed or blocked value, lock free, the counters are
+        merged into the run information when it is read or published, and at once when the
+        history or the rate follow the counts
+        :param field: name of the incremented value
+        :param value: (optional) increment other than 1
+        :return: True if the increment may be an important transition, see _urgent
+        """
+
+        if value == 0:
+            raise ValueError("You really want to increment of 0?")
+
+        if value is None:
+            value = 1
+
+        if self._test_run.total == 0:
+            raise ValueError("The total value has not been setup, run init() first.")
+
+        index = self.COUNTED.index(field)
+        self.counters.add(index, value)
+        self._stale = True
+
+        # Racy hints, the threads may miss each other's increments until the next merge,
+        # a transition is then published with the next routine send
+        self._seen += value
+        urgent = False
+
+        if index == 1 and not self._failure_seen:
+            self._failure_seen = True
+            urgent = True
+        elif self._seen >= self._next_urgent:
+            # Once until the next merge, which sets the next threshold
+            self._next_urgent = float("inf")
+            urgent = True
+
+        # The history and the rate sample every count, whatever the flush interval
+        if self.history is not None or self.throughput is not None:
+            self._sync()
+
+        return urgent
+
+    def _collect(self) -> dict:
+        """
+        Merge the counters of every thread into the run information
+        :return: dict of the updated pin values of the run
+        """
+
+        with self._run_lock:
+            self._sync()
+
+            return self._update_dict()
+
+    def _sync(self):
+        """
+        Merge the counters of every thread into the run information, if counted since the last merge
+        :return: None
+        """
+
+        with self._run_lock:
+            if self._stale:
+                # Cleared first, a count racing with the merge is merged on the next read
+                self._stale = False
+                self._merge(self.counters.totals())
+
+    def _merge(self, values: list):
+        """
+        Set the run information from the counted values, called with the run lock held
+        :param values: succeed, failed and blocked values
+        :return: None
+        """
+
+        test_run = self._test_run
+        counted = test_run.actual
+        test_run.succeed, test_run.failed, test_run.blocked = values
+        test_run.actual = values[0] + values[1] + values[2]
+
+        if self.history is not None:
+            self.history.record(*values)
+
+        # Without new count, the rate is decayed when it is read
+        if self.throughput is not None and test_run.actual != counted:
+            self.throughput.update(test_run.actual)
+
+        if self.checkpoint is not None:
+            self.checkpoint.save(test_run)
+
+        self._sync_hints()
+
+    def _sync_hints(self):
+        """
+        Set the hints of the lock free counting from the run information
+        :return: None
+        """
+
+        test_run = self._test_run
+        total = test_run.total
+
+        self._seen = test_run.actual
+        self._failure_seen = test_run.failed > 0
+        # Smallest count reaching the next progress threshold
+        self._next_urgent = min((-(-threshold * total // 100) for threshold in self.THRESHOLDS
+                                 if test_run.actual * 100 < threshold * total), default=float("inf"))
+
+    def _stop_run(self) -> dict:
+        """
+        Stop the test run
+        :return: dict of the stop pin values of the run
+        """
+
+        with self._run_lock:
+            # The final values, the updates of concurrent threads may have been posted out of order
+            status_dict = {}
+            if self._test_run.total:
+                self._stale = False
+                self._merge(self.counters.totals())
+                status_dict = self._update_dict()
+
+            if self.checkpoint is not None:
+                # A stopped run is not resumed
+                self.checkpoint.save(self.test_run, STOPPED, force=True)
+                self.checkpoint.flush()
+
+        LOGGER.info("Stop run %s", self.app_id, extra=self._log_fields())
+
+        # Test run led
+        if self.pin_table.led is not None:
+            status_dict[self.pin_table.led] = 0
+
+        return status_dict
+
+    def _urgent(self, failed: int, actual: int) -> bool:
+        """
+        Check if the last change of the run is an important transition: the first failure
+        or the crossing of a progress threshold
+        :param failed: failed value before the change
+        :param actual: actual value before the change
+        :return: True if the change must be published without delay
+        """
+
+        test_run = self.test_run
+
+        if not failed and test_run.failed:
+            return True
+
+        total = test_run.total
+        if not total or actual == test_run.actual:
+            return False
+
+        return any(actual * 100 < threshold * total <= test_run.actual * 100 for threshold in self.THRESHOLDS)
+
+    def _log_fields(self) -> dict:
+        """
+        Run values attached to the log records
+        :return: dict of the app_status.log FIELDS
+        """
+
+        return {"app_id": self.app_id,
+                "run_name": self.test_run.name,
+                "date": self.test_run.date,
+                "actual": self.test_run.actual,
+                "total": self.test_run.total,
+                "succeed": self.test_run.succeed,
+                "failed": self.test_run.failed,
+                "blocked": self.test_run.blocked}
+
+    def _all_dict(self) -> dict:
+        """
+        Build all info of a test run
+        :return: dict of pin values
+        """
+
+        return {pin: formatter(self) for pin, formatter in self.pin_table.all}
+
+    def _update_dict(self) -> dict:
+        """
+        Build updated info of a test run
+        :return: dict of pin values
+        """
+
+        # TODO set number of leading zero depending on max value
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Update run %s: %s %s/%s with %sS - %sF - %sB", self.app_id, self.test_run.date,
+                         self.test_run.actual, self.test_run.total, self.test_run.succeed,
+                         self.test_run.failed, self.test_run.blocked, extra=self._log_fields())
+
+        return {pin: formatter(self) for pin, formatter in self.pin_table.update}
+
+    def _timed_dict(self) -> dict:
+        """
+        Build the info of a test run changing with the time since the last count
+        :return: dict of pin values
+        """
+
+        with self._run_lock:
+            return {pin: formatter(self) for pin, formatter in self.pin_table.timed}
+
+
+class RunStatus(RunModel, AppStatus):
+    """
+    Sub class to manage the status of a test run application
+
+    """
+
+    def __init__(self, blink_key, app_id=0, history=None, rate_half_life=None, rate_pins=None,
+                 layout=None, checkpoint=None, rate_refresh=1.0, **kwargs):
+        """
+        Class init
+        :param blink_key: the blynk auth key to be use
+        :param app_id: (optional) id of the application, used to offset the pins
+        :param history: (optional) True or a RunHistory from app_status.history to record
+                        the run progress at each update
+        :param rate_half_life: (optional) publish the tests per second and the ETA, estimated
+                               with this half life in seconds, None to disable
+        :param rate_pins: (optional) (rate pin, ETA pin) of the run, from its pin block,
+                          (PIN_RATE, PIN_ETA) by default
+        :param layout: (optional) Layout from app_status.layout mapping the run fields to pins,
+                       its rate and eta fields are estimated with rate_half_life or the default one
+        :param checkpoint: (optional) path of a file, or a Checkpoint from app_status.checkpoint,
+                           where the run state is saved to be resumed after a restart
+        :param rate_refresh: (optional) period in seconds of the publishing of the rate, ETA
+                             and led of a started run, so that a stall is shown without new count
+        :param kwargs: (optional) other AppStatus options
+        """
+
+        super().__init__(blink_key, app_id, **kwargs)
+
+        if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+            checkpoint = Checkpoint(checkpoint)
+        self.checkpoint = checkpoint
+
+        if history is True:
+            history = RunHistory()
+        self.history = history
+
+        if layout is not None:
+            self.layout = layout
+
+        if rate_half_life is not None:
+            self.throughput = RateEstimator(rate_half_life)
+
+            if rate_pins is None:
+                rate_pins = (self.PIN_RATE, self.PIN_ETA)
+            if len(rate_pins) != 2:
+                raise ValueError("A rate pin and an ETA pin are needed")
+            # The layout checks that they do not overlap the other fields
+            self.layout = self.layout.with_fields(rate=rate_pins[0], eta=rate_pins[1])
+
+        self._new_run()
+
+        # Publishing of the decayed rate between the counts
+        self._refresher = None
+        if self.throughput is not None:
+            self._refresher = Periodic(self._refresh, rate_refresh, "app-status-rate")
 
     def start(self, total: int, name: str = None):
         """
@@ -90,19 +711,31 @@ class RunStatus(AppStatus):
         :return: None
         """
 
-        # Clean the run
-        self.test_run = RunElements()
+        # A run start is a full refresh of the phone screen
+        self._publish(self._start_run, total, name, force=True, urgent=True)
+
+        if self._refresher is not None:
+            self._refresher.start()
+
+    def resume(self) -> bool:
+        """
+        Method to continue the test run saved in the checkpoint, after a restart
 
-        if name is not None:
-            self.test_run.name = name
+        The name and date pins kept by the phone application are not sent again,
+        only the progress values are.
+        :return: True if a running test run has been resumed, else start() is needed
+        """
+
+        status_dict = self._resume_run()
+        if status_dict is None:
+            return False
 
-        self.test_run.total = total
+        self.post_dict(status_dict)
 
-        # Init the start run date
-        from datetime import datetime
-        self.test_run.date = datetime.now().strftime("%d-%m-%Y (%H:%M)")
+        if self._refresher is not None:
+            self._refresher.start()
 
-        self.__send_all()
+        return True
 
     def update(self, succeed: int = None, failed: int = None, blocked: int = None):
         """
@@ -114,24 +747,7 @@ class RunStatus(AppStatus):
         :return: None
         """
 
-        if self.test_run.total == 0:
-            raise ValueError("The total value has not been setup, run init() first.")
-
-        # Update givens values
-        if succeed is not None:
-            self.test_run.succeed = succeed
-
-        if failed is not None:
-            self.test_run.failed = failed
-
-        if blocked is not None:
-            self.test_run.blocked = blocked
-
-        self.test_run.actual = (self.test_run.succeed
-                                + self.test_run.failed
-                                + self.test_run.blocked)
-
-        self.__send_update()
+        self._publish(self._update_run, succeed, failed, blocked)
 
     def add_blocked(self, value: int = None):
         """
@@ -140,17 +756,7 @@ class RunStatus(AppStatus):
         :return: None
         """
 
-        if value == 0:
-            raise ValueError("You really want to increment of 0?")
-
-        if value is None:
-            self.test_run.actual += 1
-            self.test_run.blocked += 1
-        else:
-            self.test_run.actual += value
-            self.test_run.blocked += value
-
-        self.__send_update()
+        self.link.post_source(self._build_source, self._count("blocked", value))
 
     def add_succeed(self, value: int = None):
         """
@@ -159,17 +765,7 @@ class RunStatus(AppStatus):
         :return: None
         """
 
-        if value == 0:
-            raise ValueError("You really want to increment of 0?")
-
-        if value is None:
-            self.test_run.actual += 1
-            self.test_run.succeed += 1
-        else:
-            self.test_run.actual += value
-            self.test_run.succeed += value
-
-        self.__send_update()
+        self.link.post_source(self._build_source, self._count("succeed", value))
 
     def add_failed(self, value: int = None):
         """
@@ -178,96 +774,86 @@ class RunStatus(AppStatus):
         :return: None
         """
 
-        if value == 0:
-            raise ValueError("You really want to increment of 0?")
+        self.link.post_source(self._build_source, self._count("failed", value))
 
-        if value is None:
-            self.test_run.actual += 1
-            self.test_run.failed += 1
-        else:
-            self.test_run.actual += value
-            self.test_run.failed += value
+    def stop(self, timeout: float = None) -> bool:
+        """
+        Sent a stop information to the blynk phone application
+        :param timeout: (optional) in background mode, maximum time in seconds to wait for
+                        the stop information to be written, None to wait forever
+        :return: True if everything has been written
+        """
+
+        # Stopped first, the stop led must not be published again
+        if self._refresher is not None and self._refresher.running:
+            self._refresher.stop()
 
-        self.__send_update()
+        self._publish(self._stop_run, urgent=True)
 
-    def stop(self):
+        # The final status must not stay in the coalescing buffer
+        return self.flush(timeout)
+
+    def close(self, timeout: float = None) -> bool:
         """
-        Sent a stop information to the blynk phone application
-        :return: None
+        Send the pending values, release the connection and the checkpoint file
+        :param timeout: (optional) maximum time in seconds to wait for the writes
+        :return: True if everything has been written
         """
 
-        print("Status sent: stop")
+        if self._refresher is not None and self._refresher.running:
+            self._refresher.stop()
 
-        offset = self.app_id * 10
+        drained = super().close(timeout)
 
-        status_dict = {}
-        # Test run led
-        status_dict[offset + self.PIN_LED] = 0
+        if self.checkpoint is not None:
+            self.checkpoint.close()
 
-        self.post_dict(status_dict)
+        return drained
 
-    def __send_all(self):
+    def _refresh(self):
         """
-        Send all info of a test run
+        Post the rate, ETA and led of the run, decayed since the last count
         :return: None
         """
 
-        offset = self.app_id * 10
-
-        print("Start run {} - {} @ {} with {} tests".format(self.app_id,
-                                                            self.test_run.name,
-                                                            self.test_run.date,
-                                                            self.test_run.total))
-
-        status_dict = {}
-        # Test run name
-        status_dict[offset + self.PIN_NAME] = self.test_run.name
-        # Test run start datetime
-        status_dict[offset + self.PIN_DATE] = self.test_run.date
-        # Test run advance status string
-        status_dict[offset + self.PIN_STATUS_TEXT] = "{}/{}".format(self.test_run.actual,
-                                                                    self.test_run.total)
-        # Test run advance status percent
-        percent = self.test_run.actual / self.test_run.total * 100
-        status_dict[offset + self.PIN_STATUS_GRAPH] = percent
-        # Test run result type numbers
-        status_dict[offset + self.PIN_TYPES] = "S{} F{} B{}".format(self.test_run.succeed,
-                                                                    self.test_run.failed,
-                                                                    self.test_run.blocked)
-        # Test run led TODO manage color
-        status_dict[offset + self.PIN_LED] = 255
+        if self.test_run.total:
+            self.post_dict(self._timed_dict())
 
-        self.post_dict(status_dict)
+    def _build_source(self) -> dict:
+        """
+        Merge the counters and build the updated pin values when the link sends them,
+        timing the build when the metrics are enabled
+        :return: dict of the updated pin values of the run
+        """
+
+        metrics = self.link.metrics
+        if metrics is None:
+            return self._collect()
+
+        start = time.perf_counter()
+        status_dict = self._collect()
+        metrics.time("format", time.perf_counter() - start)
 
-    def __send_update(self):
+        return status_dict
+
+    def _publish(self, build, *args, force: bool = False, urgent: bool = False):
         """
-        Send updated info of a test run
+        Build the pin values and post them, timing the build when the metrics are enabled
+        :param build: method updating the run and returning its pin values
+        :param args: build arguments
+        :param force: (optional) send every pin even if delta mode would skip it
+        :param urgent: (optional) send them without delay, also done for the important transitions
         :return: None
         """
 
-        offset = self.app_id * 10
+        failed, actual = self.test_run.failed, self.test_run.actual
 
-        # TODO set number of leading zero depending on max value
-        print("Update run {}: {} {}/{} with {}S - {}F - {}B".format(self.app_id,
-                                                                    self.test_run.date,
-                                                                    self.test_run.actual,
-                                                                    self.test_run.total,
-                                                                    self.test_run.succeed,
-                                                                    self.test_run.failed,
-                                                                    self.test_run.blocked))
-
-        status_dict = {}
-        # Test run advance status string
-        status_dict[offset + self.PIN_STATUS_TEXT] = "{}/{}".format(self.test_run.actual,
-                                                                    self.test_run.total)
-        # Test run advance status percent
-        percent = self.test_run.actual / self.test_run.total * 100
-        status_dict[offset + self.PIN_STATUS_GRAPH] = percent
-        # Test run result type number
-        status_dict[offset + self.PIN_TYPES] = "S{} F{} B{}".format(self.test_run.succeed,
-                                                                    self.test_run.failed,
-                                                                    self.test_run.blocked)
-        # Test run led TODO manage color
-        status_dict[offset + self.PIN_LED] = 255
+        metrics = self.link.metrics
+        if metrics is None:
+            status_dict = build(*args)
+        else:
+            start = time.perf_counter()
+            status_dict = build(*args)
+            metrics.time("format", time.perf_counter() - start)
 
-        self.post_dict(status_dict)
+        self.post_dict(status_dict, force, urgent or self._urgent(failed, actual))
@@ -0,0 +1,107 @@
+"""
+Thread safe counters of the app status
+
+Each thread increments its own shard without any lock, the shards are summed
+when the values are published
+
+"""
+
+import threading
+from array import array
+
+
+class ShardedCounters:
+    """
+    Class to
+        - count from many threads without losing increments
+        - sum the per-thread shards on read
+    """
+
+    __slots__ = ("size", "_base", "_shards", "_local", "_generation", "_lock")
+
+    def __init__(self, size: int, values=None):
+        """
+        Class init
+        :param size: number of counters
+        :param values: (optional) initial values, 0 by default
+        """
+
+        self.size = size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._set(values)
+
+    def add(self, index: int, value: int = 1):
+        """
+        Increment a counter from the calling thread
+        :param index: counter index
+        :param value: (optional) increment
+        :return: None
+        """
+
+        local = self._local
+        if getattr(local, "generation", None) is not self._generation:
+            self._register(local)
+
+        local.shard[index] += value
+
+    def totals(self) -> list:
+        """
+        :return: list of the counters values, summed over all the threads
+        """
+
+        with self._lock:
+            totals = list(self._base)
+            alive = []
+
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    # A finished thread will not write its shard again, it is folded in the base
+                    for index, value in enumerate(shard):
+                        self._base[index] += value
+
+                for index, value in enumerate(shard):
+                    totals[index] += value
+
+            self._shards = alive
+
+        return totals
+
+    def reset(self, values=None):
+        """
+        Set all the counters, dropping the shards of the threads
+        An increment running at the same time as the reset can be lost
+        :param values: (optional) new values, 0 by default
+        :return: None
+        """
+
+        with self._lock:
+            self._set(values)
+
+    def _set(self, values):
+        """
+        Start a new generation of shards from a base
+        :param values: base values, None for 0
+        :return: None
+        """
+
+        self._base = array("q", [0] * self.size if values is None else values)
+        self._shards = []
+        # The threads compare it with the generation of their shard
+        self._generation = object()
+
+    def _register(self, local):
+        """
+        Create the shard of the calling thread
+        :param local: thread local storage of the shard
+        :return: None
+        """
+
+        shard = array("q", [0] * self.size)
+
+        with self._lock:
+            self._shards.append((threading.current_thread(), shard))
+            local.shard = shard
+            local.generation = self._generation
@@ -0,0 +1,155 @@
+"""
+Multiple test runs status screen manager
+
+It manages several test runs on one blynk application and publishes the
+changes of all of them in a single batched write
+
+"""
+
+from .core import AppStatus, RunModel, RunElements
+from .link import VPIN_MAX
+
+
+class DashboardRun(RunModel):
+    """
+    Sub class to manage one test run of a dashboard
+
+    """
+
+    def __init__(self, run_id: int, layout):
+        self.app_id = run_id
+        self.layout = layout
+        self._new_run()
+
+
+class RunDashboard(AppStatus):
+    """
+    Sub class to manage the status of several test runs on one application
+
+    """
+
+    def __init__(self, blink_key, max_run: int = RunModel.MAX_RUN, delta: bool = True, layout=None, **kwargs):
+        """
+        Class init
+        :param blink_key: the blynk auth key to be use
+        :param max_run: (optional) number of managed test runs, run ids go from 0 to max_run - 1
+        :param delta: (optional) only send the pins whose value changed since the last write
+        :param layout: (optional) Layout from app_status.layout mapping the run fields to pins,
+                       a packed layout fits more runs, the rate and eta fields are estimated
+                       with the default half life
+        :param kwargs: (optional) other AppStatus options
+        """
+
+        if layout is None:
+            layout = RunModel.layout
+
+        if not 1 <= max_run <= layout.max_runs(VPIN_MAX):
+            raise ValueError("Between 1 and {} runs can be managed".format(layout.max_runs(VPIN_MAX)))
+
+        super().__init__(blink_key, 0, delta=delta, **kwargs)
+
+        self.layout = layout
+        self.max_run = max_run
+        self.runs = {}
+
+    def run(self, run_id: int) -> RunElements:
+        """
+        Get the information of a started test run
+        :param run_id: id of the test run
+        :return: the test run information
+        """
+
+        return self.__get(run_id).test_run
+
+    def start(self, run_id: int, total: int, name: str = None):
+        """
+        Method to sync a test run information with the phone application at startup
+
+        :param run_id: id of the test run, from 0 to max_run - 1
+        :param total: total number of test for this run
+        :param name: name of test run
+        :return: None
+        """
+
+        if not 0 <= run_id < self.max_run:
+            raise ValueError("The run id must be between 0 and {}".format(self.max_run - 1))
+
+        run = DashboardRun(run_id, self.layout)
+        self.runs[run_id] = run
+
+        # A run start is a full refresh of its pins
+        self.post_dict(run._start_run(total, name), force=True, urgent=True)
+
+    def update_many(self, updates: dict):
+        """
+        Set the values of several test runs and send them in one batch
+
+        :param updates: dict of run_id : (succeed, failed, blocked), a None value is not updated
+        :return: None
+        """
+
+        status_dict = {}
+        urgent = False
+        for run_id, values in updates.items():
+            run = self.__get(run_id)
+            failed, actual = run.test_run.failed, run.test_run.actual
+            status_dict.update(run._update_run(*values))
+            urgent = urgent or run._urgent(failed, actual)
+
+        self.post_dict(status_dict, urgent=urgent)
+
+    def add_many(self, increments: dict):
+        """
+        Increment the values of several test runs and send them in one batch
+
+        :param increments: dict of run_id : (succeed, failed, blocked) increments, 0 or None to skip
+        :return: None
+        """
+
+        status_dict = {}
+        urgent = False
+        for run_id, values in increments.items():
+            run = self.__get(run_id)
+            failed, actual = run.test_run.failed, run.test_run.actual
+            counted = [(field, value) for field, value in zip(run.COUNTED, values) if value]
+            if not counted:
+                continue
+            for field, value in counted:
+                run._count(field, value)
+            # One merge of the counters per run
+            status_dict.update(run._collect())
+            urgent = urgent or run._urgent(failed, actual)
+
+        self.post_dict(status_dict, urgent=urgent)
+
+    def stop(self, run_ids=None):
+        """
+        Sent a stop information of test runs to the blynk phone application
+
+        :param run_ids: (optional) ids of the stopped runs, all the started runs by default
+        :return: None
+        """
+
+        if run_ids is None:
+            run_ids = list(self.runs)
+
+        status_dict = {}
+        for run_id in run_ids:
+            status_dict.update(self.__get(run_id)._stop_run())
+
+        self.post_dict(status_dict)
+
+        # The final status must not stay in the coalescing buffer
+        self.flush()
+
+    def __get(self, run_id: int) -> DashboardRun:
+        """
+        Get a started run
+        :param run_id: id of the test run
+        :return: the run
+        """
+
+        try:
+            return self.runs[run_id]
+        except KeyError:
+            raise ValueError("The run {} has not been started, run start() first.".format(run_id))
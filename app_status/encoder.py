@@ -0,0 +1,79 @@
+"""
+Precompiled encoder of the blynk virtual write messages
+
+blynklib packs each virtual write in its own message: a join of str() of every
+argument, an encode and a struct.pack, then one socket write per pin. The
+encoder builds all the messages of a batch in one reused bytearray instead:
+    - the "vw\\0<pin>\\0" prefix of each pin is encoded once
+    - the encoded value of each pin is kept, an unchanged value is not encoded again
+    - the message headers are packed in place in the frame
+The frame is then sent with a single socket write.
+
+"""
+
+import struct
+
+
+HEADER = struct.Struct("!BHH")
+
+# blynklib.Protocol.MSG_HW, not imported to keep blynklib out of the encoder
+MSG_HW = 20
+
+
+class FrameEncoder:
+    """
+    Class to
+        - encode a batch of pin values as consecutive blynk messages in a reused frame
+    """
+
+    __slots__ = ("_frame", "_prefixes", "_encoded")
+
+    def __init__(self):
+        """
+        Class init
+        """
+
+        self._frame = bytearray()
+        # pin: encoded "vw\0<pin>\0"
+        self._prefixes = {}
+        # pin: (last value, its encoded message body)
+        self._encoded = {}
+
+    def encode(self, status_dict: dict, msg_id: int):
+        """
+        Encode a batch of pin values
+        :param status_dict: dict of values with pair of id : value
+        :param msg_id: id of the previous message, the ids wrap after 0xFFFF as 0 is not valid
+        :return: (memoryview of the frame, id of the last message), the view must be released
+                 before the next encode, which reuses the frame
+        """
+
+        frame = self._frame
+        encoded = self._encoded
+        pack_into = HEADER.pack_into
+        head_size = HEADER.size
+        size = 0
+
+        for pin, value in status_dict.items():
+            cached = encoded.get(pin)
+            if cached is not None and cached[0] == value and type(cached[0]) is type(value):
+                body = cached[1]
+            else:
+                prefix = self._prefixes.get(pin)
+                if prefix is None:
+                    prefix = "vw\0{}\0".format(pin).encode("utf-8")
+                    self._prefixes[pin] = prefix
+                body = prefix + str(value).encode("utf-8")
+                encoded[pin] = (value, body)
+
+            start = size + head_size
+            size = start + len(body)
+            if size > len(frame):
+                # Grown once, then reused
+                frame.extend(bytes(size - len(frame)))
+
+            msg_id = msg_id % 0xFFFF + 1
+            pack_into(frame, start - head_size, MSG_HW, msg_id, len(body))
+            frame[start:size] = body
+
+        return memoryview(frame)[:size], msg_id
@@ -0,0 +1,222 @@
+"""
+History of the test run progress
+
+A RunHistory records the run counters at each update in typed columns, one
+array per value, so a 100k tests campaign costs a few MB and a few appends per
+update. The recorded curve gives the throughput, the ETA, and can be
+downsampled or exported:
+    - to CSV, one row per sample
+    - to a columnar binary file, read back with RunHistory.load
+
+    status = RunStatus(key, history=True)
+    ...
+    status.history.rate(window=60), status.history.eta()
+
+"""
+
+import csv
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+# Binary file header: magic, version, samples count, total, start epoch
+HEADER = struct.Struct("<4sHxxQqd")
+MAGIC = b"RHST"
+VERSION = 1
+
+COLUMNS = ("time", "succeed", "failed", "blocked")
+
+
+class RunHistory:
+    """
+    Class to
+        - record the counters of a test run over time in typed columns
+        - compute its rate and ETA
+        - downsample and export the recorded curve
+    """
+
+    __slots__ = ("total", "started", "times", "succeed", "failed", "blocked", "_origin", "_lock")
+
+    def __init__(self):
+        """
+        Class init
+        """
+
+        self._lock = threading.Lock()
+        self.start(0)
+
+    def __len__(self):
+        """
+        :return: number of recorded samples
+        """
+
+        return len(self.times)
+
+    def start(self, total: int):
+        """
+        Clear the history for a new run
+        :param total: total number of test of the run
+        :return: None
+        """
+
+        with self._lock:
+            self.total = total
+            # Wall clock of the start, the sample times are relative to it
+            self.started = time.time()
+            self._origin = time.perf_counter()
+
+            self.times = array("d")
+            self.succeed = array("q")
+            self.failed = array("q")
+            self.blocked = array("q")
+
+    def record(self, succeed: int, failed: int, blocked: int):
+        """
+        Append a sample of the counters
+        :param succeed: succeed value
+        :param failed: failed value
+        :param blocked: blocked value
+        :return: None
+        """
+
+        with self._lock:
+            # Timestamped under the lock, the times of concurrent threads stay sorted
+            self.times.append(time.perf_counter() - self._origin)
+            self.succeed.append(succeed)
+            self.failed.append(failed)
+            self.blocked.append(blocked)
+
+    def actual(self, index: int = -1) -> int:
+        """
+        Number of tests done at a sample
+        :param index: (optional) sample index, the last one by default
+        :return: succeed + failed + blocked
+        """
+
+        return self.succeed[index] + self.failed[index] + self.blocked[index]
+
+    def rate(self, window: float = None) -> float:
+        """
+        Throughput of the run
+        :param window: (optional) only use the last window seconds, the whole run by default
+        :return: tests per second, 0.0 when not enough samples
+        """
+
+        times = self.times
+        if not times:
+            return 0.0
+
+        last = len(times) - 1
+        if window is None:
+            start_time, start_count = 0.0, 0
+        else:
+            first = bisect_left(times, times[last] - window)
+            start_time, start_count = times[first], self.actual(first)
+
+        elapsed = times[last] - start_time
+        if elapsed <= 0:
+            return 0.0
+
+        return (self.actual(last) - start_count) / elapsed
+
+    def eta(self, window: float = None) -> float:
+        """
+        Estimated remaining time of the run
+        :param window: (optional) rate window in seconds, the whole run by default
+        :return: remaining seconds, None when the rate is unknown
+        """
+
+        rate = self.rate(window)
+        if not rate:
+            return None
+
+        return max(self.total - self.actual(), 0) / rate
+
+    def downsample(self, points: int):
+        """
+        Reduce the history to the last sample of points equal time buckets
+        :param points: maximum number of samples
+        :return: a new RunHistory
+        """
+
+        if points < 1:
+            raise ValueError("At least one point is needed")
+
+        history = RunHistory()
+        history.total = self.total
+        history.started = self.started
+
+        times = self.times
+        if not times:
+            return history
+
+        step = times[-1] / points
+        previous = -1
+        for bucket in range(1, points + 1):
+            index = bisect_right(times, step * bucket) - 1
+            if bucket == points:
+                index = len(times) - 1
+            if index > previous:
+                history.times.append(times[index])
+                history.succeed.append(self.succeed[index])
+                history.failed.append(self.failed[index])
+                history.blocked.append(self.blocked[index])
+                previous = index
+
+        return history
+
+    def rows(self):
+        """
+        :return: iterator of the (time, succeed, failed, blocked) samples
+        """
+
+        return zip(self.times, self.succeed, self.failed, self.blocked)
+
+    def to_csv(self, path):
+        """
+        Export the samples to a CSV file, times in seconds from the run start
+        :param path: path of the file
+        :return: None
+        """
+
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.rows())
+
+    def save(self, path):
+        """
+        Export the samples to a columnar binary file
+        :param path: path of the file
+        :return: None
+        """
+
+        with self._lock:
+            with open(path, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION, len(self.times), self.total, self.started))
+                # Columns in the native byte order
+                for column in (self.times, self.succeed, self.failed, self.blocked):
+                    column.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a columnar binary file written by save
+        :param path: path of the file
+        :return: the RunHistory
+        """
+
+        history = cls()
+
+        with open(path, "rb") as file:
+            magic, version, count, history.total, history.started = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("{} is not a run history file".format(path))
+
+            for column in (history.times, history.succeed, history.failed, history.blocked):
+                column.fromfile(file, count)
+
+        return history
@@ -0,0 +1,225 @@
+"""
+Pin layout of the test runs
+
+A layout maps the fields of a run to virtual pins, relative to the block of
+pins of the run, and gives the formatter of each field. It is validated once
+and compiled per run into pin tables, the run payloads are then built by a
+single loop over a table:
+
+    layout = Layout({"status_text": 0, "status_graph": 1, "led": 2}, stride=3)
+    RunDashboard(key, max_run=80, layout=layout)
+
+The block of the run app_id starts at the pin app_id * stride.
+
+"""
+
+from .rate import format_duration
+
+
+def _name(model):
+    return model.test_run.name
+
+
+def _date(model):
+    return model.test_run.date
+
+
+def _status_text(model):
+    return "{}/{}".format(model.test_run.actual, model.test_run.total)
+
+
+def _status_graph(model):
+    return model.test_run.actual / model.test_run.total * 100
+
+
+def _types(model):
+    test_run = model.test_run
+    return "S{} F{} B{}".format(test_run.succeed, test_run.failed, test_run.blocked)
+
+
+def _led(model):
+    # TODO manage color
+    throughput = model.throughput
+    if throughput is not None and throughput.dropped():
+        return model.LED_DROP
+    return 255
+
+
+def _rate(model):
+    return round(model.throughput.rate_at() or 0.0, 2)
+
+
+def _eta(model):
+    test_run = model.test_run
+    return format_duration(model.throughput.eta(test_run.total - test_run.actual))
+
+
+# Formatters of the known fields, called with the run model
+FORMATTERS = {
+    "name": _name,
+    "date": _date,
+    "status_text": _status_text,
+    "status_graph": _status_graph,
+    "types": _types,
+    "led": _led,
+    "rate": _rate,
+    "eta": _eta,
+}
+
+# Fields only sent at the start of a run, the others are sent at each update
+START_FIELDS = ("name", "date")
+
+# Fields changing with the time since the last count, refreshed while nothing is counted
+TIMED_FIELDS = ("led", "rate", "eta")
+
+# Fields computed by the RateEstimator of the run
+RATE_FIELDS = ("rate", "eta")
+
+# Default layout, a block of 10 pins per run
+DEFAULT_PINS = {
+    "name": 0,
+    "date": 1,
+    "status_text": 2,
+    "status_graph": 3,
+    "types": 4,
+    "led": 5,
+}
+
+
+class PinTable:
+    """
+    Class to
+        - hold the compiled (pin, formatter) pairs of one run
+    """
+
+    __slots__ = ("all", "update", "led", "timed")
+
+    def __init__(self, all_pins: tuple, update: tuple, led: int = None, timed: tuple = ()):
+        """
+        Class init
+        :param all_pins: (pin, formatter) of every field, sent at the start
+        :param update: (pin, formatter) of the fields sent at each update
+        :param led: (optional) pin of the run led, None without led field
+        :param timed: (optional) (pin, formatter) of the fields refreshed without update
+        """
+
+        self.all = all_pins
+        self.update = update
+        self.led = led
+        self.timed = timed
+
+
+class Layout:
+    """
+    Class to
+        - map the fields of a run to pins, with their formatters
+        - validate the mapping and compile it for a run
+    """
+
+    def __init__(self, pins: dict = None, stride: int = None, formatters: dict = None):
+        """
+        Class init
+        :param pins: (optional) dict of field : pin relative to the block of the run,
+                     DEFAULT_PINS by default
+        :param stride: (optional) number of pins of the block of a run, 10 by default,
+                       or just the used ones with packed()
+        :param formatters: (optional) dict of field : callable(run model) returning the
+                           value, overriding FORMATTERS or defining new fields
+        """
+
+        self.pins = dict(DEFAULT_PINS if pins is None else pins)
+        self.stride = 10 if stride is None else stride
+        self.formatters = dict(FORMATTERS)
+        if formatters:
+            self.formatters.update(formatters)
+
+        self._tables = {}
+        self._validate()
+
+    @property
+    def has_rate(self) -> bool:
+        """
+        True when the layout has a field computed by a RateEstimator
+        """
+
+        return any(field in self.pins for field in RATE_FIELDS)
+
+    def with_fields(self, **pins):
+        """
+        Copy of the layout with more fields
+        :param pins: field=pin of the added fields
+        :return: the new layout
+        """
+
+        added = dict(self.pins)
+        added.update(pins)
+
+        return Layout(added, self.stride, self.formatters)
+
+    def packed(self):
+        """
+        Copy of the layout whose run blocks have no unused pins at their end
+        :return: the new layout
+        """
+
+        return Layout(self.pins, max(self.pins.values()) + 1, self.formatters)
+
+    def max_runs(self, vpin_max: int) -> int:
+        """
+        Number of runs fitting in the virtual pins
+        :param vpin_max: highest virtual pin
+        :return: number of runs
+        """
+
+        return (vpin_max - max(self.pins.values())) // self.stride + 1
+
+    def compile(self, app_id: int) -> PinTable:
+        """
+        Compile the layout for a run, the tables are cached
+        :param app_id: id of the run
+        :return: the pin table of the run
+        """
+
+        table = self._tables.get(app_id)
+        if table is not None:
+            return table
+
+        offset = app_id * self.stride
+        formatters = self.formatters
+
+        all_pins = tuple((offset + pin, formatters[field]) for field, pin in self.pins.items())
+        update = tuple((offset + pin, formatters[field]) for field, pin in self.pins.items()
+                       if field not in START_FIELDS)
+        timed = tuple((offset + pin, formatters[field]) for field, pin in self.pins.items()
+                      if field in TIMED_FIELDS)
+        led = self.pins.get("led")
+
+        table = PinTable(all_pins, update, None if led is None else offset + led, timed)
+        self._tables[app_id] = table
+
+        return table
+
+    def _validate(self):
+        """
+        Check the fields and their pins
+        :return: None
+        """
+
+        if not self.pins:
+            raise ValueError("A layout needs at least one field")
+
+        used = {}
+        for field, pin in self.pins.items():
+            if field not in self.formatters:
+                raise ValueError("No formatter for the field {}".format(field))
+
+            if not 0 <= pin < self.stride:
+                raise ValueError("The pin of {} must be between 0 and {}".format(field, self.stride - 1))
+
+            if pin in used:
+                raise ValueError("The fields {} and {} overlap on the pin {}".format(used[pin], field, pin))
+
+            used[pin] = field
+
+
+DEFAULT_LAYOUT = Layout()
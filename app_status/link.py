@@ -0,0 +1,883 @@
+"""
+Blynk connection shared by the app status
+
+A link owns one connection and the delivery of the pin values to it:
+delta filtering, coalescing and background sending. Several AppStatus,
+one per app_id, can share a link through the connection pool so their
+writes are merged in the same batches
+
+"""
+
+import sys
+import threading
+import time
+
+from .log import LOGGER
+from .sender import Sender, BLOCK, COALESCE
+from .spool import Spool
+
+
+# Connection establishment modes
+EAGER = "eager"
+LAZY = "lazy"
+BACKGROUND = "background"
+
+CONNECT_MODES = (EAGER, LAZY, BACKGROUND)
+
+# Highest blynk virtual pin
+VPIN_MAX = 255
+
+
+def unchanged(last_sent: dict, pin, value) -> bool:
+    """
+    Check if a value is the last one sent to its pin
+    :param last_sent: dict of pin : last sent value
+    :param pin: virtual pin of the value
+    :param value: the value to send
+    :return: True if it does not need to be sent again
+    """
+
+    if pin not in last_sent:
+        return False
+
+    last = last_sent[pin]
+    # Type is checked too as 1 == 1.0 but the phone displays them differently
+    return last == value and type(last) is type(value)
+
+
+def open_blynk(blink_key):
+    """
+    Create the default blynk connection of an auth key, blynklib is only imported here,
+    the batched frames of app_status.transport.BlynkTransport are opt-in
+    :param blink_key: the blynk auth key to be use
+    :return: the blynklib.Blynk connection, not connected yet
+    """
+
+    import blynklib  # pylint: disable=import-outside-toplevel
+
+    return blynklib.Blynk(blink_key)
+
+
+def silent_writes(blynk) -> bool:
+    """
+    Check if the writes of a connection report their socket errors only by returning None,
+    as the ones of blynklib, which retries them and carries on
+    :param blynk: the blynk connection or a transport
+    :return: True for a blynklib connection without batched writes
+    """
+
+    # Not imported here, a connection of blynklib implies it is already loaded
+    blynk_class = getattr(sys.modules.get("blynklib"), "Blynk", None)
+
+    return isinstance(blynk_class, type) and isinstance(blynk, blynk_class) and not hasattr(blynk, "write_batch")
+
+
+class Link:
+    """
+    Class to
+        - own a blynk connection
+        - deliver the posted pin values to it
+    """
+
+    # Minimum time in seconds between two reconnection attempts while spooling
+    RECONNECT_INTERVAL = 5.0
+
+    # Adaptive mode: interval of the routine writes, from the observed write round trip
+    MIN_INTERVAL = 0.02
+    MAX_INTERVAL = 2.0
+    RTT_FACTOR = 2.0
+    # Weight of the last round trip in its moving average
+    RTT_WEIGHT = 0.2
+
+    def __init__(self, blynk, delta=False, flush_interval_ms=None,
+                 background=False, queue_size=64, policy=BLOCK, metrics=None, spool=None,
+                 connect=EAGER, adaptive=False):
+        """
+        Class init
+        :param blynk: the blynk connection or a transport from app_status.transport
+        :param delta: (optional) only send the pins whose value changed since the last write
+        :param flush_interval_ms: (optional) coalesce the posts and send them at most every
+                                  flush_interval_ms, the last ones at the end of the interval,
+                                  None to send each post immediately
+        :param background: (optional) write to the connection from a dedicated sender thread
+        :param queue_size: (optional) size of the background sender queue
+        :param policy: (optional) backpressure policy of the background sender queue
+                       BLOCK, DROP_OLDEST or COALESCE from app_status.sender
+        :param metrics: (optional) Metrics instrumenting the delivery, None to disable
+        :param spool: (optional) path of an offline spool file, the writes made while the
+                      connection is down are logged there and replayed once it is back,
+                      always from a background sender, with COALESCE instead of BLOCK if
+                      background is not set, as a reconnection may block for 30s
+        :param connect: (optional) when the connection is established
+                        EAGER right away, LAZY on the first write, BACKGROUND from a
+                        dedicated thread, the posts made until it is ready are coalesced
+        :param adaptive: (optional) coalesce the routine posts over an interval following the
+                         write round trip time and the sender queue depth, flush_interval_ms
+                         being its minimum, the urgent posts are sent right away
+        """
+
+        if connect not in CONNECT_MODES:
+            raise ValueError("Unknown connect mode {}, use one of {}".format(connect, CONNECT_MODES))
+
+        self.blynk = blynk
+        self.metrics = metrics
+        self._silent_writes = silent_writes(blynk)
+
+        # Shadow of the last value written to each virtual pin
+        self.delta = delta
+        self.last_sent = {}
+        self.writes_sent = 0
+        self.writes_saved = 0
+
+        # Coalescing of the posts, only the latest value of each pin is kept
+        self.flush_interval = None if flush_interval_ms is None else flush_interval_ms / 1000
+        self.adaptive = adaptive
+        if adaptive and self.flush_interval is None:
+            self.flush_interval = self.MIN_INTERVAL
+        # Moving average of the write round trip, in seconds
+        self.rtt = None
+        self.pending = {}
+        self._pending_force = False
+        # Callables building their pin values when the pending ones are sent, in post order
+        self._sources = {}
+        self._last_flush = None
+        # One-shot timer sending the pending values at the end of the interval
+        self._timer = None
+
+        # Offline spool
+        self.spool = None if spool is None else Spool(spool)
+        self._last_reconnect = None
+
+        # Posts may come from several app status on several threads
+        self._lock = threading.RLock()
+
+        # Set once the connection has been established
+        self._ready = threading.Event()
+        self._connector = None
+
+        if connect == EAGER:
+            self._open()
+            self._ready.set()
+
+        # The reconnections while spooling are kept off the posting threads
+        if spool is not None and not background:
+            background = True
+            if policy == BLOCK:
+                policy = COALESCE
+
+        # Background delivery
+        self.sender = Sender(self._write, queue_size, policy, metrics) if background else None
+
+        if connect == BACKGROUND:
+            self._connector = threading.Thread(target=self._open_background, name="app-status-connect",
+                                               daemon=True)
+            self._connector.start()
+
+    def post(self, status_dict: dict, force: bool = False, urgent: bool = False):
+        """
+        Post a dict of pin values
+        :param status_dict: dict of values with pair of id : value
+        :param force: (optional) send every pin even if delta mode would skip it
+        :param urgent: (optional) in adaptive mode, send it with the pending values now,
+                       without waiting for the coalescing interval
+        :return: None
+        """
+
+        metrics = self.metrics
+        if metrics is None:
+            self._post(status_dict, force, urgent)
+            return
+
+        start = time.perf_counter()
+        self._post(status_dict, force, urgent)
+        metrics.time("post", time.perf_counter() - start)
+
+    def post_source(self, source, urgent: bool = False):
+        """
+        Post the pin values of a source, built only when they are sent, so that the posts
+        of a source between two sends cost a lookup and its values are built once
+        :param source: callable without argument returning a dict of pin values,
+                       called with the link lock held
+        :param urgent: (optional) in adaptive mode, send its values with the pending ones now,
+                       without waiting for the coalescing interval
+        :return: None
+        """
+
+        # Without lock, already waiting for the next send which builds the latest values
+        if not urgent and source in self._sources:
+            return
+
+        metrics = self.metrics
+        if metrics is None:
+            self._post(None, False, urgent, source)
+            return
+
+        start = time.perf_counter()
+        self._post(None, False, urgent, source)
+        metrics.time("post", time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        """
+        :return: snapshot of the delivery counters, with the metrics ones when enabled
+        """
+
+        stats = {"writes_sent": self.writes_sent,
+                 "writes_saved": self.writes_saved,
+                 "pending": len(self.pending),
+                 "queue_depth": 0 if self.sender is None else self.sender.depth,
+                 "dropped": 0 if self.sender is None else self.sender.dropped,
+                 "spooled": 0 if self.spool is None else len(self.spool)}
+
+        if self.adaptive:
+            stats["rtt_ms"] = None if self.rtt is None else self.rtt * 1000
+            stats["interval_ms"] = self.interval() * 1000
+
+        if self.metrics is not None:
+            stats.update(self.metrics.snapshot())
+
+        return stats
+
+    def connected(self) -> bool:
+        """
+        :return: True when the connection is ready, transports without state are always ready
+        """
+
+        if not self._ready.is_set():
+            return False
+
+        connected = getattr(self.blynk, "connected", None)
+
+        return connected is None or bool(connected())
+
+    def interval(self) -> float:
+        """
+        Current coalescing interval
+        :return: seconds, None when the posts are not coalesced
+        """
+
+        interval = self.flush_interval
+        if not self.adaptive:
+            return interval
+
+        rtt = self.rtt
+        if rtt is not None:
+            interval = max(interval, self.RTT_FACTOR * rtt)
+
+        # Backpressure, the sender did not write the previous batches yet
+        if self.sender is not None:
+            interval *= 1 + self.sender.depth
+
+        return min(interval, self.MAX_INTERVAL)
+
+    def _post(self, status_dict: dict, force: bool, urgent: bool = False, source=None):
+        """
+        Post a dict of pin values, coalesced or dispatched right away
+        :param status_dict: dict of values with pair of id : value, None with a source
+        :param force: send every pin even if delta mode would skip it
+        :param urgent: (optional) in adaptive mode, send the pending values now
+        :param source: (optional) callable building the posted values when they are sent
+        :return: None
+        """
+
+        with self._lock:
+            buffering = self._connector is not None and not self._ready.is_set()
+
+            if self.flush_interval is None and not buffering:
+                self._dispatch(status_dict if source is None else source(), force)
+                return
+
+            if source is not None:
+                self._sources[source] = None
+            else:
+                # The values of the sources posted before are older
+                self._build_sources()
+                self.pending.update(status_dict)
+                self._pending_force |= force
+
+            if buffering:
+                # Sent by the connection thread once it is ready
+                return
+
+            # Only the adaptive mode sends the urgent posts out of the fixed interval
+            if (urgent and self.adaptive) or self._last_flush is None \
+                    or time.monotonic() - self._last_flush >= self.interval():
+                self._flush_pending()
+            else:
+                # Without a next post, the values are sent at the end of the interval
+                self._arm_timer()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Send the coalesced pending values now
+        :param timeout: (optional) in background mode, maximum time in seconds to wait for
+                        the sender queue to be written, None to wait forever
+        :return: True if everything has been written
+        """
+
+        if self._connector is not None and not self._ready.wait(timeout):
+            # Still connecting, the pending values are kept
+            return False
+
+        with self._lock:
+            self._flush_pending()
+
+        if self.sender is not None:
+            return self.sender.flush(timeout)
+
+        return True
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Send the pending values and stop the background sender
+        :param timeout: (optional) maximum time in seconds to wait for the writes
+        :return: True if everything has been written
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        drained = self.flush(timeout)
+
+        with self._lock:
+            self._cancel_timer()
+
+        if self.sender is not None:
+            # The flush and the sender share the deadline
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            drained = self.sender.close(remaining) and drained
+
+        if self.spool is not None:
+            # What could not be sent stays on disk for the next run
+            drained = drained and not self.spool
+            self.spool.close()
+
+        # blynklib.Blynk can not be closed
+        close = getattr(self.blynk, "close", None)
+        if close is not None:
+            close()
+
+        return drained
+
+    def reset_shadow(self, pins=None):
+        """
+        Forget the last sent values, the next post will send every pin
+        :param pins: (optional) only forget these pins, all of them by default
+        :return: None
+        """
+
+        if pins is None:
+            self.last_sent.clear()
+            return
+
+        for pin in pins:
+            self.last_sent.pop(pin, None)
+
+    def _flush_pending(self):
+        """
+        Hand the coalesced pending values over, called with the lock held
+        :return: None
+        """
+
+        self._last_flush = time.monotonic()
+        self._cancel_timer()
+        self._build_sources()
+
+        if self.pending:
+            batch, self.pending = self.pending, {}
+            force, self._pending_force = self._pending_force, False
+            self._dispatch(batch, force)
+        elif self.spool:
+            # Nothing new, but the spooled values may be replayed
+            self._dispatch({}, False)
+
+    def _build_sources(self):
+        """
+        Add the values of the posted sources to the pending ones, called with the lock held
+        :return: None
+        """
+
+        if not self._sources:
+            return
+
+        sources, self._sources = self._sources, {}
+        for source in sources:
+            self.pending.update(source())
+
+    def _arm_timer(self):
+        """
+        Start the timer of the trailing flush if it is not running, called with the lock held
+        :return: None
+        """
+
+        if self._timer is not None:
+            return
+
+        delay = max(self.interval() - (time.monotonic() - self._last_flush), 0)
+        self._timer = threading.Timer(delay, self._trailing_flush)
+        self._timer.name = "app-status-flush"
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        """
+        Stop the timer of the trailing flush, called with the lock held
+        :return: None
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _trailing_flush(self):
+        """
+        Send the values still pending at the end of the interval, from the timer thread
+        :return: None
+        """
+
+        with self._lock:
+            self._timer = None
+
+            try:
+                self._flush_pending()
+            except Exception:  # pylint: disable=broad-except
+                # The next post or flush sends them again
+                LOGGER.warning("Status trailing flush failed", exc_info=True)
+
+    def _dispatch(self, status_dict: dict, force: bool):
+        """
+        Hand a dict of values over to the background sender, or write it right away
+        :param status_dict: dict of values with pair of id : value
+        :param force: send every pin even if delta mode would skip it
+        :return: None
+        """
+
+        if self.sender is not None:
+            self.sender.put(status_dict, force)
+        else:
+            self._write(status_dict, force)
+
+    def _write(self, status_dict: dict, force: bool):
+        """
+        Write a dict of values to the blynk connection, through the spool when there is one
+        :param status_dict: dict of values with pair of id : value
+        :param force: send every pin even if delta mode would skip it
+        :return: None
+        """
+
+        if not self._ready.is_set():
+            # Lazy connection, on the first write
+            self._open()
+            self._ready.set()
+
+        spool = self.spool
+        if spool is None:
+            if not self._send(status_dict, force) and self.metrics is not None:
+                self.metrics.count("errors")
+            return
+
+        if not self.connected():
+            if status_dict:
+                spool.append(status_dict)
+            if not self._reconnect():
+                return
+
+        if spool:
+            # Bulk replay with the latest value of each pin
+            replayed = spool.pending()
+            replayed.update(status_dict)
+            status_dict = replayed
+
+        if not status_dict:
+            return
+
+        try:
+            if not self._send(status_dict, force):
+                raise ConnectionError("The batch was not written")
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Status write failed, %s pins spooled", len(status_dict), exc_info=True)
+            spool.append(status_dict)
+            if self.metrics is not None:
+                self.metrics.count("errors")
+            return
+
+        if spool:
+            spool.clear()
+
+    def _open(self):
+        """
+        Establish the connection
+        :return: None
+        """
+
+        start = time.perf_counter()
+
+        try:
+            # blynklib connects in run()
+            self.blynk.run()
+        except Exception:  # pylint: disable=broad-except
+            # The next syncs or the spool reconnection retry it
+            LOGGER.warning("Status connection failed", exc_info=True)
+
+        LOGGER.debug("Status connection opened in %.3fs", time.perf_counter() - start)
+
+    def _open_background(self):
+        """
+        Establish the connection from the connection thread, then send the buffered posts
+        :return: None
+        """
+
+        self._open()
+
+        with self._lock:
+            # Set under the lock, no post can be dispatched before the buffered ones
+            self._ready.set()
+            if self.pending or self._sources:
+                self._flush_pending()
+
+    def _reconnect(self) -> bool:
+        """
+        Try to reconnect, at most every RECONNECT_INTERVAL
+        :return: True if the connection is back
+        """
+
+        now = time.monotonic()
+        if self._last_reconnect is not None and now - self._last_reconnect < self.RECONNECT_INTERVAL:
+            return False
+
+        self._last_reconnect = now
+
+        try:
+            # blynklib connects in run() when disconnected
+            self.blynk.run()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.warning("Status reconnection failed", exc_info=True)
+            return False
+
+        if not self.connected():
+            return False
+
+        LOGGER.info("Status connection is back")
+        if self.metrics is not None:
+            self.metrics.count("reconnects")
+
+        return True
+
+    def _send(self, status_dict: dict, force: bool) -> bool:
+        """
+        Send a dict of values to the blynk connection, skipping the unchanged pins in delta mode
+        :param status_dict: dict of values with pair of id : value
+        :param force: send every pin even if delta mode would skip it
+        :return: False if the transport could not write the batch or lost it in the sync
+        """
+
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+            size = 0
+
+        if self.adaptive:
+            round_trip = time.perf_counter()
+
+        last_sent = self.last_sent
+        skip_unchanged = self.delta and not force
+        written = 0
+        sent = True
+
+        # Transports encoding a whole batch in one socket write
+        write_batch = getattr(self.blynk, "write_batch", None)
+        batch = None if write_batch is None else {}
+
+        for key, value in status_dict.items():
+            if skip_unchanged and unchanged(last_sent, key, value):
+                self.writes_saved += 1
+                continue
+
+            if batch is None:
+                if self.blynk.virtual_write(key, value) is None and self._silent_writes:
+                    # The socket write failed, the shadow keeps the previous values of the batch
+                    sent = False
+                    break
+                last_sent[key] = value
+            else:
+                batch[key] = value
+            written += 1
+
+            if metrics is not None:
+                # Message header, "vw", pin and value with their separators
+                size += 9 + len(str(key)) + len(str(value).encode("utf-8"))
+
+        if batch:
+            sent = write_batch(batch) is not False
+            if sent:
+                last_sent.update(batch)
+            else:
+                # The shadow keeps the previous values, the pins are sent again by the next posts
+                written = size = 0
+
+        self.writes_sent += written
+
+        if metrics is not None:
+            metrics.time("write", time.perf_counter() - start)
+            metrics.count("writes", written)
+            metrics.count("bytes", size)
+
+        # Sync the request, nothing to sync when every pin was skipped, a failed batch reconnects
+        if written or not sent or not skip_unchanged:
+            if metrics is None:
+                self.blynk.run()
+            else:
+                self._timed_sync(metrics)
+
+            # blynklib may only notice a dropped connection in the sync, the writes were then lost
+            if sent and written and not self.connected():
+                sent = False
+                for key in status_dict:
+                    last_sent.pop(key, None)
+
+            if self.adaptive and sent:
+                round_trip = time.perf_counter() - round_trip
+                self.rtt = round_trip if self.rtt is None else self.rtt + self.RTT_WEIGHT * (round_trip - self.rtt)
+
+        return sent
+
+    def _timed_sync(self, metrics):
+        """
+        Sync the connection, measuring it and detecting the reconnections
+        :param metrics: the link metrics
+        :return: None
+        """
+
+        was_connected = self.connected()
+
+        start = time.perf_counter()
+        self.blynk.run()
+        metrics.time("sync", time.perf_counter() - start)
+        metrics.count("flushes")
+
+        if not was_connected and self.connected():
+            metrics.count("reconnects")
+
+
+class FanOutLink:
+    """
+    Class to
+        - deliver the same posts to several links, one per auth key
+        - isolate them, each link has its own sender thread and queue
+        - bound the waits on all of them with a common deadline
+    """
+
+    # Delivery counters summed over the links
+    COUNTERS = ("writes_sent", "writes_saved", "pending", "queue_depth", "dropped", "spooled")
+
+    def __init__(self, links: list):
+        """
+        Class init
+        :param links: the target links, in background mode so that a post never waits for them
+        """
+
+        if not links:
+            raise ValueError("At least one target link is needed")
+
+        self.links = links
+        self.metrics = links[0].metrics
+
+    @property
+    def blynk(self) -> tuple:
+        """
+        The connections of the targets
+        """
+
+        return tuple(link.blynk for link in self.links)
+
+    @property
+    def sender(self) -> tuple:
+        """
+        The background senders of the targets
+        """
+
+        return tuple(link.sender for link in self.links)
+
+    @property
+    def writes_sent(self) -> int:
+        return sum(link.writes_sent for link in self.links)
+
+    @property
+    def writes_saved(self) -> int:
+        return sum(link.writes_saved for link in self.links)
+
+    def post(self, status_dict: dict, force: bool = False, urgent: bool = False):
+        """
+        Post a dict of pin values to every target
+        :param status_dict: dict of values with pair of id : value
+        :param force: (optional) send every pin even if delta mode would skip it
+        :param urgent: (optional) send it without waiting for the coalescing interval
+        :return: None
+        """
+
+        for link in self.links:
+            try:
+                link.post(status_dict, force, urgent)
+            except Exception:  # pylint: disable=broad-except
+                # A broken target must not deprive the others
+                LOGGER.warning("Status post to a fan-out target failed", exc_info=True)
+                if self.metrics is not None:
+                    self.metrics.count("errors")
+
+    def post_source(self, source, urgent: bool = False):
+        """
+        Post the pin values of a source to every target, built once for all of them
+        :param source: callable without argument returning a dict of pin values
+        :param urgent: (optional) send them without waiting for the coalescing interval
+        :return: None
+        """
+
+        # The targets send at their own pace, a source deferred to each of them would be
+        # built once per target
+        self.post(source(), urgent=urgent)
+
+    def stats(self) -> dict:
+        """
+        :return: the delivery counters summed over the targets, with the metrics when enabled,
+                 and the counters of each target in "targets"
+        """
+
+        targets = [link.stats() for link in self.links]
+
+        stats = {key: sum(target[key] for target in targets) for key in self.COUNTERS}
+        if self.metrics is not None:
+            stats.update(self.metrics.snapshot())
+        stats["targets"] = targets
+
+        return stats
+
+    def connected(self) -> bool:
+        """
+        :return: True when every target is connected
+        """
+
+        return all(link.connected() for link in self.links)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Send the coalesced pending values of every target
+        :param timeout: (optional) maximum time in seconds to wait for all the targets,
+                        None to wait forever
+        :return: True if every target has written everything
+        """
+
+        return self._each("flush", timeout)
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Send the pending values and close every target
+        :param timeout: (optional) maximum time in seconds to wait for all the targets
+        :return: True if every target has written everything
+        """
+
+        return self._each("close", timeout)
+
+    def reset_shadow(self, pins=None):
+        """
+        Forget the last sent values of every target
+        :param pins: (optional) only forget these pins, all of them by default
+        :return: None
+        """
+
+        for link in self.links:
+            link.reset_shadow(pins)
+
+    def _each(self, method: str, timeout: float) -> bool:
+        """
+        Flush or close the targets within a common deadline
+        :param method: "flush" or "close"
+        :param timeout: maximum time in seconds, None to wait forever
+        :return: True if every target has written everything
+        """
+
+        # Every sender gets its pending values before waiting for any of them
+        for link in self.links:
+            link.flush(0)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = True
+
+        for index, link in enumerate(self.links):
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not getattr(link, method)(remaining):
+                LOGGER.warning("Status fan-out target %s is late", index)
+                done = False
+
+        return done
+
+
+class ConnectionPool:
+    """
+    Class to
+        - share one link per blynk auth key
+        - close it when its last user releases it
+    """
+
+    def __init__(self):
+        """
+        Class init
+        """
+
+        # auth key: [link, users count, options]
+        self._links = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._links)
+
+    def acquire(self, blink_key, transport=None, metrics=None, **options) -> Link:
+        """
+        Get the link of an auth key, opening it on first use
+        :param blink_key: the blynk auth key to be use
+        :param transport: (optional) transport of the link when it is opened,
+                          a blynklib.Blynk connection on blink_key by default
+        :param metrics: (optional) metrics of the link when it is opened
+        :param options: Link options, they must be the same for every user of a key
+        :return: the shared link
+        """
+
+        with self._lock:
+            entry = self._links.get(blink_key)
+
+            if entry is None:
+                if transport is None:
+                    transport = open_blynk(blink_key)
+                entry = [Link(transport, metrics=metrics, **options), 0, options]
+                self._links[blink_key] = entry
+            elif entry[2] != options:
+                raise ValueError("The shared connection is already open with options {}".format(entry[2]))
+
+            entry[1] += 1
+
+            return entry[0]
+
+    def release(self, link: Link, timeout: float = None) -> bool:
+        """
+        Give a link back, it is closed when it has no more users
+        :param link: a link given by acquire
+        :param timeout: (optional) maximum time in seconds to wait for the writes on close
+        :return: True if the link has been closed
+        """
+
+        with self._lock:
+            for blink_key, entry in self._links.items():
+                if entry[0] is link:
+                    break
+            else:
+                raise ValueError("This link is not managed by the pool")
+
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+
+            del self._links[blink_key]
+
+        link.close(timeout)
+
+        return True
+
+
+# Default pool used by the shared app status
+POOL = ConnectionPool()
@@ -0,0 +1,85 @@
+"""
+Logging of the app status
+
+The library logs to the "app_status" logger, silent by default:
+    - run start and stop at INFO level
+    - run updates at DEBUG level, each record carries the run values as extra fields
+
+The messages are formatted only when a handler emits them, and the update path
+checks the level first so a disabled level costs nothing more.
+
+An EventLog handler keeps the last records in memory in place of printing them.
+
+"""
+
+import logging
+from collections import deque
+
+
+LOGGER = logging.getLogger("app_status")
+LOGGER.addHandler(logging.NullHandler())
+
+# Run values copied from the log records extra fields to the events
+FIELDS = ("app_id", "run_name", "date", "actual", "total", "succeed", "failed", "blocked")
+
+
+class EventLog(logging.Handler):
+    """
+    Class to
+        - keep the last log records in a ring buffer
+        - give them back as structured events
+    """
+
+    def __init__(self, capacity: int = 1000, level=logging.NOTSET):
+        """
+        Class init
+        :param capacity: (optional) number of kept records, the oldest are discarded
+        :param level: (optional) minimum level of the kept records
+        """
+
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        # Kept as is, the message is formatted on read
+        self.records.append(record)
+
+    def events(self) -> list:
+        """
+        :return: list of dict of the kept records: time, level, message and the run fields
+        """
+
+        events = []
+        for record in list(self.records):
+            event = {"time": record.created, "level": record.levelname, "message": record.getMessage()}
+            for field in FIELDS:
+                if hasattr(record, field):
+                    event[field] = getattr(record, field)
+            events.append(event)
+
+        return events
+
+    def clear(self):
+        """
+        Discard the kept records
+        :return: None
+        """
+
+        self.records.clear()
+
+
+def enable_event_log(capacity: int = 1000, level=logging.DEBUG) -> EventLog:
+    """
+    Keep the last app status log records in memory
+    :param capacity: (optional) number of kept records
+    :param level: (optional) minimum level of the kept records
+    :return: the EventLog handler, to be removed with LOGGER.removeHandler
+    """
+
+    handler = EventLog(capacity, level)
+    LOGGER.addHandler(handler)
+
+    if LOGGER.level == logging.NOTSET or LOGGER.level > level:
+        LOGGER.setLevel(level)
+
+    return handler
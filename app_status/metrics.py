@@ -0,0 +1,96 @@
+"""
+Instrumentation of the app status publishing path
+
+The metrics are optional: when an app status has none, the publishing path
+only pays a None check
+
+"""
+
+import threading
+
+
+class Metrics:
+    """
+    Class to
+        - time the phases of the publishing path
+        - count the writes, bytes, flushes, drops, reconnects and errors
+        - forward each measure to an optional hook
+    """
+
+    # Timed phases
+    #   format: build of the pin values by the run status
+    #   post: caller side of post_dict
+    #   write: virtual writes of a batch
+    #   sync: connection sync after a batch
+    PHASES = ("format", "post", "write", "sync")
+
+    COUNTERS = ("writes", "bytes", "flushes", "drops", "reconnects", "errors")
+
+    def __init__(self, hook=None):
+        """
+        Class init
+        :param hook: (optional) callable(name, value) called on each measure,
+                     value is a duration in seconds for the phases, an increment for the counters
+        """
+
+        self.hook = hook
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all the measures
+        :return: None
+        """
+
+        with self._lock:
+            self.counters = dict.fromkeys(self.COUNTERS, 0)
+            # phase: [count, total seconds, max seconds]
+            self.timers = {phase: [0, 0.0, 0.0] for phase in self.PHASES}
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increment a counter
+        :param name: one of COUNTERS
+        :param value: (optional) increment
+        :return: None
+        """
+
+        with self._lock:
+            self.counters[name] += value
+
+        if self.hook is not None:
+            self.hook(name, value)
+
+    def time(self, phase: str, seconds: float):
+        """
+        Record the duration of a phase
+        :param phase: one of PHASES
+        :param seconds: duration
+        :return: None
+        """
+
+        with self._lock:
+            timer = self.timers[phase]
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+        if self.hook is not None:
+            self.hook(phase, seconds)
+
+    def snapshot(self) -> dict:
+        """
+        :return: dict of the counters and of the phase timers count, total_s, mean_us and max_us
+        """
+
+        with self._lock:
+            timers = {}
+            for phase, (count, total, maximum) in self.timers.items():
+                timers[phase] = {"count": count,
+                                 "total_s": total,
+                                 "mean_us": total / count * 1e6 if count else 0.0,
+                                 "max_us": maximum * 1e6}
+
+            return {"counters": dict(self.counters), "timers": timers}
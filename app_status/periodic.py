@@ -0,0 +1,92 @@
+"""
+Periodic background publishing
+
+The samplers and the aggregators publish from a thread waking up at a fixed
+interval, and a last time when they are stopped, so the final values are
+never left unpublished.
+
+"""
+
+import threading
+
+from .log import LOGGER
+
+
+class Periodic:
+    """
+    Class to
+        - call a function periodically from a background thread
+        - call it a last time when stopped
+    """
+
+    def __init__(self, call, interval: float, name: str = "app-status-periodic"):
+        """
+        Class init
+        :param call: callable without argument, a failing call is logged and made again next time
+        :param interval: period in seconds of the background thread
+        :param name: (optional) name of the background thread
+        """
+
+        if interval <= 0:
+            raise ValueError("The interval must be positive")
+
+        self.interval = interval
+        self._call = call
+        self._name = name
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """
+        True while the background thread is started
+        """
+
+        return self._thread is not None
+
+    def start(self):
+        """
+        Call periodically from a background thread, nothing is done if it is already running
+        :return: self
+        """
+
+        if self._thread is not None:
+            return self
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stop the background thread and make the final call
+        :return: None
+        """
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        self._call()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _loop(self):
+        """
+        Background loop
+        :return: None
+        """
+
+        while not self._stop.wait(self.interval):
+            try:
+                self._call()
+            except Exception:  # pylint: disable=broad-except
+                # Logged and made again next time
+                LOGGER.warning("Periodic %s failed", self._name, exc_info=True)
@@ -0,0 +1,111 @@
+"""
+pytest plugin reporting the session to a RunStatus
+
+Enabled with the blynk auth key of the application:
+    pytest --app-status KEY [--app-status-id 1] [--app-status-name nightly] [--app-status-timeout 2]
+or with the APP_STATUS_KEY environment variable. It is registered through the
+pytest11 entry point of the package, or with -p app_status.pytest_plugin.
+
+Under pytest-xdist only the controller publishes: it counts the tests
+collected by the first worker and the reports forwarded by all of them.
+
+"""
+
+import os
+
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("app-status", "test run status on a blynk phone application")
+    group.addoption("--app-status", dest="app_status_key", default=os.environ.get("APP_STATUS_KEY"),
+                    help="blynk auth key of the status application, APP_STATUS_KEY by default")
+    group.addoption("--app-status-id", dest="app_status_id", type=int, default=0,
+                    help="id of the run on the application")
+    group.addoption("--app-status-name", dest="app_status_name", default=None,
+                    help="name of the test run")
+    group.addoption("--app-status-server", dest="app_status_server", default=None,
+                    help="host:port of the blynk server, the blynk cloud by default")
+    group.addoption("--app-status-interval", dest="app_status_interval", type=int, default=500,
+                    help="minimum time in ms between two status writes")
+    group.addoption("--app-status-timeout", dest="app_status_timeout", type=float, default=2.0,
+                    help="maximum time in seconds to deliver the final status at the end of the session")
+
+
+def pytest_configure(config):
+    key = config.getoption("app_status_key")
+
+    # xdist workers report to the controller
+    if not key or hasattr(config, "workerinput"):
+        return
+
+    from .testing import open_run_status  # pylint: disable=import-outside-toplevel
+
+    status = open_run_status(key, config.getoption("app_status_id"), config.getoption("app_status_server"),
+                             config.getoption("app_status_interval"))
+    config.pluginmanager.register(StatusReporter(status, config.getoption("app_status_name"),
+                                                 config.getoption("app_status_timeout")),
+                                  "app-status-reporter")
+
+
+class StatusReporter:
+    """
+    Class to
+        - start the run status with the collected tests
+        - count the outcome of each test
+    """
+
+    def __init__(self, status, name: str = None, timeout: float = 2.0):
+        """
+        Class init
+        :param status: the run status
+        :param name: (optional) name of the test run
+        :param timeout: (optional) maximum time in seconds to deliver the final status,
+                        None to wait forever
+        """
+
+        self.status = status
+        self.name = name
+        self.timeout = timeout
+        self.started = False
+
+    def start(self, total: int):
+        """
+        Start the run status once
+        :param total: number of collected tests
+        :return: None
+        """
+
+        if self.started or not total:
+            return
+
+        self.started = True
+        self.status.start(total, self.name)
+
+    def pytest_collection_finish(self, session):
+        self.start(len(session.items))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        # Every worker collects the same tests
+        self.start(len(ids))
+
+    def pytest_runtest_logreport(self, report):
+        if not self.started:
+            return
+
+        if report.when == "call":
+            if report.passed:
+                self.status.add_succeed()
+            elif report.failed:
+                self.status.add_failed()
+            else:
+                self.status.add_blocked()
+        elif report.when == "setup" and not report.passed:
+            # Skipped, or setup error: the test has no call phase
+            self.status.add_blocked()
+
+    def pytest_sessionfinish(self, session):
+        from .testing import close_run_status  # pylint: disable=import-outside-toplevel
+
+        close_run_status(self.status, self.timeout)
@@ -0,0 +1,155 @@
+"""
+Live throughput of a test run
+
+The rate is an exponentially weighted moving average of the tests per second,
+updated in O(1) at each count with the time elapsed since the previous one,
+so irregular updates weight the rate by their duration. It is read decayed
+with the time since the last count, a stalled run shows a falling rate.
+
+"""
+
+import time
+
+
+class RateEstimator:
+    """
+    Class to
+        - estimate the current rate of a counter and the remaining time
+        - detect a rate drop against the average of the run
+    """
+
+    __slots__ = ("half_life", "rate", "_count", "_time", "_start_count", "_start_time")
+
+    # Current rate below this ratio of the average rate is a drop
+    DROP_RATIO = 0.5
+
+    def __init__(self, half_life: float = 30.0):
+        """
+        Class init
+        :param half_life: (optional) time in seconds after which a rate change is weighted at half
+        """
+
+        if half_life <= 0:
+            raise ValueError("The half life must be positive")
+
+        self.half_life = half_life
+        self.reset()
+
+    def reset(self, count: int = 0, now: float = None):
+        """
+        Start a new estimation
+        :param count: (optional) counter value at the start
+        :param now: (optional) monotonic time, the current one by default
+        :return: None
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        self.rate = None
+        self._count = self._start_count = count
+        self._time = self._start_time = now
+
+    def update(self, count: int, now: float = None) -> float:
+        """
+        Take a new counter value into account
+        :param count: counter value
+        :param now: (optional) monotonic time, the current one by default
+        :return: the current rate, per second
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        elapsed = now - self._time
+        if elapsed <= 0:
+            # Same tick, or an update of a concurrent thread, counted with the next one
+            return self.rate or 0.0
+
+        instant = (count - self._count) / elapsed
+        if self.rate is None:
+            self.rate = instant
+        else:
+            weight = 1 - 2 ** (-elapsed / self.half_life)
+            self.rate += weight * (instant - self.rate)
+
+        self._count = count
+        self._time = now
+
+        return self.rate
+
+    def rate_at(self, now: float = None) -> float:
+        """
+        Current rate, decayed as if nothing was counted since the last count
+        :param now: (optional) monotonic time, the current one by default
+        :return: the rate per second, None when it is unknown
+        """
+
+        if self.rate is None:
+            return None
+
+        if now is None:
+            now = time.monotonic()
+
+        idle = now - self._time
+        if idle <= 0:
+            return self.rate
+
+        return self.rate * 2 ** (-idle / self.half_life)
+
+    def average(self, now: float = None) -> float:
+        """
+        :param now: (optional) monotonic time, the last count by default
+        :return: average rate since the start, per second
+        """
+
+        elapsed = (self._time if now is None else now) - self._start_time
+        if elapsed <= 0:
+            return 0.0
+
+        return (self._count - self._start_count) / elapsed
+
+    def eta(self, remaining: int, now: float = None) -> float:
+        """
+        Estimated time to count the remaining values at the current rate
+        :param remaining: values left to count
+        :param now: (optional) monotonic time, the current one by default
+        :return: seconds, None when the rate is unknown
+        """
+
+        rate = self.rate_at(now)
+        if not rate or rate < 0:
+            return None
+
+        return max(remaining, 0) / rate
+
+    def dropped(self, now: float = None) -> bool:
+        """
+        :param now: (optional) monotonic time, the current one by default
+        :return: True when the current rate fell below DROP_RATIO of the average
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        if self.rate is None or now - self._start_time < self.half_life:
+            # Not enough history for an average
+            return False
+
+        return self.rate_at(now) < self.DROP_RATIO * self.average(now)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration for the phone
+    :param seconds: duration, None if unknown
+    :return: "H:MM:SS" string
+    """
+
+    if seconds is None:
+        return "--:--:--"
+
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
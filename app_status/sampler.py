@@ -0,0 +1,125 @@
+"""
+Pull-based sampling of application values
+
+Instead of calling the app status at each change, the application registers
+where the values can be read, and a sampler thread polls them at a fixed
+interval. Only the values changed since the previous poll are published, in
+one batch, so the publishing rate does not depend on the event rate and the
+hot loops only update their own variables:
+
+    sampler = status.sampler(interval=1.0)
+    sampler.register(1, queue.qsize)
+    sampler.register_attribute(2, worker, "done", fmt="{} jobs")
+    with sampler:
+        run()
+
+"""
+
+import functools
+import threading
+
+from .link import VPIN_MAX, unchanged
+from .log import LOGGER
+from .periodic import Periodic
+
+
+class Sampler(Periodic):
+    """
+    Sub class of the periodic publishing to
+        - poll the registered getters of pin values
+        - publish the changed values periodically from a background thread
+    """
+
+    def __init__(self, status, interval: float = 1.0):
+        """
+        Class init
+        :param status: app status the values are posted to
+        :param interval: (optional) polling period in seconds of the background thread
+        """
+
+        super().__init__(self.sample, interval, "app-status-sampler")
+
+        self.status = status
+
+        # pin: (getter, fmt)
+        self._sources = {}
+        self._published = {}
+        self._lock = threading.Lock()
+
+    def register(self, pin: int, getter, fmt=None):
+        """
+        Poll a callable for the value of a pin
+        :param pin: virtual pin of the value
+        :param getter: callable without argument returning the value, None to skip the pin
+        :param fmt: (optional) format string or callable applied to the value
+        :return: None
+        """
+
+        if not 0 <= pin <= VPIN_MAX:
+            raise ValueError("The pin must be between 0 and {}".format(VPIN_MAX))
+
+        with self._lock:
+            if pin in self._sources:
+                raise ValueError("The pin {} is already sampled".format(pin))
+
+            self._sources[pin] = (getter, fmt)
+
+    def register_attribute(self, pin: int, obj, name: str, fmt=None):
+        """
+        Poll an attribute for the value of a pin
+        :param pin: virtual pin of the value
+        :param obj: object holding the attribute
+        :param name: name of the attribute
+        :param fmt: (optional) format string or callable applied to the value
+        :return: None
+        """
+
+        self.register(pin, functools.partial(getattr, obj, name), fmt)
+
+    def unregister(self, pin: int):
+        """
+        Stop polling a pin
+        :param pin: virtual pin of the value
+        :return: None
+        """
+
+        with self._lock:
+            del self._sources[pin]
+            self._published.pop(pin, None)
+
+    def sample(self, force: bool = False) -> int:
+        """
+        Poll every getter and post the changed values in one batch
+        :param force: (optional) post every value, changed or not
+        :return: number of posted pins
+        """
+
+        with self._lock:
+            published = self._published
+            status_dict = {}
+
+            for pin, (getter, fmt) in self._sources.items():
+                try:
+                    value = getter()
+                    if value is None:
+                        continue
+                    if fmt is not None:
+                        value = fmt(value) if callable(fmt) else fmt.format(value)
+                except Exception:  # pylint: disable=broad-except
+                    # One failing getter must not stop the others
+                    LOGGER.warning("Sampling of the pin %s failed", pin, exc_info=True)
+                    continue
+
+                if not force and unchanged(published, pin, value):
+                    continue
+
+                status_dict[pin] = value
+
+        if status_dict:
+            self.status.post_dict(status_dict, force)
+
+            # Only once posted, a failed post is sent again by the next poll
+            with self._lock:
+                published.update(status_dict)
+
+        return len(status_dict)
@@ -0,0 +1,184 @@
+"""
+Background sender of the app status
+
+It moves the blynk writes on a dedicated thread, fed by a bounded queue,
+so a slow or stalled server never blocks the monitored application
+
+"""
+
+import threading
+from collections import deque
+
+
+# Backpressure policies, what to do when the queue is full
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+
+POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+
+class Sender:
+    """
+    Class to
+        - queue the batches of pin values to be written
+        - drain the queue from a dedicated thread
+    """
+
+    def __init__(self, write, maxsize: int = 64, policy: str = BLOCK, metrics=None):
+        """
+        Class init
+        :param write: callable(batch, force) doing the actual write of a dict of pin values
+        :param maxsize: (optional) maximum number of batches waiting in the queue
+        :param policy: (optional) backpressure policy when the queue is full
+                       BLOCK waits for a free slot
+                       DROP_OLDEST discards the oldest waiting batch
+                       COALESCE merges all the waiting batches, keeping the latest value per pin
+        :param metrics: (optional) Metrics counting the drops and the errors
+        """
+
+        if policy not in POLICIES:
+            raise ValueError("Unknown policy {}, use one of {}".format(policy, POLICIES))
+
+        if maxsize < 1:
+            raise ValueError("The queue size must be at least 1")
+
+        self.write = write
+        self.maxsize = maxsize
+        self.policy = policy
+        self.metrics = metrics
+
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+
+        self._queue = deque()
+        self._pending = {}
+        self._pending_force = False
+        # A coalesced write is waiting, even an empty one replaying the spool
+        self._requested = False
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._thread = threading.Thread(target=self._loop, name="app-status-sender", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of batches waiting to be written
+        """
+
+        if self.policy == COALESCE:
+            return 1 if self._requested else 0
+
+        return len(self._queue)
+
+    def put(self, batch: dict, force: bool = False):
+        """
+        Queue a batch of pin values, following the backpressure policy when the queue is full
+        :param batch: dict of values with pair of id : value
+        :param force: (optional) send every pin even if delta mode would skip it
+        :return: None
+        """
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The sender is closed")
+
+            if self.policy == COALESCE:
+                self._pending.update(batch)
+                self._pending_force |= force
+                self._requested = True
+
+            elif self.policy == DROP_OLDEST:
+                if len(self._queue) >= self.maxsize:
+                    self._queue.popleft()
+                    self.dropped += 1
+                    if self.metrics is not None:
+                        self.metrics.count("drops")
+                self._queue.append((batch, force))
+
+            else:
+                while len(self._queue) >= self.maxsize and not self._closed:
+                    self._cond.wait()
+                self._queue.append((batch, force))
+
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued batch has been written
+        :param timeout: (optional) maximum waiting time in seconds, None to wait forever
+        :return: True if the queue was drained, False on timeout
+        """
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._busy and self.depth == 0, timeout)
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Write the queued batches and stop the sender thread
+        :param timeout: (optional) maximum waiting time in seconds, None to wait forever
+        :return: True if everything was written before closing
+        """
+
+        drained = self.flush(timeout)
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        self._thread.join(timeout)
+
+        return drained
+
+    def _next(self):
+        """
+        Wait and take the next batch to write, called with the condition held
+        :return: (batch, force) or None when the sender is closed
+        """
+
+        while True:
+            if self.policy == COALESCE:
+                if self._requested:
+                    self._requested = False
+                    batch, self._pending = self._pending, {}
+                    force, self._pending_force = self._pending_force, False
+                    return batch, force
+            elif self._queue:
+                return self._queue.popleft()
+
+            if self._closed:
+                return None
+
+            self._cond.wait()
+
+    def _loop(self):
+        """
+        Sender thread main loop
+        :return: None
+        """
+
+        while True:
+            with self._cond:
+                item = self._next()
+                if item is None:
+                    return
+                self._busy = True
+                # A slot is free for a blocked producer
+                self._cond.notify_all()
+
+            try:
+                self.write(*item)
+            except Exception as error:  # pylint: disable=broad-except
+                # The sender must survive a broken connection
+                self.errors += 1
+                self.last_error = error
+                if self.metrics is not None:
+                    self.metrics.count("errors")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,279 @@
+"""
+Local stand-in of a blynk server
+
+It speaks enough of the blynk protocol for the app status to connect and write
+to it, over TCP or UDP, and records the received pin values. It allows to
+test, benchmark and load-test the reporting offline.
+
+Run it alone with: python -m app_status.server --port 8080
+
+"""
+
+import argparse
+import socketserver
+import struct
+import threading
+import time
+
+import blynklib
+
+
+HEADER = struct.Struct("!BHH")
+
+
+class _Session:
+    """
+    State of a client connection
+    """
+
+    def __init__(self):
+        self.token = None
+
+
+class _TcpHandler(socketserver.BaseRequestHandler):
+    """
+    Blynk protocol over TCP
+    """
+
+    def handle(self):
+        owner = self.server.owner
+        session = _Session()
+        buffer = bytearray()
+
+        with owner.lock:
+            owner.connections += 1
+
+        while True:
+            try:
+                data = self.request.recv(65536)
+            except OSError:
+                break
+            if not data:
+                break
+
+            buffer += data
+            offset = owner.feed(session, buffer, self.request.sendall)
+            del buffer[:offset]
+
+            if session.token is False:
+                # Refused login
+                break
+
+
+class _UdpHandler(socketserver.BaseRequestHandler):
+    """
+    Blynk protocol messages in UDP datagrams, each one starting with a login message
+    """
+
+    def handle(self):
+        data, _ = self.request
+        self.server.owner.feed(_Session(), data, None)
+
+
+class _TcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UdpServer(socketserver.UDPServer):
+    allow_reuse_address = True
+
+
+class LocalServer:
+    """
+    Class to
+        - accept blynk connections on a local port
+        - record the pin values and the traffic
+    """
+
+    # Shutdown polling period in seconds
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, udp: bool = False,
+                 tokens=None, latency: float = 0.0):
+        """
+        Class init
+        :param host: (optional) listening address
+        :param port: (optional) listening port, 0 to pick a free one
+        :param udp: (optional) listen for UDP datagrams in place of TCP connections
+        :param tokens: (optional) accepted auth keys, any key is accepted by default
+        :param latency: (optional) processing delay in seconds per message, to simulate a slow server
+        """
+
+        self.tokens = None if tokens is None else set(tokens)
+        self.latency = latency
+
+        # auth key: {pin: value}
+        self.devices = {}
+
+        self.connections = 0
+        self.messages = 0
+        self.writes = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+
+        server_class, handler = (_UdpServer, _UdpHandler) if udp else (_TcpServer, _TcpHandler)
+        self._server = server_class((host, port), handler)
+        self._server.owner = self
+        self._thread = None
+
+    @property
+    def address(self):
+        """
+        (host, port) the server is listening on
+        """
+
+        return self._server.server_address
+
+    def start(self):
+        """
+        Start serving from a background thread
+        :return: the server
+        """
+
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(self.POLL_INTERVAL,),
+                                        name="app-status-server", daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket
+        :return: None
+        """
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def values(self, token) -> dict:
+        """
+        Get the last values written by a device
+        :param token: auth key of the device
+        :return: dict of pin: value, values as received strings
+        """
+
+        with self.lock:
+            return dict(self.devices.get(token, {}))
+
+    def stats(self) -> dict:
+        """
+        :return: snapshot of the traffic counters
+        """
+
+        with self.lock:
+            return {"connections": self.connections,
+                    "messages": self.messages,
+                    "writes": self.writes,
+                    "bytes_received": self.bytes_received}
+
+    def feed(self, session: _Session, data, reply) -> int:
+        """
+        Process the complete messages of a received buffer
+        :param session: state of the client
+        :param data: received bytes
+        :param reply: callable sending bytes back to the client, None when no answer is possible
+        :return: number of bytes consumed
+        """
+
+        offset = 0
+        size = len(data)
+
+        while size - offset >= HEADER.size:
+            msg_type, msg_id, length = HEADER.unpack_from(data, offset)
+
+            # Responses carry a status in place of a length
+            if msg_type == blynklib.Protocol.MSG_RSP:
+                length = 0
+
+            end = offset + HEADER.size + length
+            if end > size:
+                break
+
+            answer = self._process(session, msg_type, msg_id, bytes(data[offset + HEADER.size:end]))
+            offset = end
+
+            if self.latency:
+                time.sleep(self.latency)
+            if answer is not None and reply is not None:
+                reply(HEADER.pack(blynklib.Protocol.MSG_RSP, msg_id, answer))
+            if session.token is False:
+                break
+
+        with self.lock:
+            self.bytes_received += offset
+
+        return offset
+
+    def _process(self, session: _Session, msg_type: int, msg_id: int, body: bytes):
+        """
+        Process one message
+        :return: the response status, None when there is no response
+        """
+
+        protocol = blynklib.Protocol
+
+        with self.lock:
+            self.messages += 1
+
+            if msg_type == protocol.MSG_LOGIN:
+                token = body.decode("utf-8")
+                if self.tokens is not None and token not in self.tokens:
+                    session.token = False
+                    return protocol.STATUS_INVALID_TOKEN
+                session.token = token
+                self.devices.setdefault(token, {})
+                return protocol.STATUS_OK
+
+            if msg_type in (protocol.MSG_PING, protocol.MSG_INTERNAL):
+                return protocol.STATUS_OK
+
+            if msg_type == protocol.MSG_HW and session.token:
+                args = body.split(b"\0")
+                if len(args) >= 3 and args[0] == b"vw":
+                    value = "\0".join(arg.decode("utf-8") for arg in args[2:])
+                    self.devices[session.token][int(args[1])] = value
+                    self.writes += 1
+
+        return None
+
+
+def main():
+    """
+    Run a local stand-in server until interrupted
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Local stand-in of a blynk server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--udp", action="store_true", help="listen for UDP datagrams")
+    parser.add_argument("--latency", type=float, default=0.0, help="processing delay per message in seconds")
+    args = parser.parse_args()
+
+    server = LocalServer(args.host, args.port, args.udp, latency=args.latency)
+    print("Listening on {}:{}".format(*server.address))
+
+    try:
+        server.start()
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(server.stats())
+
+
+if __name__ == "__main__":
+    main()
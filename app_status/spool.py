@@ -0,0 +1,128 @@
+"""
+Offline spool of the app status
+
+When the connection is down, the pin writes are appended to a sequential log
+on disk instead of being lost. Once the connection is back, the log is
+compacted to the latest value of each pin and replayed in one batch.
+
+The log survives the process: a spool opened on an existing file replays it
+at the first successful write.
+
+"""
+
+import json
+import os
+
+
+class Spool:
+    """
+    Class to
+        - append the pending pin writes to a log file
+        - give back the latest value of each pin
+    """
+
+    # Log lines before the file is compacted in place
+    COMPACT_LINES = 10000
+
+    def __init__(self, path, sync: bool = False):
+        """
+        Class init
+        :param path: path of the log file, created if needed
+        :param sync: (optional) fsync each append, for a log surviving a power loss
+        """
+
+        self.path = path
+        self.sync = sync
+
+        self._latest = self._read()
+        self._lines = len(self._latest)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        """
+        :return: number of pins waiting to be replayed
+        """
+
+        return len(self._latest)
+
+    def append(self, status_dict: dict):
+        """
+        Log pin values
+        :param status_dict: dict of values with pair of id : value
+        :return: None
+        """
+
+        self._file.write("".join(json.dumps([pin, value]) + "\n" for pin, value in status_dict.items()))
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+        self._latest.update(status_dict)
+        self._lines += len(status_dict)
+
+        if self._lines > self.COMPACT_LINES:
+            self.compact()
+
+    def pending(self) -> dict:
+        """
+        :return: dict of the latest logged value of each pin
+        """
+
+        return dict(self._latest)
+
+    def compact(self):
+        """
+        Rewrite the log with only the latest value of each pin
+        :return: None
+        """
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write("".join(json.dumps([pin, value]) + "\n" for pin, value in self._latest.items()))
+            file.flush()
+            os.fsync(file.fileno())
+
+        self._file.close()
+        os.replace(temporary, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lines = len(self._latest)
+
+    def clear(self):
+        """
+        Empty the log, once replayed
+        :return: None
+        """
+
+        self._file.truncate(0)
+        self._latest.clear()
+        self._lines = 0
+
+    def close(self):
+        """
+        Close the log file, its content is kept for a later replay
+        :return: None
+        """
+
+        self._file.close()
+
+    def _read(self) -> dict:
+        """
+        Read an existing log
+        :return: dict of the latest value of each pin
+        """
+
+        latest = {}
+
+        if not os.path.exists(self.path):
+            return latest
+
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    pin, value = json.loads(line)
+                except ValueError:
+                    # Line cut by a crash
+                    continue
+                latest[pin] = value
+
+        return latest
@@ -0,0 +1,162 @@
+"""
+Test runners reporting to a RunStatus
+
+The test outcomes are routed to the run counters:
+    - passed to succeed
+    - failed, and unexpected successes, to failed
+    - skipped, expected failures and errors to blocked
+
+The default publisher never blocks the tests: it connects in the background,
+coalesces the updates and writes them from a sender thread.
+
+    runner = StatusTestRunner(open_run_status(key), name="nightly")
+    runner.run(suite)
+
+The pytest plugin is in app_status.pytest_plugin.
+
+"""
+
+import time
+import unittest
+
+from .core import RunStatus
+from .link import BACKGROUND
+from .log import LOGGER
+from .sender import COALESCE
+
+
+# Maximum time in seconds to deliver the final status at the end of a session
+STOP_TIMEOUT = 2.0
+
+
+def open_run_status(blink_key, app_id: int = 0, server: str = None, interval_ms: int = 500) -> RunStatus:
+    """
+    Create a non-blocking RunStatus for a test session
+    :param blink_key: the blynk auth key to be use
+    :param app_id: (optional) id of the run on the application
+    :param server: (optional) "host:port" of the blynk server, the blynk cloud by default
+    :param interval_ms: (optional) minimum time between two writes
+    :return: the run status
+    """
+
+    transport = None
+    if server:
+        from .transport import BlynkTransport  # pylint: disable=import-outside-toplevel
+        host, port = server.rsplit(":", 1)
+        transport = BlynkTransport(blink_key, server=host, port=int(port))
+
+    return RunStatus(blink_key, app_id, transport=transport, delta=True, flush_interval_ms=interval_ms,
+                     background=True, policy=COALESCE, connect=BACKGROUND)
+
+
+def close_run_status(status: RunStatus, timeout: float = STOP_TIMEOUT) -> bool:
+    """
+    Stop the run and close the status within a common deadline, so that an unreachable
+    server does not hold the end of the session
+    :param status: the run status
+    :param timeout: (optional) maximum time in seconds to wait for the writes, None to wait forever
+    :return: True if everything has been written
+    """
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    drained = status.stop(timeout)
+    remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+    drained = status.close(remaining) and drained
+
+    if not drained:
+        LOGGER.warning("Status not delivered within %ss, the last values are dropped", timeout)
+
+    return drained
+
+
+class StatusTestResult(unittest.TextTestResult):
+    """
+    Sub class of the unittest result to
+        - count each outcome in a RunStatus
+    """
+
+    # Set by StatusTestRunner
+    status = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Tests with failed sub tests, counted once
+        self._failed_tests = set()
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.status.add_succeed()
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.status.add_failed()
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.status.add_blocked()
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.status.add_blocked()
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.status.add_blocked()
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.status.add_failed()
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+
+        # The test itself gets no outcome when one of its sub tests failed
+        if err is not None and test.id() not in self._failed_tests:
+            self._failed_tests.add(test.id())
+            if issubclass(err[0], test.failureException):
+                self.status.add_failed()
+            else:
+                self.status.add_blocked()
+
+
+class StatusTestRunner(unittest.TextTestRunner):
+    """
+    Sub class of the unittest runner to
+        - start the run status with the number of tests
+        - stop and close it at the end of the run
+    """
+
+    def __init__(self, status: RunStatus, name: str = None, timeout: float = STOP_TIMEOUT, **kwargs):
+        """
+        Class init
+        :param status: the run status, see open_run_status
+        :param name: (optional) name of the test run
+        :param timeout: (optional) maximum time in seconds to deliver the final status,
+                        None to wait forever
+        :param kwargs: (optional) unittest.TextTestRunner arguments
+        """
+
+        super().__init__(**kwargs)
+
+        self.status = status
+        self.name = name
+        self.timeout = timeout
+        self.resultclass = type("BoundStatusTestResult", (StatusTestResult,), {"status": status})
+
+    def run(self, test):
+        """
+        Run the tests and report them
+        :param test: test case or suite
+        :return: the test result
+        """
+
+        total = test.countTestCases()
+        if total:
+            self.status.start(total, self.name)
+
+        try:
+            return super().run(test)
+        finally:
+            close_run_status(self.status, self.timeout)
@@ -0,0 +1,221 @@
+"""
+Transports of the app status
+
+A transport is what a link writes the pin values to. It has the same interface
+as blynklib.Blynk, the default transport:
+    - virtual_write(pin, value) to write a pin value
+    - run() to sync the written values
+    - connected() and close(), optional
+    - write_batch(dict) to write the pins of a post in one message, returning False
+      when they were not written, optional
+
+"""
+
+import socket
+import time
+
+import blynklib
+
+from .encoder import FrameEncoder
+from .log import LOGGER
+
+
+class Transport:
+    """
+    Base class of the transports
+    """
+
+    def virtual_write(self, v_pin, *val):
+        """
+        Write a value to a virtual pin
+        :param v_pin: virtual pin number
+        :param val: value(s) to write
+        :return: None
+        """
+
+        raise NotImplementedError
+
+    def run(self):
+        """
+        Sync the written values
+        :return: None
+        """
+
+    def connected(self) -> bool:
+        """
+        :return: True when the transport is ready to send
+        """
+
+        return True
+
+    def close(self):
+        """
+        Close the transport
+        :return: None
+        """
+
+
+class BlynkTransport(blynklib.Blynk):
+    """
+    Blynk connection that can be closed, whose message ids never wrap to 0,
+    and that writes a batch of pin values in one socket write
+    """
+
+    def __init__(self, token, **kwargs):
+        super().__init__(token, **kwargs)
+
+        self._encoder = FrameEncoder()
+
+    def write_batch(self, status_dict: dict):
+        """
+        Write a dict of pin values as a single buffer
+        :param status_dict: dict of values with pair of id : value
+        :return: True if written, False when disconnected, the next run() reconnects
+        """
+
+        if not self.connected():
+            return False
+
+        frame, self._msg_id = self._encoder.encode(status_dict, self._msg_id)
+        self._last_send_time = blynklib.ticks_ms()
+
+        try:
+            self._socket.sendall(frame)
+        except OSError:
+            LOGGER.warning("Status batch write failed", exc_info=True)
+            # Without the reconnect delay of disconnect(), the next run() reconnects
+            self.close()
+            return False
+        finally:
+            frame.release()
+
+        return True
+
+    def _get_msg_id(self, **kwargs):
+        """
+        Message id generator, wrapping after 0xFFFF as 0 is not a valid id
+        """
+
+        if "msg_id" in kwargs:
+            return kwargs["msg_id"]
+
+        self._msg_id = self._msg_id % 0xFFFF + 1
+        return self._msg_id
+
+    def close(self):
+        """
+        Close the connection, without the reconnect delay of disconnect()
+        :return: None
+        """
+
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+        self._state = self.DISCONNECTED
+
+
+class MemoryTransport(Transport):
+    """
+    Transport recording the writes in memory, for tests and benchmarks
+    """
+
+    def __init__(self):
+        """
+        Class init
+        """
+
+        self.protocol = blynklib.Protocol()
+        self.writes = []
+        self.pins = {}
+        self.syncs = 0
+        self.bytes_sent = 0
+        self.closed = False
+
+    def virtual_write(self, v_pin, *val):
+        self.writes.append((v_pin,) + val)
+        self.pins[v_pin] = val[0] if len(val) == 1 else val
+        self.bytes_sent += len(self.protocol.virtual_write_msg(v_pin, *val))
+
+    def run(self):
+        self.syncs += 1
+
+    def close(self):
+        self.closed = True
+
+    def clear(self):
+        """
+        Forget the recorded writes
+        :return: None
+        """
+
+        self.writes.clear()
+        self.pins.clear()
+        self.syncs = 0
+        self.bytes_sent = 0
+
+
+class FileTransport(Transport):
+    """
+    Transport appending the writes to a text file, one tab separated line per write:
+    time pin value
+    """
+
+    def __init__(self, path):
+        """
+        Class init
+        :param path: path of the file, appended if it exists
+        """
+
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def virtual_write(self, v_pin, *val):
+        self._file.write("{:.6f}\t{}\t{}\n".format(time.time(), v_pin, "\t".join(str(item) for item in val)))
+
+    def run(self):
+        self._file.flush()
+
+    def connected(self) -> bool:
+        return not self._file.closed
+
+    def close(self):
+        self._file.close()
+
+
+class UdpTransport(Transport):
+    """
+    Transport sending the blynk protocol messages in UDP datagrams,
+    the writes between two syncs are sent in one datagram
+    """
+
+    def __init__(self, token, address):
+        """
+        Class init
+        :param token: the blynk auth key, sent at the head of each datagram
+        :param address: (host, port) of the server
+        """
+
+        self.address = address
+        self.protocol = blynklib.Protocol()
+        self._encoder = FrameEncoder()
+        self._login = self.protocol.login_msg(token)
+        self._frames = []
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def virtual_write(self, v_pin, *val):
+        self._frames.append(self.protocol.virtual_write_msg(v_pin, *val))
+
+    def write_batch(self, status_dict: dict) -> bool:
+        frame, self.protocol._msg_id = self._encoder.encode(status_dict, self.protocol._msg_id)
+        self._frames.append(bytes(frame))
+        return True
+
+    def run(self):
+        if self._frames:
+            self._frames.insert(0, self._login)
+            self._socket.sendto(b"".join(self._frames), self.address)
+            self._frames.clear()
+
+    def close(self):
+        self._socket.close()
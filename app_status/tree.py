@@ -0,0 +1,283 @@
+"""
+Tree of test runs status screen manager
+
+A campaign is a tree of runs: suites of modules of tests. The counts are made
+on any node and rolled up incrementally to its ancestors, in O(depth), so the
+progress of every suite and of the campaign is always up to date without
+summing the children again.
+
+The nodes bound to a pin block, the root on block 0 by default, are published:
+publish() sends the changed values of all of them in one batched write. The
+blynk virtual pins do not fit a block per suite of a large campaign, the other
+nodes are counted only, and bind() moves a block to the running suite.
+
+    tree = RunTree(key)
+    suite = tree.node("suite", run_id=1)
+    module = tree.node("module", parent=suite, total=20)
+    tree.start("nightly")
+    tree.add(module, succeed=1)
+    tree.publish()
+    tree.stop()
+
+"""
+
+import threading
+from datetime import datetime
+
+from .core import AppStatus, RunModel, RunElements
+from .link import VPIN_MAX
+from .log import LOGGER
+
+
+class RunNode(RunModel):
+    """
+    Sub class to manage one test run of a tree
+
+    """
+
+    def __init__(self, name: str, parent, layout):
+        self.parent = parent
+        self.children = []
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.layout = layout
+
+        self.test_run = RunElements()
+        self.test_run.name = name
+        self.test_run.date = datetime.now().strftime("%d-%m-%Y (%H:%M)")
+
+        # Not published until bound to a pin block
+        self.app_id = None
+        self.pin_table = None
+
+
+class RunTree(AppStatus):
+    """
+    Sub class to manage the status of a tree of test runs on one application
+
+    """
+
+    def __init__(self, blink_key, name: str = None, root_id: int = 0, delta: bool = True, layout=None, **kwargs):
+        """
+        Class init
+        :param blink_key: the blynk auth key to be use
+        :param name: (optional) name of the root run
+        :param root_id: (optional) pin block of the root run, None to not publish it
+        :param delta: (optional) only send the pins whose value changed since the last write
+        :param layout: (optional) Layout from app_status.layout mapping the run fields to pins,
+                       a packed layout fits more blocks, without rate nor eta field
+        :param kwargs: (optional) other AppStatus options
+        """
+
+        super().__init__(blink_key, 0, delta=delta, **kwargs)
+
+        self.layout = RunModel.layout if layout is None else layout
+        if self.layout.has_rate:
+            raise ValueError("The rate fields are not estimated for the nodes of a run tree")
+        self.max_run = self.layout.max_runs(VPIN_MAX)
+
+        # run_id: bound node
+        self.blocks = {}
+        # Published nodes changed since the last publish, in order, and the ones never sent
+        self._dirty = {}
+        self._new = set()
+        # The first failure is sent without delay
+        self._urgent = False
+        self._lock = threading.Lock()
+
+        self.root = RunNode("no name" if name is None else name, None, self.layout)
+        if root_id is not None:
+            self.bind(self.root, root_id)
+
+    def node(self, name: str, parent: RunNode = None, total: int = 0, run_id: int = None) -> RunNode:
+        """
+        Add a run to the tree
+        :param name: name of the run
+        :param parent: (optional) parent run, the root by default
+        :param total: (optional) number of tests of the run, added to the totals of its ancestors
+        :param run_id: (optional) pin block of the run, None to only count it
+        :return: the run node
+        """
+
+        if parent is None:
+            parent = self.root
+
+        node = RunNode(name, parent, self.layout)
+
+        with self._lock:
+            parent.children.append(node)
+            if total:
+                self.__roll_up(node, total, 0, 0, 0)
+
+        if run_id is not None:
+            self.bind(node, run_id)
+
+        return node
+
+    def bind(self, node: RunNode, run_id: int):
+        """
+        Publish a run on a pin block, the run previously bound to it is not published anymore
+        :param node: the run node
+        :param run_id: pin block, from 0 to the number of blocks fitting in the virtual pins - 1
+        :return: None
+        """
+
+        if not 0 <= run_id < self.max_run:
+            raise ValueError("The run id must be between 0 and {}".format(self.max_run - 1))
+
+        with self._lock:
+            previous = self.blocks.get(run_id)
+            if previous is not None and previous is not node:
+                previous.app_id = previous.pin_table = None
+                self._dirty.pop(previous, None)
+                self._new.discard(previous)
+
+            if node.app_id is not None and node.app_id != run_id:
+                del self.blocks[node.app_id]
+
+            node.app_id = run_id
+            node.pin_table = self.layout.compile(run_id)
+            self.blocks[run_id] = node
+
+            # The pins of the block are all sent again
+            self._dirty[node] = None
+            self._new.add(node)
+
+    def start(self, name: str = None):
+        """
+        Method to sync the tree with the phone application at startup, all the bound runs
+        are sent
+
+        :param name: (optional) name of the root run
+        :return: None
+        """
+
+        date = datetime.now().strftime("%d-%m-%Y (%H:%M)")
+
+        with self._lock:
+            if name is not None:
+                self.root.test_run.name = name
+
+            status_dict = {}
+            pending = {}
+            for node in self.blocks.values():
+                node.test_run.date = date
+                if node.test_run.total:
+                    status_dict.update(node._all_dict())
+                else:
+                    # Sent in full once it has tests
+                    pending[node] = None
+
+            self._dirty = pending
+            self._new = set(pending)
+            self._urgent = False
+
+        LOGGER.info("Start run tree %s with %s tests in %s blocks", self.root.test_run.name,
+                    self.root.test_run.total, len(self.blocks), extra=self.root._log_fields())
+
+        # A run start is a full refresh of the phone screen
+        self.post_dict(status_dict, force=True, urgent=True)
+
+    def add(self, node: RunNode, succeed: int = 0, failed: int = 0, blocked: int = 0):
+        """
+        Count test results in a run and its ancestors, sent at the next publish
+
+        :param node: the run node
+        :param succeed: (optional) succeed increment
+        :param failed: (optional) failed increment
+        :param blocked: (optional) blocked increment
+        :return: None
+        """
+
+        if node.test_run.total == 0:
+            raise ValueError("The total value of {} has not been setup.".format(node.test_run.name))
+
+        with self._lock:
+            if failed and not self.root.test_run.failed:
+                self._urgent = True
+            self.__roll_up(node, 0, succeed, failed, blocked)
+
+    def publish(self, force: bool = False) -> int:
+        """
+        Send the changed runs in one batch
+        :param force: (optional) send every pin of the changed runs even if delta mode would skip it
+        :return: number of sent runs
+        """
+
+        with self._lock:
+            status_dict = {}
+            pending = {}
+            refreshed = []
+            sent = 0
+            for node in self._dirty:
+                if not node.test_run.total:
+                    pending[node] = None
+                elif node in self._new:
+                    # A new run is a full refresh of its block
+                    node_dict = node._all_dict()
+                    status_dict.update(node_dict)
+                    refreshed.extend(node_dict)
+                    self._new.discard(node)
+                    sent += 1
+                else:
+                    status_dict.update(node._update_dict())
+                    sent += 1
+
+            self._dirty = pending
+            urgent = self._urgent
+            self._urgent = False
+
+        if refreshed and not force:
+            # Only the blocks of the new runs are sent in full, the other runs stay in delta
+            self.reset_shadow(refreshed)
+
+        if status_dict:
+            self.post_dict(status_dict, force, urgent)
+
+        return sent
+
+    def stop(self):
+        """
+        Sent the last values and a stop information of the bound runs to the blynk phone application
+        :return: None
+        """
+
+        self.publish()
+
+        status_dict = {}
+        for node in self.blocks.values():
+            if node.pin_table.led is not None:
+                status_dict[node.pin_table.led] = 0
+
+        LOGGER.info("Stop run tree %s", self.root.test_run.name, extra=self.root._log_fields())
+
+        self.post_dict(status_dict, urgent=True)
+
+        # The final status must not stay in the coalescing buffer
+        self.flush()
+
+    def __roll_up(self, node: RunNode, total: int, succeed: int, failed: int, blocked: int):
+        """
+        Add values to a run and its ancestors, under the lock
+        :param node: the run node
+        :param total: total increment
+        :param succeed: succeed increment
+        :param failed: failed increment
+        :param blocked: blocked increment
+        :return: None
+        """
+
+        actual = succeed + failed + blocked
+        dirty = self._dirty
+
+        while node is not None:
+            test_run = node.test_run
+            test_run.total += total
+            test_run.succeed += succeed
+            test_run.failed += failed
+            test_run.blocked += blocked
+            test_run.actual += actual
+
+            if node.pin_table is not None:
+                dirty[node] = None
+
+            node = node.parent
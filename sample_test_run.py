@@ -4,6 +4,7 @@ The app is simulating a test run anf post the result on a remote screen.
 
 """
 
+import logging
 import time
 import random
 from app_status import RunStatus
@@ -21,6 +22,9 @@ def main():
     :return: None
     """
 
+    # show the sent status
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     # init steps timing
     last_event = 0
     event_period_s = 3
@@ -4,9 +4,10 @@ The app is simulating a test run anf post the result on a remote screen.
 
 """
 
+import logging
 import time
 import random
-from app_status import RunStatus
+from app_status import RunDashboard
 
 
 BLYNK_AUTH = 'xz7QdnPAfTMVm4247CGRb0jVjgXF1byY'
@@ -22,18 +23,20 @@ def main():
     :return: None
     """
 
+    # show the sent status
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     # init steps timing
     event_period_s = 3
 
     total = [20, 15, 30, 10]
 
-    # create status object table
-    status = []
+    # create the dashboard of the runs
+    dashboard = RunDashboard(BLYNK_AUTH, max_run=len(total))
 
     # fill up test run start info
-    for i in range(4):
-        status.append(RunStatus(BLYNK_AUTH, i))
-        status[i].start(total[i], "Run {}".format(i))
+    for i, run_total in enumerate(total):
+        dashboard.start(i, run_total, "Run {}".format(i))
 
     # TODO random progress
     # Generate test steps
@@ -42,19 +45,23 @@ def main():
         print("Loop {}".format(actual))
         time.sleep(event_period_s)
 
-        for i in range(4):
-            if actual < status[i].test_run.total:
+        # the results of all the runs are sent in one batch
+        increments = {}
+        for i, run_total in enumerate(total):
+            if actual < run_total:
 
                 if random.choice(CHANCE_SUCCESS):
-                    status[i].add_succeed()
+                    increments[i] = (1, 0, 0)
                 elif random.choice(CHANCE_FAILED):
-                    status[i].add_failed()
+                    increments[i] = (0, 1, 0)
                 else:
-                    status[i].add_blocked()
+                    increments[i] = (0, 0, 1)
+
+        dashboard.add_many(increments)
 
     time.sleep(event_period_s)
-    for i in range(4):
-        status[i].stop()
+    dashboard.stop()
+    dashboard.close()
 
 
 if __name__ == "__main__":
@@ -21,10 +21,13 @@ setuptools.setup(
     install_requires=[
         'blynklib',
         ],
+    entry_points={
+        'pytest11': ['app_status = app_status.pytest_plugin'],
+        },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
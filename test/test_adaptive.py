@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from app_status import AppStatus, RunStatus
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH, GatedTransport
+
+
+class TestAdaptive(TestCase):
+
+    def test_interval_follows_round_trip(self):
+
+        transport = GatedTransport(delay=0.03)
+        status = AppStatus(BLYNK_AUTH, transport=transport, adaptive=True)
+
+        self.assertEqual(status.link.interval(), status.link.MIN_INTERVAL)
+
+        for value in range(5):
+            status.post_dict({1: value})
+
+        # The first post is written, the next ones wait for the interval
+        self.assertEqual(transport.writes, [(1, 0)])
+        stats = status.stats()
+        self.assertGreaterEqual(stats["rtt_ms"], 30)
+        self.assertGreaterEqual(stats["interval_ms"], 60)
+
+        status.post_dict({2: "now"}, urgent=True)
+        self.assertEqual(transport.writes, [(1, 0), (1, 4), (2, "now")])
+
+    def test_run_transitions(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, adaptive=True, flush_interval_ms=60000)
+
+        status.start(8, "name")
+        self.assertEqual(transport.pins[0], "name")
+
+        # Routine progress is throttled
+        status.add_succeed()
+        self.assertEqual(transport.pins[2], "0/8")
+
+        # Crossing 25%
+        status.add_succeed()
+        self.assertEqual(transport.pins[2], "2/8")
+
+        status.add_succeed()
+        self.assertEqual(transport.pins[2], "2/8")
+
+        # First failure
+        status.add_failed()
+        self.assertEqual(transport.pins[4], "S3 F1 B0")
+
+        status.add_failed()
+        self.assertEqual(transport.pins[4], "S3 F1 B0")
+
+        status.stop()
+        self.assertEqual(transport.pins[4], "S3 F2 B0")
+        self.assertEqual(transport.pins[5], 0)
+
+    def test_not_adaptive(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, flush_interval_ms=60000)
+
+        status.start(4, "name")
+        status.add_failed()
+
+        # The fixed interval coalescing is kept
+        self.assertEqual(transport.pins[4], "S0 F0 B0")
+        self.assertNotIn("interval_ms", status.stats())
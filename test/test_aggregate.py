@@ -0,0 +1,54 @@
+import multiprocessing
+from unittest import TestCase
+
+from app_status import RunStatus
+from app_status.aggregate import Aggregator
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def work(reporter, count):
+    for index in range(count):
+        if index % 4 == 0:
+            reporter.add_failed()
+        elif index % 4 == 1:
+            reporter.add_blocked()
+        else:
+            reporter.add_succeed()
+
+
+class TestAggregator(TestCase):
+
+    def test_processes(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport)
+        status.start(4 * 400, "name")
+
+        with Aggregator(status, workers=4, interval=0.01) as aggregator:
+            processes = [multiprocessing.Process(target=work, args=(aggregator.reporter(i), 400)) for i in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+        self.assertEqual(aggregator.totals(), (800, 400, 400))
+        self.assertEqual(transport.pins[2], "1600/1600")
+        self.assertEqual(transport.pins[4], "S800 F400 B400")
+
+    def test_publish_changes_only(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport)
+        status.start(10, "name")
+
+        aggregator = Aggregator(status, workers=2)
+        aggregator.reporter(1).add_succeed(3)
+
+        self.assertTrue(aggregator.publish())
+        self.assertFalse(aggregator.publish())
+        self.assertEqual(status.test_run.succeed, 3)
+
+        with self.assertRaises(ValueError):
+            aggregator.reporter(2)
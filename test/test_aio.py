@@ -0,0 +1,137 @@
+import asyncio
+import struct
+import time
+from unittest import TestCase
+
+import blynklib
+
+from app_status import AsyncAppStatus, AsyncRunStatus
+from app_status.aio import AsyncBlynkTransport
+from app_status.server import LocalServer
+
+
+class FakeAsyncTransport:
+
+    def __init__(self):
+        self.batches = []
+        self.connected = False
+
+    async def connect(self):
+        self.connected = True
+
+    async def write_batch(self, batch):
+        self.batches.append(batch)
+
+    async def close(self):
+        self.connected = False
+
+
+class TestAsyncRunStatus(TestCase):
+
+    def test_same_tick_batch(self):
+
+        async def scenario():
+            transport = FakeAsyncTransport()
+            async with AsyncRunStatus("fake_auth", transport=transport) as status:
+                await status.start(10, "name")
+                await asyncio.gather(status.add_succeed(), status.add_failed(), status.add_blocked(2))
+                await status.stop()
+            return transport
+
+        transport = asyncio.run(scenario())
+
+        self.assertFalse(transport.connected)
+        self.assertEqual(len(transport.batches), 3)
+        self.assertEqual(transport.batches[0][0], "name")
+        # The three increments of the tick are sent as one batch with the latest values
+        self.assertEqual(transport.batches[1], {2: "4/10", 3: 40.0, 4: "S1 F1 B2", 5: 255})
+        # The stop sends the final values with the led
+        self.assertEqual(transport.batches[2], {2: "4/10", 3: 40.0, 4: "S1 F1 B2", 5: 0})
+
+    def test_update_not_started(self):
+
+        status = AsyncRunStatus("fake_auth", transport=FakeAsyncTransport())
+
+        with self.assertRaises(ValueError):
+            asyncio.run(status.update(1))
+
+
+class TestAsyncBlynkTransport(TestCase):
+
+    def test_write_batch(self):
+
+        received = []
+
+        async def handle(reader, writer):
+            protocol = blynklib.Protocol()
+            # Login and heartbeat handshake
+            for _ in range(2):
+                msg_type, msg_id, length = struct.unpack("!BHH", await reader.readexactly(5))
+                await reader.readexactly(length)
+                writer.write(struct.pack("!BHH", protocol.MSG_RSP, msg_id, protocol.STATUS_OK))
+            while True:
+                try:
+                    msg_type, msg_id, length = struct.unpack("!BHH", await reader.readexactly(5))
+                except asyncio.IncompleteReadError:
+                    break
+                received.append(((await reader.readexactly(length)).split(b"\0")))
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+
+            status = AsyncAppStatus("fake_auth", transport=AsyncBlynkTransport("fake_auth", "127.0.0.1", port))
+            await status.connect()
+            await asyncio.gather(status.post_dict({1: "a"}), status.post_dict({2: 3}))
+            await status.close()
+
+            await asyncio.sleep(0.05)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(received, [[b"vw", b"1", b"a"], [b"vw", b"2", b"3"]])
+
+    def test_posts_while_connecting(self):
+
+        async def post_later(status, delay, status_dict):
+            await asyncio.sleep(delay)
+            await status.post_dict(status_dict)
+
+        async def scenario(address):
+            status = AsyncAppStatus("fake_auth", transport=AsyncBlynkTransport("fake_auth", *address))
+            # The later ticks wait for the connection opened by the first one
+            await asyncio.gather(post_later(status, 0, {1: "a"}), post_later(status, 0.01, {2: "b"}),
+                                 post_later(status, 0.02, {3: "c"}))
+            await status.close()
+
+        with LocalServer(latency=0.05) as server:
+            asyncio.run(scenario(server.address))
+            # Let the server read the last writes
+            time.sleep(0.3)
+            values = server.values("fake_auth")
+
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(values, {1: "a", 2: "b", 3: "c"})
+
+    def test_invalid_token(self):
+
+        async def handle(reader, writer):
+            _, msg_id, length = struct.unpack("!BHH", await reader.readexactly(5))
+            await reader.readexactly(length)
+            writer.write(struct.pack("!BHH", 0, msg_id, blynklib.Protocol.STATUS_INVALID_TOKEN))
+
+        async def scenario():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            transport = AsyncBlynkTransport("fake_auth", "127.0.0.1", port)
+            try:
+                await transport.connect()
+            finally:
+                await transport.close()
+                server.close()
+
+        with self.assertRaises(blynklib.BlynkError):
+            asyncio.run(scenario())
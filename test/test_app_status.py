@@ -1,10 +1,13 @@
 
+import threading
+import time
 from unittest import TestCase
 from unittest.mock import Mock, call
 
 import blynklib
 
 from app_status import AppStatus, RunStatus
+from app_status.transport import MemoryTransport
 
 
 BLYNK_AUTH = 'fake_auth'
@@ -18,6 +21,46 @@ class FakeBlink:
         pass
 
 
+class GatedTransport(MemoryTransport):
+    """
+    Memory transport whose syncs, or writes, wait for a gate, then take a delay
+    """
+
+    # Bound of the waits, a failing test does not hang
+    MAX_WAIT = 10
+
+    def __init__(self, delay: float = 0, gated: bool = False, gate_writes: bool = False):
+        """
+        Class init
+        :param delay: (optional) time in seconds of each sync
+        :param gated: (optional) start with the gate closed, until gate.set()
+        :param gate_writes: (optional) the writes wait for the gate instead of the syncs
+        """
+
+        super().__init__()
+        self.delay = delay
+        self.gate_writes = gate_writes
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+        self.syncing = threading.Event()
+        self.runs = 0
+
+    def virtual_write(self, v_pin, *val):
+        if self.gate_writes:
+            self.gate.wait(self.MAX_WAIT)
+        super().virtual_write(v_pin, *val)
+
+    def run(self):
+        self.syncing.set()
+        if not self.gate_writes:
+            self.gate.wait(self.MAX_WAIT)
+        if self.delay:
+            time.sleep(self.delay)
+        self.runs += 1
+        super().run()
+
+
 class TestAppStatus(TestCase):
 
     def test_post_dict(self):
@@ -37,6 +80,64 @@ class TestAppStatus(TestCase):
         status.blynk.virtual_write.assert_has_calls(calls)
         status.blynk.run.assert_called()
 
+    def test_post_dict_delta(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = AppStatus(BLYNK_AUTH, delta=True)
+
+        status.blynk.virtual_write = Mock(return_value=None)
+        status.blynk.run = Mock(return_value=None)
+
+        status.post_dict({1: "1", 2: 2, 3: 255})
+        status.blynk.virtual_write.reset_mock()
+        status.blynk.run.reset_mock()
+
+        # Only the changed pins are written, 2.0 is not the same display as 2
+        status.post_dict({1: "1", 2: 2.0, 3: 255})
+
+        status.blynk.virtual_write.assert_called_once_with(2, 2.0)
+        status.blynk.run.assert_called_once()
+        self.assertEqual(status.writes_sent, 4)
+        self.assertEqual(status.writes_saved, 2)
+
+        # Nothing changed, nothing sent
+        status.blynk.virtual_write.reset_mock()
+        status.blynk.run.reset_mock()
+
+        status.post_dict({1: "1", 3: 255})
+
+        status.blynk.virtual_write.assert_not_called()
+        status.blynk.run.assert_not_called()
+
+        # Forced post ignores the shadow
+        status.post_dict({1: "1"}, force=True)
+
+        status.blynk.virtual_write.assert_called_once_with(1, "1")
+
+    def test_post_dict_coalesce(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = AppStatus(BLYNK_AUTH, flush_interval_ms=60000)
+
+        status.blynk.virtual_write = Mock(return_value=None)
+        status.blynk.run = Mock(return_value=None)
+
+        # First post is sent right away
+        status.post_dict({1: "1", 2: "2"})
+        status.blynk.virtual_write.assert_has_calls([call(1, "1"), call(2, "2")])
+        status.blynk.virtual_write.reset_mock()
+        status.blynk.run.reset_mock()
+
+        # Next ones are coalesced until the interval is elapsed
+        status.post_dict({1: "a"})
+        status.post_dict({1: "b", 2: "c"})
+        status.blynk.virtual_write.assert_not_called()
+        status.blynk.run.assert_not_called()
+
+        status.flush()
+        self.assertEqual(status.blynk.virtual_write.call_args_list, [call(1, "b"), call(2, "c")])
+        status.blynk.run.assert_called_once()
+
 
 class TestRunStatus(TestCase):
 
@@ -245,3 +346,46 @@ class TestRunStatus(TestCase):
 
         status.blynk.virtual_write.assert_has_calls(calls)
         status.blynk.run.assert_called()
+
+    def test_increment_delta(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = RunStatus(BLYNK_AUTH, delta=True)
+
+        status.blynk.virtual_write = Mock(return_value=None)
+        status.blynk.run = Mock(return_value=None)
+
+        status.start(10, "name")
+        status.blynk.virtual_write.reset_mock()
+
+        # The led is already on, it is not sent again
+        calls = [call(2, "1/10"), call(3, 10.0), call(4, "S1 F0 B0")]
+
+        status.add_succeed()
+
+        self.assertEqual(status.blynk.virtual_write.call_args_list, calls)
+
+        # A new start is a full refresh
+        status.blynk.virtual_write.reset_mock()
+        status.start(10, "name")
+
+        self.assertEqual(status.blynk.virtual_write.call_count, 6)
+
+    def test_stop_coalesce(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = RunStatus(BLYNK_AUTH, flush_interval_ms=60000)
+
+        status.blynk.virtual_write = Mock(return_value=None)
+        status.blynk.run = Mock(return_value=None)
+
+        status.start(10, "name")
+        status.add_succeed()
+        status.add_failed()
+        status.blynk.virtual_write.reset_mock()
+
+        # Stop sends the pending update and the led
+        status.stop()
+
+        status.blynk.virtual_write.assert_has_calls([call(2, "2/10"), call(3, 20.0),
+                                                     call(4, "S1 F1 B0"), call(5, 0)])
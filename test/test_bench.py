@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from app_status.bench import compare, run_case
+
+
+class TestBench(TestCase):
+
+    def test_run_case(self):
+
+        result = run_case("add", "memory", "delta", 30)
+
+        self.assertEqual(result["count"], 30)
+        self.assertGreater(result["updates_per_s"], 0)
+        self.assertGreater(result["bytes_per_update"], 0)
+        self.assertLessEqual(result["p50_us"], result["p99_us"])
+
+    def test_compare(self):
+
+        baseline = [{"scenario": "add", "transport": "memory", "mode": "delta",
+                     "p50_us": 10.0, "p99_us": 20.0, "updates_per_s": 1000.0}]
+        results = [dict(baseline[0], p50_us=11.0, updates_per_s=500.0)]
+
+        regressions = compare(results, baseline, 0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("updates_per_s", regressions[0])
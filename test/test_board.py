@@ -0,0 +1,106 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from app_status import StatusBoard
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestStatusBoard(TestCase):
+
+    def setUp(self):
+
+        self.transport = MemoryTransport()
+        self.board = StatusBoard(BLYNK_AUTH, transport=self.transport)
+
+    def test_publish_changed(self):
+
+        queue = self.board.gauge("queue", 1)
+        jobs = self.board.counter("jobs", 2)
+        state = self.board.text("state", 3, value="idle")
+        memory = self.board.gauge("memory", 4, fmt="{:.1f} MB")
+
+        # The gauges without value are not published
+        self.assertEqual(self.board.publish(), 2)
+        self.assertEqual(self.transport.writes, [(2, 0), (3, "idle")])
+
+        queue.set(3)
+        jobs.add()
+        memory.set(12.34)
+        self.transport.clear()
+        self.assertEqual(self.board.publish(), 3)
+        self.assertEqual(self.transport.writes, [(1, 3), (2, 1), (4, "12.3 MB")])
+
+        # Nothing changed
+        queue.set(3)
+        self.assertEqual(self.board.publish(), 0)
+
+        state.set("busy")
+        self.assertEqual(self.board["state"].value, "busy")
+        self.assertEqual(self.board.values(), {"queue": 3, "jobs": 1, "state": "busy", "memory": 12.34})
+
+        self.transport.clear()
+        self.assertEqual(self.board.publish(force=True), 4)
+
+    def test_failed_post(self):
+
+        self.board.gauge("queue", 1, value=3)
+
+        with patch.object(self.transport, "virtual_write", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.board.publish()
+
+        # Not marked published, sent again by the next publish
+        self.assertEqual(self.board.publish(), 1)
+        self.assertEqual(self.transport.pins[1], 3)
+
+    def test_background(self):
+
+        board = StatusBoard(BLYNK_AUTH, transport=self.transport, interval=0.02)
+        jobs = board.counter("jobs", 2)
+
+        with board:
+            jobs.add()
+            time.sleep(0.1)
+            self.assertEqual(self.transport.pins[2], 1)
+            jobs.add()
+
+        # The final value is published on stop
+        self.assertEqual(self.transport.pins[2], 2)
+        self.assertTrue(board.close())
+
+    def test_threaded_counter(self):
+
+        jobs = self.board.counter("jobs", 2, fmt=lambda value: "{} jobs".format(value))
+
+        def work():
+            for _ in range(1000):
+                jobs.add()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.board.publish()
+        self.assertEqual(self.transport.pins[2], "4000 jobs")
+
+        jobs.reset()
+        self.assertEqual(jobs.value, 0)
+
+    def test_invalid_fields(self):
+
+        self.board.gauge("queue", 1)
+
+        with self.assertRaises(ValueError):
+            self.board.gauge("queue", 2)
+
+        with self.assertRaises(ValueError):
+            self.board.counter("jobs", 1)
+
+        with self.assertRaises(ValueError):
+            self.board.text("state", 256)
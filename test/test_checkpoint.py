@@ -0,0 +1,130 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from app_status import RunStatus
+from app_status.checkpoint import RUNNING, SLOT, STOPPED, Checkpoint
+from app_status.core import RunElements
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def make_run(succeed, name="name"):
+    """
+    Build the run information of a checkpoint
+    """
+
+    test_run = RunElements()
+    test_run.name = name
+    test_run.total = 10
+    test_run.succeed = succeed
+
+    return test_run
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "run.ckpt")
+
+    def tearDown(self):
+
+        self.folder.cleanup()
+
+    def test_save_load(self):
+
+        checkpoint = Checkpoint(self.path, interval=3600)
+        self.assertIsNone(checkpoint.load())
+
+        self.assertTrue(checkpoint.save(make_run(1, "nightly é")))
+        # Periodic saves are limited by the interval
+        self.assertFalse(checkpoint.save(make_run(2)))
+        self.assertTrue(checkpoint.save(make_run(3), STOPPED, force=True))
+        checkpoint.close()
+
+        self.assertEqual(os.path.getsize(self.path), 2 * SLOT.size)
+
+        saved = Checkpoint(self.path).load()
+        self.assertEqual((saved["state"], saved["total"], saved["succeed"], saved["name"]),
+                         (STOPPED, 10, 3, "name"))
+
+    def test_torn_write(self):
+
+        checkpoint = Checkpoint(self.path, interval=0)
+        checkpoint.save(make_run(1))
+        checkpoint.save(make_run(2))
+
+        # A crash in the middle of the last write leaves the previous slot
+        checkpoint._map[0:8] = bytes(8)
+        self.assertEqual(checkpoint.load()["succeed"], 1)
+
+        # The next write goes on in the sequence
+        checkpoint.save(make_run(3))
+        self.assertEqual(checkpoint.load()["succeed"], 3)
+        checkpoint.close()
+
+    def test_trailing_save(self):
+
+        status = RunStatus(BLYNK_AUTH, transport=MemoryTransport(), checkpoint=Checkpoint(self.path, interval=0.1))
+        status.start(100, "nightly")
+        time.sleep(0.15)
+
+        # The first count is saved, the next ones are within the interval
+        for _ in range(30):
+            status.add_succeed()
+        time.sleep(0.3)
+
+        # Killed without a stop nor a close
+        transport = MemoryTransport()
+        resumed = RunStatus(BLYNK_AUTH, transport=transport, checkpoint=self.path)
+        self.assertTrue(resumed.resume())
+        self.assertEqual(resumed.test_run.actual, 30)
+        self.assertEqual(transport.pins[2], "30/100")
+
+        resumed.close()
+        status.close()
+
+    def test_long_name(self):
+
+        checkpoint = Checkpoint(self.path)
+        checkpoint.save(make_run(1, "é" * 40))
+
+        self.assertEqual(checkpoint.load()["name"], "é" * 32)
+        checkpoint.close()
+
+    def test_resume(self):
+
+        status = RunStatus(BLYNK_AUTH, transport=MemoryTransport(), checkpoint=self.path)
+        self.assertFalse(status.resume())
+
+        status.start(10, "nightly")
+        date = status.test_run.date
+        status.add_succeed(4)
+        status.add_failed()
+        status.checkpoint.save(status.test_run, force=True)
+        # Killed without a stop
+        status.checkpoint.close()
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, checkpoint=self.path)
+        self.assertEqual(status.checkpoint.load()["state"], RUNNING)
+        self.assertTrue(status.resume())
+
+        self.assertEqual((status.test_run.name, status.test_run.date), ("nightly", date))
+        # Only the progress pins are sent
+        self.assertEqual(transport.writes, [(2, "5/10"), (3, 50.0), (4, "S4 F1 B0"), (5, 255)])
+
+        status.add_succeed()
+        self.assertEqual(status.test_run.succeed, 5)
+
+        status.stop()
+        status.close()
+
+        # A stopped run is not resumed
+        status = RunStatus(BLYNK_AUTH, transport=MemoryTransport(), checkpoint=self.path)
+        self.assertFalse(status.resume())
+        status.close()
@@ -0,0 +1,112 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from app_status import RunStatus
+from app_status.core import RunElements
+from app_status.counters import ShardedCounters
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def run_threads(target, count=8):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestShardedCounters(TestCase):
+
+    def test_threads(self):
+
+        counters = ShardedCounters(3, [1, 2, 3])
+
+        def work():
+            for _ in range(10000):
+                counters.add(0)
+                counters.add(2, 2)
+
+        run_threads(work)
+        counters.add(1, 5)
+
+        self.assertEqual(counters.totals(), [80001, 7, 160003])
+        # The finished threads are folded, only the current one keeps a shard
+        self.assertEqual(len(counters._shards), 1)
+        self.assertEqual(counters.totals(), [80001, 7, 160003])
+
+    def test_reset(self):
+
+        counters = ShardedCounters(2)
+        counters.add(0, 4)
+        counters.reset([10, 20])
+        counters.add(1)
+
+        self.assertEqual(counters.totals(), [10, 21])
+
+
+class TestThreadedRunStatus(TestCase):
+
+    def test_add_from_threads(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, flush_interval_ms=10)
+        status.start(8 * 3000, "name")
+
+        def work():
+            for _ in range(1000):
+                status.add_succeed()
+                status.add_failed()
+                status.add_blocked()
+
+        run_threads(work)
+        status.stop()
+
+        self.assertEqual(status.test_run.actual, 8 * 3000)
+        self.assertEqual(transport.pins[2], "24000/24000")
+        self.assertEqual(transport.pins[4], "S8000 F8000 B8000")
+
+    def test_merged_when_read(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, flush_interval_ms=60000)
+        status.start(1000, "name")
+
+        with patch.object(ShardedCounters, "totals", autospec=True, side_effect=ShardedCounters.totals) as totals:
+            for _ in range(10):
+                status.add_succeed()
+
+            # Only counted until the run is read or sent
+            totals.assert_not_called()
+            self.assertEqual(status.test_run.actual, 10)
+            self.assertEqual(totals.call_count, 1)
+            self.assertEqual(transport.pins[2], "0/1000")
+
+            status.flush()
+            # Nothing counted since the read
+            self.assertEqual(totals.call_count, 1)
+
+        self.assertEqual(transport.pins[2], "10/1000")
+
+    def test_history_every_count(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, flush_interval_ms=60000, history=True)
+        status.start(1000, "name")
+
+        for _ in range(100):
+            status.add_succeed()
+
+        # Sampled on each count, not on each send
+        self.assertEqual(status.test_run.actual, 100)
+        self.assertEqual(len(status.history), 100)
+        self.assertEqual(transport.pins[2], "0/1000")
+
+        status.close()
+
+    def test_slots(self):
+
+        with self.assertRaises(AttributeError):
+            RunElements().other = 1
@@ -0,0 +1,67 @@
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+import blynklib
+
+from app_status import RunDashboard
+
+from .test_app_status import BLYNK_AUTH, FakeBlink
+
+
+class TestRunDashboard(TestCase):
+
+    def setUp(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        self.dashboard = RunDashboard(BLYNK_AUTH)
+
+        self.dashboard.blynk.virtual_write = Mock(return_value=None)
+        self.dashboard.blynk.run = Mock(return_value=None)
+
+        for run_id in range(3):
+            self.dashboard.start(run_id, 10, "Run {}".format(run_id))
+
+        self.dashboard.blynk.virtual_write.reset_mock()
+        self.dashboard.blynk.run.reset_mock()
+
+    def test_update_many(self):
+
+        self.dashboard.update_many({0: (1, 0, 0), 2: (2, 1, None)})
+
+        self.assertEqual(self.dashboard.blynk.virtual_write.call_args_list,
+                         [call(2, "1/10"), call(3, 10.0), call(4, "S1 F0 B0"),
+                          call(22, "3/10"), call(23, 30.0), call(24, "S2 F1 B0")])
+        # One sync for all the runs
+        self.dashboard.blynk.run.assert_called_once()
+        self.assertEqual(self.dashboard.run(2).actual, 3)
+
+    def test_add_many(self):
+
+        self.dashboard.add_many({1: (2, 0, 1)})
+        self.dashboard.add_many({1: (None, 1, 0)})
+
+        self.assertEqual(self.dashboard.run(1).actual, 4)
+        self.dashboard.blynk.virtual_write.assert_has_calls([call(12, "4/10"), call(13, 40.0), call(14, "S2 F1 B1")])
+        self.assertEqual(self.dashboard.blynk.run.call_count, 2)
+
+    def test_stop(self):
+
+        self.dashboard.stop()
+
+        self.assertEqual(self.dashboard.blynk.virtual_write.call_args_list, [call(5, 0), call(15, 0), call(25, 0)])
+        self.dashboard.blynk.run.assert_called_once()
+
+    def test_unknown_run(self):
+
+        with self.assertRaises(ValueError):
+            self.dashboard.update_many({3: (1, 0, 0)})
+
+        with self.assertRaises(ValueError):
+            self.dashboard.start(4, 10)
+
+    def test_max_run(self):
+
+        self.assertEqual(RunDashboard(BLYNK_AUTH, max_run=26).max_run, 26)
+
+        with self.assertRaises(ValueError):
+            RunDashboard(BLYNK_AUTH, max_run=27)
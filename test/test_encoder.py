@@ -0,0 +1,98 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import blynklib
+
+from app_status import AppStatus
+from app_status.encoder import FrameEncoder
+from app_status.transport import BlynkTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestFrameEncoder(TestCase):
+
+    def test_blynklib_messages(self):
+
+        protocol = blynklib.Protocol()
+        protocol._msg_id = 0
+        encoder = FrameEncoder()
+
+        for status_dict in ({2: "1/10", 3: 10.0, 4: "S1 F0 B0", 5: 255}, {2: "2/10", 5: 255}, {1: "é"}):
+            expected = b"".join(protocol.virtual_write_msg(pin, value) for pin, value in status_dict.items())
+            frame, msg_id = encoder.encode(status_dict, protocol._msg_id - len(status_dict))
+
+            self.assertEqual(bytes(frame), expected)
+            self.assertEqual(msg_id, protocol._msg_id)
+            frame.release()
+
+    def test_msg_id_wrap(self):
+
+        frame, msg_id = FrameEncoder().encode({1: 1, 2: 2}, 0xFFFF)
+
+        self.assertEqual(msg_id, 2)
+        self.assertEqual(bytes(frame[1:3]), b"\x00\x01")
+
+    def test_value_type(self):
+
+        encoder = FrameEncoder()
+        encoder.encode({1: 1}, 0)[0].release()
+        frame, _ = encoder.encode({1: 1.0}, 0)
+
+        self.assertTrue(bytes(frame).endswith(b"1.0"))
+
+
+class TestBatchWrite(TestCase):
+
+    def test_single_socket_write(self):
+
+        transport = BlynkTransport(BLYNK_AUTH)
+        transport._socket = Mock()
+        transport._state = transport.AUTHENTICATED
+        transport.run = Mock()
+
+        status = AppStatus(BLYNK_AUTH, transport=transport, delta=True)
+        status.post_dict({1: "a", 2: 3})
+        status.post_dict({1: "a", 2: 4})
+
+        self.assertEqual(transport._socket.sendall.call_count, 2)
+        self.assertEqual(status.writes_sent, 3)
+        self.assertEqual(status.link.last_sent, {1: "a", 2: 4})
+
+    def test_send_error(self):
+
+        transport = BlynkTransport(BLYNK_AUTH)
+        transport._socket = Mock()
+        transport._socket.sendall.side_effect = OSError("broken pipe")
+        transport._state = transport.AUTHENTICATED
+
+        with patch("app_status.transport.LOGGER"):
+            transport.write_batch({1: "a"})
+
+        # Reconnected by the next run
+        self.assertFalse(transport.connected())
+
+    def test_failed_batch_resent(self):
+
+        transport = BlynkTransport(BLYNK_AUTH)
+        transport._socket = Mock()
+        transport._socket.sendall.side_effect = OSError("broken pipe")
+        transport._state = transport.AUTHENTICATED
+        transport.run = Mock()
+
+        status = AppStatus(BLYNK_AUTH, transport=transport, delta=True)
+        transport.run.reset_mock()
+        with patch("app_status.transport.LOGGER"):
+            status.post_dict({1: "a"})
+
+        # Not in the shadow, and synced to reconnect
+        self.assertEqual(status.link.last_sent, {})
+        self.assertEqual(status.writes_sent, 0)
+        transport.run.assert_called_once_with()
+
+        transport._socket = Mock()
+        transport._state = transport.AUTHENTICATED
+        status.post_dict({1: "a"})
+
+        self.assertEqual(transport._socket.sendall.call_count, 1)
+        self.assertEqual(status.link.last_sent, {1: "a"})
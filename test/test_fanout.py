@@ -0,0 +1,86 @@
+import time
+from unittest import TestCase
+
+from app_status import AppStatus, RunStatus
+from app_status.link import FanOutLink
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH, GatedTransport
+
+
+class TestFanOut(TestCase):
+
+    def test_mirrored_run(self):
+
+        transports = [MemoryTransport(), MemoryTransport()]
+        status = RunStatus([BLYNK_AUTH, "other_auth"], 1, transport=transports)
+
+        self.assertIsInstance(status.link, FanOutLink)
+        self.assertEqual(status.blynk, tuple(transports))
+
+        status.start(10, "name")
+        status.add_succeed(2)
+        status.stop()
+        self.assertTrue(status.close(timeout=5))
+
+        for transport in transports:
+            self.assertEqual(transport.pins[10], "name")
+            self.assertEqual(transport.pins[12], "2/10")
+            self.assertEqual(transport.pins[15], 0)
+            self.assertTrue(transport.closed)
+
+        self.assertEqual(status.writes_sent, 2 * status.link.links[0].writes_sent)
+
+    def test_source_built_once(self):
+
+        transports = [MemoryTransport() for _ in range(3)]
+        status = RunStatus([BLYNK_AUTH, "other_auth", "third_auth"], transport=transports, history=True)
+        status.start(10, "name")
+
+        built = []
+        source = status._build_source
+        status._build_source = lambda: built.append(1) or source()
+
+        status.add_succeed()
+
+        # One build and one history sample for all the targets
+        self.assertEqual(len(built), 1)
+        self.assertEqual(len(status.history), 1)
+        status.flush(timeout=5)
+        for transport in transports:
+            self.assertEqual(transport.pins[2], "1/10")
+
+        self.assertTrue(status.close(timeout=5))
+
+    def test_stuck_target(self):
+
+        stuck = GatedTransport(gated=True, gate_writes=True)
+        healthy = MemoryTransport()
+        status = AppStatus(["stuck_auth", BLYNK_AUTH], transport=[stuck, healthy])
+
+        start = time.monotonic()
+        for value in range(100):
+            status.post_dict({1: value})
+
+        # The posts never wait for the stuck target
+        self.assertLess(time.monotonic() - start, 1)
+
+        with self.assertLogs("app_status", "WARNING"):
+            self.assertFalse(status.flush(timeout=0.2))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(healthy.pins[1], 99)
+
+        stats = status.stats()
+        self.assertEqual(stats["targets"][1]["writes_sent"], len(healthy.writes))
+
+        stuck.gate.set()
+        self.assertTrue(status.close(timeout=5))
+        self.assertEqual(stuck.pins[1], 99)
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            AppStatus([BLYNK_AUTH, "other_auth"], shared=True)
+
+        with self.assertRaises(ValueError):
+            AppStatus([BLYNK_AUTH, "other_auth"], transport=[MemoryTransport()])
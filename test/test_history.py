@@ -0,0 +1,86 @@
+import os
+import tempfile
+from array import array
+from unittest import TestCase
+
+from app_status import RunStatus
+from app_status.history import RunHistory
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def make_history(total, samples):
+    """
+    Build a history from (time, succeed, failed, blocked) samples
+    """
+
+    history = RunHistory()
+    history.start(total)
+    history.times = array("d", [sample[0] for sample in samples])
+    history.succeed = array("q", [sample[1] for sample in samples])
+    history.failed = array("q", [sample[2] for sample in samples])
+    history.blocked = array("q", [sample[3] for sample in samples])
+
+    return history
+
+
+class TestRunHistory(TestCase):
+
+    def test_recorded_by_run_status(self):
+
+        status = RunStatus(BLYNK_AUTH, transport=MemoryTransport(), history=True)
+        status.start(10, "name")
+        status.add_succeed()
+        status.add_failed(2)
+        status.update(blocked=1)
+        status.stop()
+
+        history = status.history
+        self.assertEqual(history.total, 10)
+        self.assertEqual([row[1:] for row in history.rows()],
+                         [(1, 0, 0), (1, 2, 0), (1, 2, 1), (1, 2, 1)])
+        self.assertEqual(list(history.times), sorted(history.times))
+
+        # A new run clears it
+        status.start(5)
+        self.assertEqual(len(history), 0)
+
+    def test_rate_eta(self):
+
+        history = make_history(100, [(1.0, 10, 0, 0), (2.0, 18, 2, 0), (4.0, 20, 4, 6)])
+
+        self.assertEqual(history.rate(), 7.5)
+        self.assertEqual(history.rate(window=2.0), 5.0)
+        self.assertEqual(history.eta(window=2.0), 14.0)
+        self.assertIsNone(RunHistory().eta())
+
+    def test_downsample(self):
+
+        history = make_history(100, [(t / 10, t, 0, 0) for t in range(1, 101)])
+        reduced = history.downsample(4)
+
+        self.assertEqual(list(reduced.times), [2.5, 5.0, 7.5, 10.0])
+        self.assertEqual(list(reduced.succeed), [25, 50, 75, 100])
+
+        with self.assertRaises(ValueError):
+            history.downsample(0)
+
+    def test_export(self):
+
+        history = make_history(100, [(0.5, 1, 0, 0), (1.5, 2, 1, 0)])
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "history.csv")
+            history.to_csv(path)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read().splitlines(), ["time,succeed,failed,blocked", "0.5,1,0,0", "1.5,2,1,0"])
+
+            path = os.path.join(folder, "history.bin")
+            history.save(path)
+            loaded = RunHistory.load(path)
+            self.assertEqual(list(loaded.rows()), list(history.rows()))
+            self.assertEqual((loaded.total, loaded.started), (history.total, history.started))
+
+            with self.assertRaises(ValueError):
+                RunHistory.load(os.path.join(folder, "history.csv"))
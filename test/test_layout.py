@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from app_status import RunDashboard, RunStatus, RunTree
+from app_status.layout import DEFAULT_LAYOUT, Layout
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestLayout(TestCase):
+
+    def test_validation(self):
+
+        with self.assertRaises(ValueError):
+            Layout({"name": 0, "led": 0})
+
+        with self.assertRaises(ValueError):
+            Layout({"name": 10})
+
+        with self.assertRaises(ValueError):
+            Layout({"unknown": 1})
+
+        with self.assertRaises(ValueError):
+            DEFAULT_LAYOUT.with_fields(rate=5)
+
+    def test_compile(self):
+
+        layout = Layout({"status_text": 2, "led": 0}, stride=4)
+        table = layout.compile(3)
+
+        self.assertEqual([pin for pin, _ in table.all], [14, 12])
+        self.assertEqual(table.led, 12)
+        self.assertIs(layout.compile(3), table)
+
+        self.assertEqual(DEFAULT_LAYOUT.max_runs(255), 26)
+        self.assertEqual(DEFAULT_LAYOUT.packed().stride, 6)
+        self.assertEqual(DEFAULT_LAYOUT.packed().max_runs(255), 42)
+
+    def test_run_status(self):
+
+        layout = Layout({"name": 0, "status_text": 1, "percent": 2}, stride=3,
+                        formatters={"percent": lambda model: "{:.0%}".format(model.test_run.actual / model.test_run.total)})
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, 2, transport=transport, layout=layout)
+
+        status.start(4, "name")
+        status.add_succeed()
+        status.stop()
+
+        self.assertEqual(transport.writes, [(6, "name"), (7, "0/4"), (8, "0%"), (7, "1/4"), (8, "25%"),
+                                            (7, "1/4"), (8, "25%")])
+
+    def test_packed_dashboard(self):
+
+        transport = MemoryTransport()
+        dashboard = RunDashboard(BLYNK_AUTH, max_run=42, layout=DEFAULT_LAYOUT.packed(), transport=transport)
+
+        dashboard.start(41, 10, "last")
+        self.assertEqual(transport.pins[246], "last")
+        self.assertEqual(transport.pins[251], 255)
+
+        with self.assertRaises(ValueError):
+            RunDashboard(BLYNK_AUTH, max_run=43, layout=DEFAULT_LAYOUT.packed(), transport=transport)
+
+    def test_rate_fields(self):
+
+        layout = DEFAULT_LAYOUT.with_fields(rate=6, eta=7)
+        self.assertTrue(layout.has_rate)
+        self.assertFalse(DEFAULT_LAYOUT.has_rate)
+
+        transport = MemoryTransport()
+        dashboard = RunDashboard(BLYNK_AUTH, transport=transport, layout=layout)
+        dashboard.start(0, 10)
+        dashboard.add_many({0: (1, 0, 0)})
+        self.assertIsInstance(transport.pins[6], float)
+        self.assertIsInstance(transport.pins[7], str)
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, layout=layout)
+        status.start(10)
+        status.add_succeed()
+        self.assertIsInstance(transport.pins[6], float)
+        status.stop()
+
+        with self.assertRaises(ValueError):
+            RunTree(BLYNK_AUTH, transport=MemoryTransport(), layout=layout)
@@ -0,0 +1,169 @@
+import subprocess
+import sys
+import time
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+import blynklib
+
+from app_status import AppStatus, RunStatus
+from app_status.link import BACKGROUND, LAZY, ConnectionPool, Link, POOL
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH, FakeBlink, GatedTransport
+
+
+class TestConnectionPool(TestCase):
+
+    def test_acquire_release(self):
+
+        blynklib.Blynk = Mock(side_effect=lambda key: FakeBlink())
+        pool = ConnectionPool()
+
+        link_a = pool.acquire(BLYNK_AUTH)
+        link_b = pool.acquire(BLYNK_AUTH)
+        link_c = pool.acquire("other_auth")
+
+        self.assertIs(link_a, link_b)
+        self.assertIsNot(link_a, link_c)
+        self.assertEqual(blynklib.Blynk.call_count, 2)
+
+        self.assertFalse(pool.release(link_a))
+        self.assertTrue(pool.release(link_b))
+        self.assertEqual(len(pool), 1)
+
+        with self.assertRaises(ValueError):
+            pool.release(link_a)
+
+    def test_options_mismatch(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        pool = ConnectionPool()
+
+        pool.acquire(BLYNK_AUTH, delta=True)
+
+        with self.assertRaises(ValueError):
+            pool.acquire(BLYNK_AUTH, delta=False)
+
+
+class TestSharedRunStatus(TestCase):
+
+    def test_merged_batch(self):
+
+        blynklib.Blynk = Mock(side_effect=lambda key: FakeBlink())
+        status = [RunStatus(BLYNK_AUTH, i, shared=True, flush_interval_ms=60000) for i in range(2)]
+
+        # One connection for the two runs
+        blynklib.Blynk.assert_called_once_with(BLYNK_AUTH)
+        self.assertIs(status[0].blynk, status[1].blynk)
+
+        blynk = status[0].blynk
+        blynk.virtual_write = Mock(return_value=None)
+        blynk.run = Mock(return_value=None)
+
+        status[0].start(10, "run 0")
+        status[1].start(10, "run 1")
+        status[0].add_succeed()
+        status[1].add_failed()
+        blynk.virtual_write.reset_mock()
+        blynk.run.reset_mock()
+
+        # The pending values of both runs are sent by a single flush
+        status[0].flush()
+
+        blynk.virtual_write.assert_has_calls([call(10, "run 1"), call(2, "1/10"), call(12, "1/10")], any_order=True)
+        blynk.run.assert_called_once()
+
+        for run in status:
+            run.close()
+
+        self.assertEqual(len(POOL), 0)
+
+    def test_close_not_shared(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = AppStatus(BLYNK_AUTH)
+
+        self.assertIsInstance(status.link, Link)
+        self.assertTrue(status.close())
+        self.assertTrue(status.close())
+
+
+class TestTrailingFlush(TestCase):
+
+    def test_idle_run(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, flush_interval_ms=100)
+
+        status.start(10, "name")
+        status.add_succeed()
+        status.add_succeed()
+        self.assertEqual(transport.pins[2], "0/10")
+
+        # No more post, the last values are sent at the end of the interval
+        time.sleep(0.3)
+        self.assertEqual(transport.pins[2], "2/10")
+        self.assertEqual(status.stats()["pending"], 0)
+        self.assertTrue(status.close())
+
+    def test_idle_adaptive(self):
+
+        transport = MemoryTransport()
+        status = AppStatus(BLYNK_AUTH, transport=transport, adaptive=True, background=True)
+
+        for value in range(5):
+            status.post_dict({1: value})
+
+        time.sleep(0.2)
+        self.assertEqual(transport.pins[1], 4)
+        self.assertTrue(status.close())
+
+
+class TestConnect(TestCase):
+
+    def test_lazy(self):
+
+        transport = GatedTransport()
+        status = AppStatus(BLYNK_AUTH, transport=transport, connect=LAZY)
+
+        self.assertEqual(transport.runs, 0)
+        self.assertFalse(status.link.connected())
+
+        status.post_dict({1: "1"})
+
+        # Connected, then synced
+        self.assertEqual(transport.runs, 2)
+        self.assertEqual(transport.writes, [(1, "1")])
+        self.assertTrue(status.close())
+
+    def test_background(self):
+
+        transport = GatedTransport(gated=True)
+        status = AppStatus(BLYNK_AUTH, transport=transport, connect=BACKGROUND, delta=True)
+
+        # Early posts are coalesced until the connection is ready
+        status.post_dict({1: "a", 2: "b"})
+        status.post_dict({1: "c"})
+        self.assertFalse(status.flush(timeout=0.01))
+        self.assertEqual(transport.writes, [])
+        self.assertEqual(status.stats()["pending"], 2)
+
+        transport.gate.set()
+        self.assertTrue(status.flush(timeout=5))
+        status.post_dict({2: "d"})
+
+        self.assertEqual(transport.writes, [(1, "c"), (2, "b"), (2, "d")])
+        self.assertTrue(status.close())
+
+    def test_unknown_mode(self):
+
+        with self.assertRaises(ValueError):
+            Link(MemoryTransport(), connect="later")
+
+    def test_lazy_import(self):
+
+        code = "import sys, app_status; print('blynklib' in sys.modules, 'asyncio' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(output.stdout.split(), ["False", "False"])
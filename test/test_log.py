@@ -0,0 +1,49 @@
+import logging
+from unittest import TestCase
+from unittest.mock import patch
+
+from app_status import RunStatus
+from app_status.log import LOGGER, enable_event_log
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestEventLog(TestCase):
+
+    def tearDown(self):
+
+        for handler in list(LOGGER.handlers):
+            if not isinstance(handler, logging.NullHandler):
+                LOGGER.removeHandler(handler)
+        LOGGER.setLevel(logging.NOTSET)
+
+    def test_events(self):
+
+        events = enable_event_log(capacity=2)
+        status = RunStatus(BLYNK_AUTH, 2, transport=MemoryTransport())
+
+        status.start(10, "name")
+        status.add_failed()
+        status.stop()
+
+        # Ring buffer, the start has been discarded
+        logged = events.events()
+        self.assertEqual([event["level"] for event in logged], ["DEBUG", "INFO"])
+        self.assertEqual(logged[0]["message"], "Update run 2: {} 1/10 with 0S - 1F - 0B".format(status.test_run.date))
+        self.assertEqual(logged[0]["failed"], 1)
+        self.assertEqual(logged[1]["run_name"], "name")
+
+    def test_disabled_update(self):
+
+        LOGGER.setLevel(logging.INFO)
+        events = enable_event_log(level=logging.INFO)
+        status = RunStatus(BLYNK_AUTH, transport=MemoryTransport())
+        status.start(10, "name")
+
+        # The update record is not built at all
+        with patch.object(RunStatus, "_log_fields") as fields:
+            status.add_succeed()
+            fields.assert_not_called()
+
+        self.assertEqual(len(events.events()), 1)
@@ -0,0 +1,67 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from app_status import AppStatus, RunStatus
+from app_status.metrics import Metrics
+from app_status.sender import DROP_OLDEST
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH, GatedTransport
+
+
+class TestMetrics(TestCase):
+
+    def test_disabled(self):
+
+        status = AppStatus(BLYNK_AUTH, delta=True, transport=MemoryTransport())
+        status.post_dict({1: "a"})
+        status.post_dict({1: "a"})
+
+        self.assertIsNone(status.metrics)
+        self.assertEqual(status.stats(), {"writes_sent": 1, "writes_saved": 1, "pending": 0,
+                                          "queue_depth": 0, "dropped": 0, "spooled": 0})
+
+    def test_run_status(self):
+
+        hook = Mock()
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, metrics=Metrics(hook))
+
+        status.start(10, "name")
+        status.add_succeed()
+        status.stop()
+
+        stats = status.stats()
+        counters = stats["counters"]
+        timers = stats["timers"]
+
+        self.assertEqual(counters["writes"], 6 + 4 + 4)
+        self.assertEqual(counters["bytes"], transport.bytes_sent)
+        self.assertEqual(counters["flushes"], 3)
+        self.assertEqual(counters["reconnects"], 0)
+        for phase in Metrics.PHASES:
+            self.assertEqual(timers[phase]["count"], 3)
+            self.assertGreaterEqual(timers[phase]["max_us"], timers[phase]["mean_us"])
+
+        hook.assert_any_call("writes", 4)
+        hook.assert_any_call("flushes", 1)
+
+    def test_drops(self):
+
+        transport = GatedTransport()
+        status = AppStatus(BLYNK_AUTH, transport=transport, metrics=True,
+                           background=True, queue_size=1, policy=DROP_OLDEST)
+        transport.gate.clear()
+        transport.syncing.clear()
+
+        status.post_dict({1: 0})
+        transport.syncing.wait(5)
+        for value in range(1, 4):
+            status.post_dict({1: value})
+
+        transport.gate.set()
+        status.close(5)
+
+        self.assertIsInstance(status.metrics, Metrics)
+        self.assertEqual(status.stats()["counters"]["drops"], 2)
+        self.assertEqual(transport.pins[1], 3)
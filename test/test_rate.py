@@ -0,0 +1,123 @@
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from app_status import RunStatus
+from app_status.rate import RateEstimator, format_duration
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestRateEstimator(TestCase):
+
+    def test_rate(self):
+
+        rate = RateEstimator(half_life=10.0)
+        rate.reset(now=0.0)
+
+        self.assertIsNone(rate.eta(100, now=0.0))
+        self.assertEqual(rate.update(10, now=1.0), 10.0)
+
+        # A half life later, the rate is half way to the new one
+        self.assertEqual(rate.update(30, now=11.0), 6.0)
+        self.assertEqual(rate.eta(60, now=11.0), 10.0)
+        self.assertAlmostEqual(rate.average(), 30 / 11)
+
+        # Same tick, counted with the next update
+        self.assertEqual(rate.update(31, now=11.0), 6.0)
+
+    def test_dropped(self):
+
+        rate = RateEstimator(half_life=1.0)
+        rate.reset(now=0.0)
+
+        rate.update(100, now=0.5)
+        self.assertFalse(rate.dropped(now=0.5))
+
+        rate.update(200, now=1.0)
+        rate.update(201, now=5.0)
+        self.assertTrue(rate.dropped(now=5.0))
+
+        with self.assertRaises(ValueError):
+            RateEstimator(half_life=0)
+
+    def test_stall(self):
+
+        rate = RateEstimator(half_life=1.0)
+        rate.reset(now=0.0)
+        rate.update(100, now=1.0)
+
+        # Nothing counted since, the rate decays
+        self.assertEqual(rate.rate_at(1.0), 100.0)
+        self.assertEqual(rate.rate_at(3.0), 25.0)
+        self.assertEqual(rate.eta(50, now=3.0), 2.0)
+        self.assertFalse(rate.dropped(now=3.0))
+        self.assertTrue(rate.dropped(now=5.0))
+
+    def test_format_duration(self):
+
+        self.assertEqual(format_duration(None), "--:--:--")
+        self.assertEqual(format_duration(59.6), "0:01:00")
+        self.assertEqual(format_duration(6 * 3600 + 62), "6:01:02")
+
+
+class TestRunStatusRate(TestCase):
+
+    @patch("app_status.rate.time.monotonic")
+    def test_published(self, monotonic):
+
+        monotonic.return_value = 0.0
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, 1, transport=transport, rate_half_life=10.0, rate_pins=(6, 8))
+
+        status.start(1000, "name")
+        self.assertEqual(transport.pins[16], 0.0)
+        self.assertEqual(transport.pins[18], "--:--:--")
+
+        monotonic.return_value = 2.0
+        status.add_succeed(10)
+
+        self.assertEqual(transport.pins[16], 5.0)
+        self.assertEqual(transport.pins[18], "0:03:18")
+
+        for step in range(2, 11):
+            monotonic.return_value = step * 2.0
+            status.add_succeed(10)
+        self.assertEqual(transport.pins[15], 255)
+
+        # Throughput drop, the led is dimmed
+        monotonic.return_value = 60.0
+        status.add_failed()
+        self.assertEqual(transport.pins[15], RunStatus.LED_DROP)
+        status.stop()
+
+    @patch("app_status.rate.time.monotonic")
+    def test_refreshed(self, monotonic):
+
+        monotonic.return_value = 0.0
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, 1, transport=transport, rate_half_life=10.0, rate_refresh=0.02)
+
+        status.start(1000, "name")
+        monotonic.return_value = 20.0
+        status.add_succeed(100)
+        self.assertEqual(transport.pins[16], 5.0)
+        self.assertEqual(transport.pins[15], 255)
+
+        # Stalled, the decayed rate and the dimmed led are published without new count
+        monotonic.return_value = 50.0
+        time.sleep(0.2)
+        self.assertEqual(transport.pins[16], 0.62)
+        self.assertEqual(transport.pins[17], "0:24:00")
+        self.assertEqual(transport.pins[15], RunStatus.LED_DROP)
+
+        status.stop()
+        status.close()
+        self.assertEqual(transport.pins[15], 0)
+
+    def test_invalid_pins(self):
+
+        for pins in ((6, 6), (5, 6), (6, 10), (6,)):
+            with self.assertRaises(ValueError):
+                RunStatus(BLYNK_AUTH, transport=MemoryTransport(), rate_half_life=10.0, rate_pins=pins)
@@ -0,0 +1,77 @@
+import time
+from unittest import TestCase
+
+from app_status import AppStatus
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class Worker:
+    def __init__(self):
+        self.done = 0
+
+
+class TestSampler(TestCase):
+
+    def setUp(self):
+
+        self.transport = MemoryTransport()
+        self.status = AppStatus(BLYNK_AUTH, transport=self.transport)
+        self.sampler = self.status.sampler(interval=0.01)
+
+    def test_sample_changed(self):
+
+        worker = Worker()
+        queue = [1, 2]
+        self.sampler.register(1, lambda: len(queue))
+        self.sampler.register_attribute(2, worker, "done", fmt="{} jobs")
+        self.sampler.register(3, lambda: None)
+
+        self.assertEqual(self.sampler.sample(), 2)
+        self.assertEqual(self.transport.writes, [(1, 2), (2, "0 jobs")])
+
+        worker.done += 5
+        self.transport.clear()
+        self.assertEqual(self.sampler.sample(), 1)
+        self.assertEqual(self.transport.writes, [(2, "5 jobs")])
+
+        self.sampler.unregister(2)
+        worker.done += 1
+        self.assertEqual(self.sampler.sample(), 0)
+
+    def test_failing_getter(self):
+
+        self.sampler.register(1, lambda: 1 / 0)
+        self.sampler.register(2, lambda: 2)
+
+        with self.assertLogs("app_status", "WARNING"):
+            self.assertEqual(self.sampler.sample(), 1)
+
+    def test_background(self):
+
+        worker = Worker()
+        self.sampler.register_attribute(1, worker, "done")
+
+        with self.sampler:
+            for _ in range(3):
+                worker.done += 1
+                time.sleep(0.03)
+            worker.done += 1
+
+        # The final value is published on stop
+        self.assertEqual(self.transport.pins[1], 4)
+        self.assertLessEqual(len(self.transport.writes), 5)
+
+    def test_invalid_pin(self):
+
+        self.sampler.register(1, int)
+
+        with self.assertRaises(ValueError):
+            self.sampler.register(1, int)
+
+        with self.assertRaises(ValueError):
+            self.sampler.register(256, int)
+
+        with self.assertRaises(ValueError):
+            self.status.sampler(interval=0)
@@ -0,0 +1,137 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+import blynklib
+
+from app_status import AppStatus
+from app_status.sender import Sender, BLOCK, DROP_OLDEST, COALESCE
+
+from .test_app_status import BLYNK_AUTH, FakeBlink
+
+
+class GatedWrite:
+    """
+    Write callable blocked until the gate is opened
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.batches = []
+
+    def __call__(self, batch, force):
+        self.started.set()
+        self.gate.wait(5)
+        self.batches.append(batch)
+
+
+class TestSender(TestCase):
+
+    def test_block(self):
+
+        write = GatedWrite()
+        sender = Sender(write, maxsize=1, policy=BLOCK)
+
+        sender.put({1: "a"})
+        write.started.wait(5)
+        sender.put({1: "b"})
+
+        # Queue is full, the producer waits for the writer
+        producer = threading.Thread(target=sender.put, args=({1: "c"},))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+
+        write.gate.set()
+        producer.join(5)
+
+        self.assertTrue(sender.close(5))
+        self.assertEqual(write.batches, [{1: "a"}, {1: "b"}, {1: "c"}])
+
+    def test_drop_oldest(self):
+
+        write = GatedWrite()
+        sender = Sender(write, maxsize=2, policy=DROP_OLDEST)
+
+        sender.put({1: "a"})
+        write.started.wait(5)
+        for value in "bcd":
+            sender.put({1: value})
+
+        self.assertEqual(sender.dropped, 1)
+        self.assertEqual(sender.depth, 2)
+
+        write.gate.set()
+        self.assertTrue(sender.close(5))
+        self.assertEqual(write.batches, [{1: "a"}, {1: "c"}, {1: "d"}])
+
+    def test_coalesce(self):
+
+        write = GatedWrite()
+        sender = Sender(write, policy=COALESCE)
+
+        sender.put({1: "a"})
+        write.started.wait(5)
+        sender.put({1: "b", 2: "x"})
+        sender.put({1: "c"})
+
+        write.gate.set()
+        self.assertTrue(sender.flush(5))
+        self.assertEqual(write.batches, [{1: "a"}, {1: "c", 2: "x"}])
+        sender.close(5)
+
+    def test_flush_timeout(self):
+
+        write = GatedWrite()
+        sender = Sender(write)
+
+        sender.put({1: "a"})
+
+        self.assertFalse(sender.flush(0.01))
+
+        write.gate.set()
+        self.assertTrue(sender.close(5))
+
+    def test_write_error(self):
+
+        write = Mock(side_effect=[OSError("down"), None])
+        sender = Sender(write)
+
+        sender.put({1: "a"})
+        sender.put({1: "b"})
+
+        self.assertTrue(sender.close(5))
+        self.assertEqual(sender.errors, 1)
+        self.assertIsInstance(sender.last_error, OSError)
+        write.assert_has_calls([call({1: "a"}, False), call({1: "b"}, False)])
+
+    def test_closed(self):
+
+        sender = Sender(Mock())
+        sender.close(5)
+
+        with self.assertRaises(RuntimeError):
+            sender.put({1: "a"})
+
+    def test_unknown_policy(self):
+
+        with self.assertRaises(ValueError):
+            Sender(Mock(), policy="lossy")
+
+
+class TestAppStatusBackground(TestCase):
+
+    def test_post_dict(self):
+
+        blynklib.Blynk = Mock(return_value=FakeBlink())
+        status = AppStatus(BLYNK_AUTH, background=True)
+
+        status.blynk.virtual_write = Mock(return_value=None)
+        status.blynk.run = Mock(return_value=None)
+
+        status.post_dict({1: "1", 2: "2"})
+
+        self.assertTrue(status.close(5))
+        status.blynk.virtual_write.assert_has_calls([call(1, "1"), call(2, "2")])
+        status.blynk.run.assert_called()
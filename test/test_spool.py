@@ -0,0 +1,215 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import blynklib
+from blynklib import Blynk
+
+from app_status import AppStatus, RunStatus
+from app_status.link import Link
+from app_status.spool import Spool
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class FlakyTransport(MemoryTransport):
+    """
+    Memory transport that can go offline
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.online = True
+        self.attempts = 0
+
+    def connected(self):
+        return self.online
+
+    def run(self):
+        if not self.online:
+            self.attempts += 1
+        super().run()
+
+
+class SocketBlynk(Blynk):
+    """
+    blynklib connection on a mock socket, which stays connected until dropped
+    """
+
+    RETRIES_TX_DELAY = 0
+
+    def __init__(self):
+        super().__init__(BLYNK_AUTH)
+        self._state = self.AUTHENTICATED
+        self._socket = Mock()
+        self.drop = False
+
+    def run(self):
+        if self.drop:
+            self._state = self.DISCONNECTED
+
+    def link(self, **options) -> Link:
+        """
+        Open a link on it, the other tests replace the blynklib class by a mock
+        """
+
+        with patch.object(blynklib, "Blynk", Blynk):
+            return Link(self, **options)
+
+
+class TestSpool(TestCase):
+
+    def setUp(self):
+
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "status.spool")
+
+    def tearDown(self):
+
+        self.folder.cleanup()
+
+    def test_compact_and_reload(self):
+
+        spool = Spool(self.path)
+        spool.COMPACT_LINES = 3
+        spool.append({1: "a", 2: 2})
+        spool.append({1: "b", 3: 1.5})
+        spool.close()
+
+        # Compacted to one line per pin
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 3)
+
+        # A crash cut the last line
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('[4, "cu')
+
+        spool = Spool(self.path)
+        self.assertEqual(spool.pending(), {1: "b", 2: 2, 3: 1.5})
+
+        spool.clear()
+        spool.close()
+        self.assertEqual(len(Spool(self.path)), 0)
+
+    def test_offline_replay(self):
+
+        transport = FlakyTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport, spool=self.path)
+        status.start(10, "name")
+        status.flush()
+
+        transport.online = False
+        transport.clear()
+        for _ in range(5):
+            status.add_succeed()
+        status.flush()
+
+        # Spooled, with a single reconnection attempt
+        self.assertEqual(transport.writes, [])
+        self.assertEqual(transport.attempts, 1)
+        self.assertEqual(status.stats()["spooled"], 4)
+
+        transport.online = True
+        status.add_failed()
+        status.flush()
+
+        # The spool is replayed with the latest values only
+        self.assertEqual(transport.writes, [(2, "6/10"), (3, 60.0), (4, "S5 F1 B0"), (5, 255)])
+        self.assertEqual(status.stats()["spooled"], 0)
+
+    def test_failed_batch(self):
+
+        transport = MemoryTransport()
+        transport.write_batch = Mock(return_value=False)
+        status = AppStatus(BLYNK_AUTH, transport=transport, spool=self.path)
+
+        with self.assertLogs("app_status", "WARNING"):
+            status.post_dict({1: "a", 2: "b"})
+            status.flush()
+
+        # Spooled and replayed once the batches are written again
+        self.assertEqual(status.stats()["spooled"], 2)
+
+        del transport.write_batch
+        status.post_dict({2: "c"})
+        status.flush()
+        self.assertEqual(transport.pins, {1: "a", 2: "c"})
+        self.assertEqual(status.stats()["spooled"], 0)
+
+    def test_silent_socket_error(self):
+
+        blynk = SocketBlynk()
+        link = blynk.link(delta=True, spool=self.path)
+
+        # blynklib retries the write and returns None, still connected
+        blynk._socket.send.side_effect = OSError
+        with self.assertLogs("app_status", "WARNING"):
+            link.post({1: "a", 2: "b"})
+            self.assertTrue(link.flush(5))
+
+        self.assertEqual(link.spool.pending(), {1: "a", 2: "b"})
+        self.assertEqual(link.last_sent, {})
+
+        blynk._socket.send.side_effect = None
+        link.post({2: "c"})
+        self.assertTrue(link.flush(5))
+        self.assertEqual(link.last_sent, {1: "a", 2: "c"})
+        self.assertEqual(len(link.spool), 0)
+        link.close(5)
+
+    def test_dropped_in_sync(self):
+
+        blynk = SocketBlynk()
+        link = blynk.link(delta=True)
+
+        # The sync finds the connection lost after the write
+        blynk.drop = True
+        link.post({1: "a"})
+        self.assertEqual(link.last_sent, {})
+
+        # Sent again once reconnected, not skipped as unchanged
+        blynk.drop = False
+        blynk._state = blynk.AUTHENTICATED
+        link.post({1: "a"})
+        self.assertEqual(blynk._socket.send.call_count, 2)
+        self.assertEqual(link.last_sent, {1: "a"})
+        link.close()
+
+    def test_reconnect_off_caller(self):
+
+        transport = FlakyTransport()
+        status = AppStatus(BLYNK_AUTH, transport=transport, spool=self.path)
+        self.assertIsNotNone(status.sender)
+
+        # A reconnection as slow as the blynklib connection loop
+        transport.online = False
+        transport.run = Mock(side_effect=lambda: time.sleep(0.5))
+
+        start = time.monotonic()
+        for value in range(10):
+            status.post_dict({1: value})
+        self.assertLess(time.monotonic() - start, 0.2)
+
+        self.assertTrue(status.flush(5))
+        self.assertEqual(status.link.spool.pending(), {1: 9})
+        status.close(5)
+
+    def test_replay_after_restart(self):
+
+        transport = FlakyTransport()
+        transport.online = False
+        status = AppStatus(BLYNK_AUTH, transport=transport, spool=self.path)
+        status.post_dict({1: "final"})
+
+        self.assertFalse(status.close())
+
+        # Next process
+        transport = MemoryTransport()
+        link = Link(transport, spool=self.path)
+        link.flush()
+
+        self.assertEqual(transport.writes, [(1, "final")])
+        link.close()
@@ -0,0 +1,159 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+from app_status import RunStatus
+from app_status.pytest_plugin import StatusReporter
+from app_status.server import LocalServer
+from app_status.testing import StatusTestRunner, open_run_status
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def sample_case():
+    """
+    Test case with every outcome, built on demand so that it is not collected
+    """
+
+    class Sample(TestCase):
+
+        def test_pass(self):
+            pass
+
+        def test_fail(self):
+            self.fail()
+
+        def test_error(self):
+            raise RuntimeError()
+
+        @unittest.skip("skipped")
+        def test_skip(self):
+            pass
+
+        def test_sub_tests(self):
+            for value in range(3):
+                with self.subTest(value=value):
+                    self.assertEqual(value, 0)
+
+    return Sample
+
+
+SAMPLE_TESTS = """
+import pytest
+
+def test_pass():
+    pass
+
+def test_fail():
+    assert False
+
+@pytest.mark.skip
+def test_skip():
+    pass
+
+@pytest.fixture
+def broken():
+    raise RuntimeError()
+
+def test_error(broken):
+    pass
+"""
+
+
+class TestStatusTestRunner(TestCase):
+
+    def test_run(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, transport=transport)
+        runner = StatusTestRunner(status, name="sample", stream=open(os.devnull, "w"))
+
+        self.addCleanup(runner.stream.stream.close)
+        result = runner.run(unittest.defaultTestLoader.loadTestsFromTestCase(sample_case()))
+
+        self.assertEqual(result.testsRun, 5)
+        self.assertEqual(transport.pins[0], "sample")
+        self.assertEqual(transport.pins[2], "5/5")
+        self.assertEqual(transport.pins[4], "S1 F2 B2")
+        self.assertEqual(transport.pins[5], 0)
+        self.assertTrue(transport.closed)
+
+    def test_unreachable_server(self):
+
+        status = open_run_status(BLYNK_AUTH, server="127.0.0.1:1")
+        runner = StatusTestRunner(status, timeout=0.5, stream=open(os.devnull, "w"))
+        self.addCleanup(runner.stream.stream.close)
+
+        start = time.monotonic()
+        with self.assertLogs("app_status", "WARNING"):
+            result = runner.run(unittest.defaultTestLoader.loadTestsFromTestCase(sample_case()))
+
+        # The final status is dropped instead of holding the end of the run
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(result.testsRun, 5)
+
+
+class TestStatusReporter(TestCase):
+
+    def test_xdist_controller(self):
+
+        status = Mock()
+        reporter = StatusReporter(status, "xdist")
+
+        # No tests collected on the controller
+        reporter.pytest_collection_finish(Mock(items=[]))
+        reporter.pytest_xdist_node_collection_finished(Mock(), ["a", "b", "c"])
+        reporter.pytest_xdist_node_collection_finished(Mock(), ["a", "b", "c"])
+        status.start.assert_called_once_with(3, "xdist")
+
+        reporter.pytest_runtest_logreport(Mock(when="setup", passed=True))
+        reporter.pytest_runtest_logreport(Mock(when="call", passed=True))
+        reporter.pytest_runtest_logreport(Mock(when="setup", passed=False))
+        reporter.pytest_runtest_logreport(Mock(when="call", passed=False, failed=True))
+        reporter.pytest_runtest_logreport(Mock(when="teardown", passed=False))
+
+        status.add_succeed.assert_called_once_with()
+        status.add_blocked.assert_called_once_with()
+        status.add_failed.assert_called_once_with()
+
+    def test_pytest_session(self):
+
+        with LocalServer() as server, tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "test_sample.py"), "w", encoding="utf-8") as file:
+                file.write(SAMPLE_TESTS)
+
+            command = [sys.executable, "-m", "pytest", "-q", "-p", "app_status.pytest_plugin",
+                       "-p", "no:cacheprovider", "--app-status", BLYNK_AUTH, "--app-status-name", "session",
+                       "--app-status-server", "{}:{}".format(*server.address), folder]
+            output = subprocess.run(command, capture_output=True, text=True, check=False)
+            self.assertIn("1 failed, 1 passed, 1 skipped, 1 error", output.stdout)
+
+            # Let the server read the last writes
+            time.sleep(0.1)
+            values = server.values(BLYNK_AUTH)
+
+        self.assertEqual(values[0], "session")
+        self.assertEqual(values[2], "4/4")
+        self.assertEqual(values[4], "S1 F1 B2")
+        self.assertEqual(values[5], "0")
+
+    def test_pytest_unreachable_server(self):
+
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "test_sample.py"), "w", encoding="utf-8") as file:
+                file.write(SAMPLE_TESTS)
+
+            command = [sys.executable, "-m", "pytest", "-q", "-p", "app_status.pytest_plugin",
+                       "-p", "no:cacheprovider", "--app-status", BLYNK_AUTH, "--app-status-server", "127.0.0.1:1",
+                       "--app-status-timeout", "0.5", folder]
+            start = time.monotonic()
+            output = subprocess.run(command, capture_output=True, text=True, check=False, timeout=60)
+
+        self.assertIn("1 failed, 1 passed, 1 skipped, 1 error", output.stdout)
+        self.assertLess(time.monotonic() - start, 10)
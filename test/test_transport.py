@@ -0,0 +1,104 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from app_status import AppStatus, RunStatus
+from app_status.server import LocalServer
+from app_status.transport import BlynkTransport, FileTransport, MemoryTransport, UdpTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestMemoryTransport(TestCase):
+
+    def test_run_status(self):
+
+        transport = MemoryTransport()
+        status = RunStatus(BLYNK_AUTH, 1, transport=transport)
+
+        status.start(10, "name")
+        status.add_failed()
+        status.stop()
+
+        self.assertIs(status.blynk, transport)
+        self.assertEqual(transport.pins[10], "name")
+        self.assertEqual(transport.pins[12], "1/10")
+        self.assertEqual(transport.pins[15], 0)
+        # Connection, start, update and stop
+        self.assertEqual(transport.syncs, 4)
+        self.assertGreater(transport.bytes_sent, 0)
+
+        status.close()
+        self.assertTrue(transport.closed)
+
+
+class TestFileTransport(TestCase):
+
+    def test_post_dict(self):
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "status.log")
+
+            status = AppStatus(BLYNK_AUTH, transport=FileTransport(path))
+            status.post_dict({1: "a", 2: 3.5})
+            status.close()
+
+            with open(path, encoding="utf-8") as file:
+                lines = [line.rstrip("\n").split("\t")[1:] for line in file]
+
+        self.assertEqual(lines, [["1", "a"], ["2", "3.5"]])
+
+
+class TestLocalServer(TestCase):
+
+    def test_tcp(self):
+
+        with LocalServer(tokens=[BLYNK_AUTH]) as server:
+            host, port = server.address
+            status = RunStatus(BLYNK_AUTH, transport=BlynkTransport(BLYNK_AUTH, server=host, port=port))
+
+            self.assertTrue(status.blynk.connected())
+
+            status.start(10, "name")
+            status.add_succeed(3)
+            status.stop()
+
+            self.assertTrue(wait_for(lambda: server.values(BLYNK_AUTH).get(5) == "0"))
+            values = server.values(BLYNK_AUTH)
+            status.close()
+
+        self.assertEqual(values[0], "name")
+        self.assertEqual(values[2], "3/10")
+        self.assertEqual(values[4], "S3 F0 B0")
+        self.assertEqual(server.stats()["connections"], 1)
+        self.assertGreater(server.stats()["bytes_received"], 0)
+
+    def test_tcp_invalid_token(self):
+
+        with LocalServer(tokens=["other"]) as server:
+            host, port = server.address
+            transport = BlynkTransport(BLYNK_AUTH, server=host, port=port)
+            transport._CONNECT_TIMEOUT = 0
+            transport.RECONNECT_SLEEP = 0
+
+            self.assertFalse(transport.connect(timeout=0))
+            transport.close()
+
+    def test_udp(self):
+
+        with LocalServer(udp=True) as server:
+            status = AppStatus(BLYNK_AUTH, transport=UdpTransport(BLYNK_AUTH, server.address))
+            status.post_dict({1: "a", 2: 3})
+            status.close()
+
+            self.assertTrue(wait_for(lambda: server.stats()["writes"] == 2))
+
+        self.assertEqual(server.values(BLYNK_AUTH), {1: "a", 2: "3"})
@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+from app_status import RunTree
+from app_status.transport import MemoryTransport
+
+from .test_app_status import BLYNK_AUTH
+
+
+class TestRunTree(TestCase):
+
+    def setUp(self):
+
+        self.transport = MemoryTransport()
+        self.tree = RunTree(BLYNK_AUTH, transport=self.transport)
+
+        self.suite = self.tree.node("suite", run_id=1)
+        self.module_a = self.tree.node("module a", parent=self.suite, total=6)
+        self.module_b = self.tree.node("module b", parent=self.suite, total=4)
+        # Counted only
+        self.other = self.tree.node("other", total=10)
+
+        self.tree.start("campaign")
+        self.transport.clear()
+
+    def test_start(self):
+
+        tree = RunTree(BLYNK_AUTH, transport=self.transport)
+        tree.node("suite", total=5)
+        tree.start("campaign")
+
+        self.assertEqual(self.transport.writes[:2], [(0, "campaign"), (1, tree.root.test_run.date)])
+        self.assertEqual(self.transport.pins[2], "0/5")
+
+    def test_roll_up(self):
+
+        self.tree.add(self.module_a, succeed=2)
+        self.tree.add(self.module_b, failed=1)
+        self.tree.add(self.other, blocked=3)
+
+        self.assertEqual(self.suite.test_run.total, 10)
+        self.assertEqual((self.suite.test_run.actual, self.suite.test_run.failed), (3, 1))
+        self.assertEqual((self.tree.root.test_run.total, self.tree.root.test_run.actual), (20, 6))
+        self.assertEqual(self.module_a.depth, 2)
+
+        # Nothing is sent before the publish
+        self.assertEqual(self.transport.writes, [])
+
+        self.assertEqual(self.tree.publish(), 2)
+        self.assertEqual(self.transport.writes,
+                         [(12, "3/10"), (13, 30.0), (14, "S2 F1 B0"),
+                          (2, "6/20"), (3, 30.0), (4, "S2 F1 B3")])
+
+        # Unchanged runs are not sent again
+        self.assertEqual(self.tree.publish(), 0)
+
+    def test_add_without_total(self):
+
+        with self.assertRaises(ValueError):
+            self.tree.add(self.tree.node("empty"), succeed=1)
+
+    def test_bind(self):
+
+        self.tree.bind(self.other, 1)
+        self.assertIsNone(self.suite.app_id)
+
+        self.tree.add(self.module_a, succeed=1)
+        self.tree.publish()
+
+        # Only the block of the new run is sent in full, the unbound run is not sent
+        self.assertEqual(self.transport.writes,
+                         [(10, "other"), (11, self.other.test_run.date), (12, "0/10"), (13, 0.0),
+                          (14, "S0 F0 B0"), (15, 255), (2, "1/20"), (3, 5.0), (4, "S1 F0 B0")])
+
+        with self.assertRaises(ValueError):
+            self.tree.bind(self.other, 26)
+
+    def test_late_total(self):
+
+        # A bound run without tests is sent once it has some
+        node = self.tree.node("late", run_id=2)
+        self.assertEqual(self.tree.publish(), 0)
+
+        self.tree.node("module", parent=node, total=2)
+        self.tree.publish()
+        self.assertEqual(self.transport.pins[20], "late")
+        self.assertEqual(self.transport.pins[22], "0/2")
+
+    def test_stop(self):
+
+        self.tree.add(self.module_b, succeed=4)
+        self.tree.stop()
+
+        self.assertEqual(self.transport.pins[12], "4/10")
+        self.assertEqual((self.transport.pins[5], self.transport.pins[15]), (0, 0))